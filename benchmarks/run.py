@@ -0,0 +1,209 @@
+"""
+Benchmarks for the hot paths of building a vote. Runs offline on a local
+EVM with the mock DAO and saves the timings as JSON.
+
+    uv run python benchmarks/run.py
+    uv run python benchmarks/run.py --sizes 1,100 --compare benchmarks/results/<earlier>.json
+"""
+from __future__ import annotations
+import argparse
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timezone
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import boa  # noqa: E402
+
+from voting import vote, OWNERSHIP  # noqa: E402
+from voting import create_vote  # noqa: E402
+from voting.context import use_clean_prepare_calldata  # noqa: E402
+from voting.mock import mock_dao  # noqa: E402
+from voting.xgov import broadcasters  # noqa: E402
+
+POOL = ROOT / "tests" / "contracts" / "Pool.vy"
+RESULTS = Path(__file__).resolve().parent / "results"
+DEFAULT_SIZES = [1, 10, 100, 1000, 10000]
+
+
+class _Abort(Exception):
+    pass
+
+
+def _measure(fn, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"min_s": min(times), "median_s": statistics.median(times), "repeat": repeat}
+
+
+def bench_prepare_evm_script(pool, size, repeat):
+    actions = _actions(pool, size)
+    return _measure(lambda: create_vote._prepare_evm_script(OWNERSHIP, actions), repeat)
+
+
+def bench_generate_preview(pool, size, repeat):
+    actions = _actions(pool, size)
+
+    def run():
+        with redirect_stdout(io.StringIO()):
+            create_vote._generate_preview(OWNERSHIP, actions)
+
+    return _measure(run, repeat)
+
+
+def bench_capture(pool, size, repeat):
+    """Calls captured inside `vote()`, the vote itself is not created."""
+    times = []
+    for _ in range(repeat):
+        try:
+            with vote(OWNERSHIP, "benchmark", prune=None):
+                start = time.perf_counter()
+                for i in range(size):
+                    pool.set_fee(i)
+                times.append(time.perf_counter() - start)
+                raise _Abort
+        except _Abort:
+            pass
+    return {"min_s": min(times), "median_s": statistics.median(times), "repeat": repeat}
+
+
+def bench_chunk_messages(pool, size, repeat):
+    messages = [(pool.address, b"\x00" * 68)] * size
+    broadcaster = broadcasters.STORAGE_PROOFS
+    return _measure(lambda: list(broadcaster._chunk_messages(messages)), repeat)
+
+
+def bench_ipfs_cache(pool, size, repeat):
+    """Cached `_pin_to_ipfs` lookup with `size` entries in the cache file."""
+    with _home() as home:
+        cache_dir = Path(home) / ".cache" / "curve-voting-lib"
+        cache_dir.mkdir(parents=True)
+        cache = {hashlib.sha256(f"vote {i}".encode()).hexdigest(): f"bafy{i}" for i in range(size)}
+        (cache_dir / "ipfs_cache.json").write_text(json.dumps(cache))
+        description = f"vote {size - 1}"
+        return _measure(lambda: create_vote._pin_to_ipfs(description), repeat)
+
+
+def bench_import(repeat):
+    def run():
+        subprocess.run([sys.executable, "-c", "import voting"], check=True, cwd=ROOT)
+
+    return _measure(run, repeat)
+
+
+def _actions(pool, size):
+    with use_clean_prepare_calldata():
+        return [[pool.address, pool.set_fee.prepare_calldata(i)] for i in range(size)]
+
+
+@contextmanager
+def _home():
+    prev_home = os.environ.get("HOME")
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = home
+        try:
+            yield home
+        finally:
+            if prev_home is None:
+                os.environ.pop("HOME", None)
+            else:
+                os.environ["HOME"] = prev_home
+
+
+BENCHMARKS = {
+    "prepare_evm_script": bench_prepare_evm_script,
+    "generate_preview": bench_generate_preview,
+    "capture": bench_capture,
+    "chunk_messages": bench_chunk_messages,
+    "ipfs_cache": bench_ipfs_cache,
+}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, cwd=ROOT, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, repeat, only=None):
+    results = []
+    with boa.swap_env(boa.Env()), mock_dao() as dao:
+        pool = dao.deploy(str(POOL), OWNERSHIP.agent)
+        for name, bench in BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            for size in sizes:
+                # slow paths are sampled less at large sizes
+                n = repeat if size <= 1000 else max(1, repeat // 5)
+                result = bench(pool, size, n)
+                results.append({"name": name, "size": size, **result})
+                print(f"{name:>20} {size:>6}: {result['median_s'] * 1e3:10.3f} ms")
+
+    if not only or "import" in only:
+        result = bench_import(repeat)
+        results.append({"name": "import", "size": 1, **result})
+        print(f"{'import':>20} {1:>6}: {result['median_s'] * 1e3:10.3f} ms")
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "titanoboa": boa.__version__ if hasattr(boa, "__version__") else None,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(current, previous_path):
+    previous = json.loads(Path(previous_path).read_text())
+    before = {(r["name"], r["size"]): r["median_s"] for r in previous["results"]}
+    print(f"\nCompared to {previous_path} ({previous['meta'].get('commit')}):")
+    for r in current["results"]:
+        key = (r["name"], r["size"])
+        if key in before:
+            print(f"{r['name']:>20} {r['size']:>6}: {r['median_s'] / before[key]:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="comma separated benchmark names")
+    parser.add_argument("--out", help="output file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare with")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    only = set(args.only.split(",")) if args.only else None
+    results = run(sizes, args.repeat, only)
+
+    out = Path(args.out) if args.out else RESULTS / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2))
+    print(f"\nSaved to {out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
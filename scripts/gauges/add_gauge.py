@@ -1,6 +1,7 @@
 import os
 import boa
 from voting import vote, abi, OWNERSHIP
+from voting.gauges import gauge_types
 
 RPC_URL = os.getenv("RPC_URL")
 boa.fork(RPC_URL)
@@ -11,16 +12,12 @@ gauge_to_add = input("Enter the gauge you wish to add to the controller: ")
 weight = 0
 type_id = 0
 
-# TODO: Consider refactoring the gauge existence check.
 # Note: exit() doesn't work reliably in this context, so we use raise SystemExit(1) to ensure the script terminates when gauge already exists.
-try:
-    existing_type = gauge_controller.gauge_types(gauge_to_add)
+# For several gauges at once, use add_gauges.py.
+existing_type, = gauge_types(gauge_controller, [gauge_to_add])
+if existing_type is not None:
     print(f"Gauge already exists with type {existing_type} - no vote needed")
     raise SystemExit(1)
-except SystemExit:
-    raise
-except:
-    pass
 
 
 with vote(
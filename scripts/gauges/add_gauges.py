@@ -0,0 +1,56 @@
+"""
+Adds a batch of gauges to the Gauge Controller in a single vote.
+
+The gauge file has one gauge per line, `<address>,<type_id>[,<weight>]`.
+Empty lines and lines starting with `#` are ignored.
+
+    uv run scripts/gauges/add_gauges.py gauges.csv
+"""
+import os
+import sys
+import boa
+from voting import vote, vote_test, abi, OWNERSHIP
+from voting.gauges import gauge_types
+
+RPC_URL = os.getenv("RPC_URL")
+boa.fork(RPC_URL)
+
+gauge_controller = abi.gauge_controller.at("0x2F50D538606Fa9EDD2B11E2446BEb18C9D5846bB")
+
+gauge_file = sys.argv[1] if len(sys.argv) > 1 else input("Enter the path of the gauge file: ")
+
+gauges_to_add = []
+with open(gauge_file) as f:
+    for line in f:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        gauge, type_id, *weight = [field.strip() for field in line.split(",")]
+        gauges_to_add.append((gauge, int(type_id), int(weight[0]) if weight else 0))
+
+existing_types = gauge_types(gauge_controller, [gauge for gauge, _, _ in gauges_to_add])
+
+missing = []
+for (gauge, type_id, weight), existing_type in zip(gauges_to_add, existing_types):
+    if existing_type is not None:
+        print(f"Gauge {gauge} already exists with type {existing_type} - skipping")
+        continue
+    missing.append((gauge, type_id, weight))
+
+if not missing:
+    print("All gauges already exist - no vote needed")
+    raise SystemExit(1)
+
+
+with vote(
+    OWNERSHIP,
+    "Add gauges to Gauge Controller:\n"
+    + "\n".join(f"- {gauge} with type {type_id}" for gauge, type_id, _ in missing),
+    live_env=None,
+):
+    for gauge, type_id, weight in missing:
+        gauge_controller.add_gauge(gauge, type_id, weight)
+
+    with vote_test():
+        for gauge, type_id, _ in missing:
+            assert gauge_controller.gauge_types(gauge) == type_id
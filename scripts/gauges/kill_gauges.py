@@ -0,0 +1,55 @@
+"""
+Scans every gauge of the Gauge Controller at the fork block, ranks the live
+liquidity_gauge_v6 gauges against the criteria below and kills all
+candidates in a single vote.
+
+    uv run scripts/gauges/kill_gauges.py
+"""
+import os
+import boa
+from voting import vote, vote_test, abi, OWNERSHIP
+from voting.gauges import KillCriteria, kill_candidates, scan_gauges
+
+RPC_URL = os.getenv("RPC_URL")
+boa.fork(RPC_URL)
+
+gauge_controller = abi.gauge_controller.at("0x2F50D538606Fa9EDD2B11E2446BEb18C9D5846bB")
+
+criteria = KillCriteria(
+    max_relative_weight=1e-6,  # 0.0001% of emissions
+    max_working_supply=10**18,
+    allow_active_rewards=False,
+)
+# Gauges never to kill, whatever their state
+KEEP = {
+    # "0x...",
+}
+KEEP = {gauge.lower() for gauge in KEEP}
+
+gauges = scan_gauges(gauge_controller)
+candidates = [gauge for gauge in kill_candidates(gauges, criteria) if gauge.address.lower() not in KEEP]
+
+print(f"{len(candidates)} of {len(gauges)} gauges are kill candidates")
+print(f"{'gauge':>42} {'type':>4} {'weight':>10} {'working supply':>24} {'total supply':>24}")
+for gauge in candidates:
+    print(
+        f"{gauge.address:>42} {gauge.gauge_type:>4} {gauge.relative_weight:>10.4%} "
+        f"{gauge.working_supply:>24} {gauge.total_supply:>24}"
+    )
+if not candidates:
+    raise SystemExit(1)
+
+to_kill = [abi.liquidity_gauge_v6.at(gauge.address) for gauge in candidates]
+
+
+with vote(
+    OWNERSHIP,
+    "Kill unused gauges:\n" + "\n".join(f"- {gauge.address}" for gauge in to_kill),
+    live_env=None,
+):
+    for gauge in to_kill:
+        gauge.set_killed(True)
+
+    with vote_test():
+        for gauge in to_kill:
+            assert gauge.is_killed()
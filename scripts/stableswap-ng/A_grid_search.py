@@ -0,0 +1,33 @@
+"""
+Evaluates get_dy of a pool for a grid of A values and swap sizes off-chain
+(voting.models), to pick the target of ramp_A.py. The model is checked
+against the pool's own get_dy at the current A first.
+"""
+import os
+import boa
+import numpy as np
+from voting import abi
+from voting.models import StableswapState, check_get_dy
+
+RPC_URL = os.getenv("RPC_URL")
+boa.fork(RPC_URL)
+
+pool_address = "0x4f493B7dE8aAC7d55F71853688b1F7C8F0243C85"
+pool = abi.stableswap_ng_mainnet_pool.at(pool_address)
+
+i, j = 0, 1
+decimals = abi.erc20.at(pool.coins(i)).decimals()
+A_values = np.arange(500, 10001, 250)
+amounts = np.logspace(3, 7, 9) * 10**decimals
+
+state = StableswapState.read(pool)
+check_get_dy(pool, state, i, j, amounts)
+
+dy = state.get_dy(i, j, amounts[None, :], A=A_values[:, None])
+# price impact against the smallest swap
+rate = dy / amounts
+impact = 1 - rate / rate[:, :1]
+
+print(f"{'A':>6} " + " ".join(f"{amount / 10**decimals:>12.0f}" for amount in amounts))
+for A, row in zip(A_values, impact):
+    print(f"{A:>6} " + " ".join(f"{value:>12.4%}" for value in row))
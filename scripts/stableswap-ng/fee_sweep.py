@@ -0,0 +1,97 @@
+"""
+Retunes fees across every pool of the stableswap-ng factory in a single vote.
+
+Pools and their current fees are read with batched Multicall3 calls, so the
+number of RPC round trips does not grow with the number of pools. Only pools
+whose fees differ from the policy below end up in the vote.
+"""
+import os
+import boa
+from voting import vote, vote_test, abi, OWNERSHIP
+from voting.multicall import multicall
+
+RPC_URL = os.getenv("RPC_URL")
+boa.fork(RPC_URL)
+
+factory = abi.stableswap_ng_mainnet_factory.at("0x6A8cbed756804B16E05E741eDaBd5cB544AE21bf")
+
+FEE_DENOMINATOR = 10**10
+MAX_FEE = 5 * 10**9  # enforced by set_new_fee
+
+# Policy: keep every fee inside [MIN_TARGET_FEE, MAX_TARGET_FEE] and cap the offpeg multiplier.
+MIN_TARGET_FEE = 1000000  # 0.01%
+MAX_TARGET_FEE = 4000000  # 0.04%
+MAX_OFFPEG_FEE_MULTIPLIER = 5 * FEE_DENOMINATOR
+# Explicit (fee, offpeg_fee_multiplier) for specific pools, these take precedence over the policy.
+OVERRIDES = {
+    # "0x4f493B7dE8aAC7d55F71853688b1F7C8F0243C85": (4000000, 20000000000),
+}
+OVERRIDES = {pool.lower(): params for pool, params in OVERRIDES.items()}
+
+
+def target(pool_address, fee, offpeg_fee_multiplier):
+    if pool_address.lower() in OVERRIDES:
+        return OVERRIDES[pool_address.lower()]
+    new_fee = min(max(fee, MIN_TARGET_FEE), MAX_TARGET_FEE)
+    new_offpeg_fee_multiplier = min(offpeg_fee_multiplier, MAX_OFFPEG_FEE_MULTIPLIER)
+    return new_fee, new_offpeg_fee_multiplier
+
+
+pool_count = factory.pool_count()
+pool_addresses = multicall([(factory.pool_list, i) for i in range(pool_count)], allow_failure=False)
+
+# Only pools that change get bound to a contract, the others are read through this one's ABI
+template = abi.stableswap_ng_mainnet_pool.at(pool_addresses[0])
+current = multicall(
+    [
+        call
+        for address in pool_addresses
+        for call in ((address, template.fee), (address, template.offpeg_fee_multiplier))
+    ]
+)
+
+changes = []
+for i, pool_address in enumerate(pool_addresses):
+    fee, offpeg_fee_multiplier = current[2 * i], current[2 * i + 1]
+    if fee is None or offpeg_fee_multiplier is None:
+        print(f"Could not read fees of {pool_address} - skipping")
+        continue
+
+    new_fee, new_offpeg_fee_multiplier = target(pool_address, fee, offpeg_fee_multiplier)
+    if (new_fee, new_offpeg_fee_multiplier) == (fee, offpeg_fee_multiplier):
+        continue
+
+    assert new_fee <= MAX_FEE
+    assert new_fee * new_offpeg_fee_multiplier <= MAX_FEE * FEE_DENOMINATOR
+    changes.append((abi.stableswap_ng_mainnet_pool.at(pool_address), new_fee, new_offpeg_fee_multiplier))
+
+print(f"{len(changes)} of {pool_count} pools need new fees")
+if not changes:
+    raise SystemExit(1)
+
+
+with vote(
+    OWNERSHIP,
+    "[stableswap] Set new fees of factory pools:\n"
+    + "\n".join(
+        f"- {pool.address}: fee={new_fee}, offpeg_fee_multiplier={new_offpeg_fee_multiplier}"
+        for pool, new_fee, new_offpeg_fee_multiplier in changes
+    ),
+    live_env=None,
+):
+
+    for pool, new_fee, new_offpeg_fee_multiplier in changes:
+        pool.set_new_fee(
+            _new_fee=new_fee,
+            _new_offpeg_fee_multiplier=new_offpeg_fee_multiplier,
+        )
+
+    # Every pool is checked independently of the others, in one batched read
+    with vote_test():
+        results = multicall(
+            [call for pool, _, _ in changes for call in (pool.fee, pool.offpeg_fee_multiplier)],
+            allow_failure=False,
+        )
+        for i, (pool, new_fee, new_offpeg_fee_multiplier) in enumerate(changes):
+            assert results[2 * i] == new_fee, pool.address
+            assert results[2 * i + 1] == new_offpeg_fee_multiplier, pool.address
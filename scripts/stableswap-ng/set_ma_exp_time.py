@@ -1,6 +1,8 @@
 import os
 import boa
+import numpy as np
 from voting import vote, abi, OWNERSHIP
+from voting.oracle import fetch_oracle_history, replay_ema, replay_oracles
 
 RPC_URL = os.getenv("RPC_URL")
 boa.fork(RPC_URL)
@@ -11,8 +13,28 @@ pool = abi.stableswap_ng_mainnet_pool.at(pool_address)
 ts = boa.env.evm.patch.timestamp
 pool_name = pool.name()
 
-ma_exp_time = 866
-D_ma_time = 62324
+# Replay the oracles over the last month for every candidate and pick the
+# values with the best lag/noise trade-off (ma times are half-lives / ln(2))
+MONTH_BLOCKS = 30 * 7200
+block = boa.env.evm.patch.block_number
+history = fetch_oracle_history(pool, block - MONTH_BLOCKS, block, RPC_URL)
+
+# The replay with the current ma_exp_time must reproduce the on-chain oracle
+current = replay_ema(history.timestamps, history.last_prices, history.ema_prices[0], [pool.ma_exp_time()])
+assert np.allclose(current.ema[:, 0], history.ema_prices, rtol=1e-6), "Oracle replay does not match the pool"
+
+prices, D = replay_oracles(
+    history,
+    ma_exp_times=np.arange(300, 3001, 100),
+    D_ma_times=np.arange(21600, 172801, 7200),
+)
+for name, replay in (("ma_exp_time", prices), ("D_ma_time", D)):
+    print(f"{name:>12} {'lag':>12} {'noise':>12}")
+    for ma_time, lag, noise in zip(replay.ma_times, replay.lag, replay.noise):
+        print(f"{ma_time:>12} {lag:>12.4e} {noise:>12.4e}")
+
+ma_exp_time = prices.best()
+D_ma_time = D.best()
 
 
 with vote(
@@ -28,4 +50,3 @@ with vote(
 
     assert pool.ma_exp_time() == ma_exp_time
     assert pool.D_ma_time() == D_ma_time
-    
\ No newline at end of file
@@ -0,0 +1,35 @@
+"""
+Evaluates get_dy of a pool once a ramp to each (A, gamma) of a grid is done,
+off-chain (voting.models) and for several swap sizes. Use it to narrow down
+the candidates before simulating ramps with ramp_grid_search.py. The model
+is checked against the pool's own get_dy at the current parameters first.
+"""
+import os
+import boa
+import numpy as np
+from voting import abi
+from voting.models import TwocryptoState, check_get_dy
+
+RPC_URL = os.getenv("RPC_URL")
+boa.fork(RPC_URL)
+
+pool_address = "0xee351f12eae8c2b8b9d1b9bfd3c5dd565234578d"
+pool = abi.twocrypto_ng_mainnet_pool.at(pool_address)
+
+i, j = 0, 1
+A_values = np.array([100000, 200000, 300000, 400000, 500000, 800000])
+gamma_values = np.array([5e13, 1e14, 1.45e14, 2e14, 5e14])
+amounts = np.array([10**18, 10**20, 10**22], dtype=float)
+
+state = TwocryptoState.read(pool)
+check_get_dy(pool, state, i, j, amounts)
+
+# (A, gamma, amount)
+dy = state.get_dy(i, j, amounts[None, None, :], A=A_values[:, None, None], gamma=gamma_values[None, :, None])
+rate = dy / amounts
+impact = 1 - rate[..., -1] / rate[..., 0]
+
+print(f"Price impact of {amounts[-1]:.0e} vs {amounts[0]:.0e}")
+print(f"{'A':>8} " + " ".join(f"{gamma:>12.2e}" for gamma in gamma_values))
+for A, row in zip(A_values, impact):
+    print(f"{A:>8} " + " ".join(f"{value:>12.4%}" for value in row))
@@ -0,0 +1,43 @@
+"""
+Simulates many (future_A, future_gamma, ramp_time) candidates for a pool and
+prints how A, gamma, price_scale and swap outputs evolve along each ramp.
+Use it to pick the parameters for ramp_A_gamma.py.
+"""
+import os
+import boa
+import numpy as np
+from voting import abi
+from voting.ramp import ramp_grid, simulate_ramps
+
+RPC_URL = os.getenv("RPC_URL")
+boa.fork(RPC_URL)
+
+pool_address = "0xee351f12eae8c2b8b9d1b9bfd3c5dd565234578d"
+pool = abi.twocrypto_ng_mainnet_pool.at(pool_address)
+
+DAY = 86400
+WEEK = 604800
+
+candidates = ramp_grid(
+    future_A=[200000, 300000, 400000, 500000],
+    future_gamma=[100000000000000, 145000000000000, 200000000000000],
+    ramp_time=[WEEK, WEEK + DAY, 2 * WEEK],
+)
+swap_amounts = [10**18, 10**20, 10**22]
+
+trajectory = simulate_ramps(pool, candidates, n_points=8, swap_amounts=swap_amounts)
+
+# Largest relative change of the swap output between two samples, per candidate and amount
+steps = np.abs(np.diff(trajectory.dy, axis=1)) / trajectory.dy[:, :-1]
+max_step = np.nanmax(steps, axis=1)
+
+print(f"{'future_A':>10} {'future_gamma':>18} {'days':>5} " + " ".join(f"{'dy step ' + str(a):>16}" for a in swap_amounts))
+for c in np.argsort(np.nanmax(max_step, axis=1)):
+    future_A, future_gamma, ramp_time = trajectory.candidates[c]
+    if not trajectory.valid[c]:
+        print(f"{future_A:>10} {future_gamma:>18} {ramp_time / DAY:>5.1f} reverted")
+        continue
+    print(
+        f"{future_A:>10} {future_gamma:>18} {ramp_time / DAY:>5.1f} "
+        + " ".join(f"{step:>16.6%}" for step in max_step[c])
+    )
@@ -0,0 +1,40 @@
+"""
+Replays the last month of swaps of a pool with its current parameters and
+with the ones proposed in apply_new_parameters.py, and compares fee revenue,
+rebalancing and how closely price_scale tracks the traded price.
+"""
+import os
+import boa
+from voting import abi
+from voting.replay import fetch_exchanges, replay
+
+RPC_URL = os.getenv("RPC_URL")
+boa.fork(RPC_URL)
+
+pool_address = "0xee351f12eae8c2b8b9d1b9bfd3c5dd565234578d"
+pool = abi.twocrypto_ng_mainnet_pool.at(pool_address)
+
+MONTH_BLOCKS = 30 * 7200
+
+proposed = {
+    "mid_fee": 26000000,
+    "out_fee": 45000000,
+    "fee_gamma": 230000000000000,
+    "allowed_extra_profit": 2000000000000,
+    "adjustment_step": 146000000000000,
+    "ma_time": 880,
+}
+
+to_block = boa.env.evm.patch.block_number
+swaps = fetch_exchanges(pool_address, to_block - MONTH_BLOCKS, to_block, RPC_URL)
+print(f"Replaying {len(swaps)} swaps of {pool.name()}")
+
+current, new = replay(pool_address, swaps, [{}, proposed], RPC_URL)
+
+print(f"{'':>22} {'current':>24} {'proposed':>24}")
+for i in range(2):
+    print(f"{'fees coin ' + str(i):>22} {current.fees[i]:>24} {new.fees[i]:>24}")
+print(f"{'xcp_profit':>22} {current.xcp_profit:>24} {new.xcp_profit:>24}")
+print(f"{'rebalances':>22} {current.rebalances:>24} {new.rebalances:>24}")
+print(f"{'tracking error':>22} {current.tracking_error:>24.4%} {new.tracking_error:>24.4%}")
+print(f"{'failed swaps':>22} {current.failed:>24} {new.failed:>24}")
@@ -3,15 +3,32 @@ import pytest
 
 from voting.xgov.chains import Chain
 
+# Also registered through the `pytest11` entry point when the package is installed
+pytest_plugins = ["voting.pytest_plugin"]
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "mock: run on a local EVM with the mock DAO instead of a mainnet fork"
+    )
+
+
+@pytest.fixture(scope="session")
+def voting_fork_url():
+    return f"https://eth-mainnet.g.alchemy.com/v2/{os.environ['WEB3_ETHEREUM_MAINNET_ALCHEMY_PROJECT_ID']}"
+
 
 @pytest.fixture(autouse=True)
-def fork_chain():
-    """Fork the mainnet for testing and clean up after each test"""
+def fork_chain(request):
+    """Run each test on the session's mainnet fork and clean up after it"""
     import boa
 
-    boa.fork(
-        f"https://eth-mainnet.g.alchemy.com/v2/{os.environ['WEB3_ETHEREUM_MAINNET_ALCHEMY_PROJECT_ID']}",
-        allow_dirty=True,
-    )  # TODO: should clean also work?
-    with boa.env.anchor():
-        yield
+    if request.node.get_closest_marker("mock"):
+        from voting.mock import mock_dao
+
+        with boa.swap_env(boa.Env()), mock_dao():
+            yield
+        return
+
+    request.getfixturevalue("voting_anchor")
+    yield
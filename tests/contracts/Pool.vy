@@ -0,0 +1,16 @@
+# pragma version ~=0.4.0
+
+owner: public(address)
+fee: public(uint256)
+
+
+@deploy
+def __init__(_owner: address):
+    self.owner = _owner
+    self.fee = 1
+
+
+@external
+def set_fee(_fee: uint256):
+    assert msg.sender == self.owner
+    self.fee = _fee
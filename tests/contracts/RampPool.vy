@@ -0,0 +1,69 @@
+# pragma version ~=0.4.0
+# A and gamma ramp like twocrypto-ng, with a toy get_dy
+
+MIN_RAMP_TIME: constant(uint256) = 86400
+
+owner: public(address)
+initial_A: uint256
+future_A: uint256
+initial_gamma: uint256
+future_gamma: uint256
+initial_time: uint256
+future_time: uint256
+
+
+@deploy
+def __init__(_owner: address, _A: uint256, _gamma: uint256):
+    self.owner = _owner
+    self.initial_A = _A
+    self.future_A = _A
+    self.initial_gamma = _gamma
+    self.future_gamma = _gamma
+
+
+@view
+def _ramped(initial: uint256, future: uint256) -> uint256:
+    if block.timestamp >= self.future_time:
+        return future
+    elapsed: uint256 = block.timestamp - self.initial_time
+    duration: uint256 = self.future_time - self.initial_time
+    if future > initial:
+        return initial + (future - initial) * elapsed // duration
+    return initial - (initial - future) * elapsed // duration
+
+
+@view
+@external
+def A() -> uint256:
+    return self._ramped(self.initial_A, self.future_A)
+
+
+@view
+@external
+def gamma() -> uint256:
+    return self._ramped(self.initial_gamma, self.future_gamma)
+
+
+@view
+@external
+def price_scale() -> uint256:
+    return 10**18
+
+
+@view
+@external
+def get_dy(i: uint256, j: uint256, dx: uint256) -> uint256:
+    assert dx > 0
+    return dx * self._ramped(self.initial_A, self.future_A) // 10**6
+
+
+@external
+def ramp_A_gamma(_future_A: uint256, _future_gamma: uint256, _future_time: uint256):
+    assert msg.sender == self.owner
+    assert _future_time >= block.timestamp + MIN_RAMP_TIME, "ramp too fast"
+    self.initial_A = self._ramped(self.initial_A, self.future_A)
+    self.initial_gamma = self._ramped(self.initial_gamma, self.future_gamma)
+    self.initial_time = block.timestamp
+    self.future_A = _future_A
+    self.future_gamma = _future_gamma
+    self.future_time = _future_time
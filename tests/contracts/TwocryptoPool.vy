@@ -0,0 +1,89 @@
+# pragma version ~=0.4.0
+# Constant product pool with the twocrypto-ng functions `voting.replay` uses.
+# price_scale follows the spot price once it moves by more than adjustment_step.
+
+from ethereum.ercs import IERC20
+
+event TokenExchange:
+    buyer: indexed(address)
+    sold_id: uint256
+    tokens_sold: uint256
+    bought_id: uint256
+    tokens_bought: uint256
+    fee: uint256
+    packed_price_scale: uint256
+
+FEE_DENOMINATOR: constant(uint256) = 10**10
+
+owner: public(address)
+coins: public(address[2])
+balances: public(uint256[2])
+price_scale: public(uint256)
+mid_fee: public(uint256)
+out_fee: public(uint256)
+fee_gamma: public(uint256)
+allowed_extra_profit: public(uint256)
+adjustment_step: public(uint256)
+ma_exp_time: uint256
+
+
+@deploy
+def __init__(_owner: address, _coins: address[2], _balances: uint256[2], _mid_fee: uint256, _adjustment_step: uint256):
+    self.owner = _owner
+    self.coins = _coins
+    self.balances = _balances
+    self.price_scale = _balances[0] * 10**18 // _balances[1]
+    self.mid_fee = _mid_fee
+    self.out_fee = _mid_fee
+    self.adjustment_step = _adjustment_step
+    self.ma_exp_time = 866
+
+
+@view
+@external
+def ma_time() -> uint256:
+    return self.ma_exp_time * 694 // 1000
+
+
+@view
+@external
+def xcp_profit() -> uint256:
+    return isqrt(self.balances[0] * self.balances[1])
+
+
+@external
+def exchange(i: uint256, j: uint256, dx: uint256, min_dy: uint256) -> uint256:
+    assert i != j and i < 2 and j < 2
+    extcall IERC20(self.coins[i]).transferFrom(msg.sender, self, dx)
+    dy: uint256 = self.balances[j] * dx // (self.balances[i] + dx)
+    fee: uint256 = dy * self.mid_fee // FEE_DENOMINATOR
+    dy -= fee
+    assert dy >= min_dy
+    self.balances[i] += dx
+    self.balances[j] -= dy
+    extcall IERC20(self.coins[j]).transfer(msg.sender, dy)
+
+    price: uint256 = self.balances[0] * 10**18 // self.balances[1]
+    step: uint256 = self.price_scale * self.adjustment_step // 10**18
+    if price > self.price_scale + step or price + step < self.price_scale:
+        self.price_scale = price
+    log TokenExchange(buyer=msg.sender, sold_id=i, tokens_sold=dx, bought_id=j, tokens_bought=dy, fee=fee, packed_price_scale=self.price_scale)
+    return dy
+
+
+@external
+def apply_new_parameters(
+    _new_mid_fee: uint256,
+    _new_out_fee: uint256,
+    _new_fee_gamma: uint256,
+    _new_allowed_extra_profit: uint256,
+    _new_adjustment_step: uint256,
+    _new_ma_time: uint256,
+):
+    assert msg.sender == self.owner
+    self.mid_fee = _new_mid_fee
+    self.out_fee = _new_out_fee
+    self.fee_gamma = _new_fee_gamma
+    self.allowed_extra_profit = _new_allowed_extra_profit
+    self.adjustment_step = _new_adjustment_step
+    self.ma_exp_time = _new_ma_time
@@ -0,0 +1,112 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+
+from eth_abi import encode
+import pytest
+
+from voting import abi
+from voting.config import OWNERSHIP, PARAMETER
+from voting.xgov import audit
+from voting.xgov import broadcasters as bd
+from voting.xgov.chains import Chain
+from voting.xgov.rpc import _pools
+
+RELAYER = "0x0000000000000000000000000000000000000a01"
+MESSENGER = "0x0000000000000000000000000000000000000a02"
+AGENTS = {
+    "OWNERSHIP_AGENT": "0x0000000000000000000000000000000000000b01",
+    "PARAMETER_AGENT": "0x0000000000000000000000000000000000000b02",
+    "EMERGENCY_AGENT": "0x0000000000000000000000000000000000000b03",
+}
+
+pytestmark = pytest.mark.mock
+
+
+def _selector(factory, name: str) -> str:
+    return "0x" + audit._function(factory, name).method_id.hex()
+
+
+def _address(address: str) -> str:
+    return "0x" + encode(["address"], [address]).hex()
+
+
+def _node(chain_id: int, calls: dict, code: set):
+    """JSON-RPC node answering `eth_call` by (to, selector) and `eth_getCode` for `code`."""
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            batch = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            # RPCPool probes with single requests
+            single = isinstance(batch, dict)
+            batch = [batch] if single else batch
+            requests.extend(request["method"] for request in batch)
+            results = []
+            for request in batch:
+                method, params = request["method"], request["params"]
+                if method == "eth_chainId":
+                    result = hex(chain_id)
+                elif method == "eth_blockNumber":
+                    result = hex(1000)
+                elif method == "eth_getBlockByNumber":
+                    result = {"number": hex(1000), "timestamp": hex(12000)}
+                elif method == "eth_getCode":
+                    result = "0x6001" if params[0].lower() in code else "0x"
+                else:
+                    result = calls.get((params[0]["to"].lower(), params[0]["data"][:10]), "0x")
+                results.append({"jsonrpc": "2.0", "id": request["id"], "result": result})
+            body = json.dumps(results[0] if single else results).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}", requests
+
+
+def test_audit(monkeypatch):
+    chain = Chain(id=252, rpc="", broadcaster=bd.OPTIMISM_GENERIC, relayer=RELAYER)
+    calls = {(RELAYER, _selector(abi.relayer, name)): _address(agent) for name, agent in AGENTS.items()}
+    calls[(RELAYER, _selector(abi.relayer, "messenger"))] = _address(MESSENGER)
+    for agent in AGENTS.values():
+        calls[(agent, _selector(abi.agent, "RELAYER"))] = _address(RELAYER)
+    # the emergency agent was redeployed for another relayer
+    calls[(AGENTS["EMERGENCY_AGENT"], _selector(abi.agent, "RELAYER"))] = _address(MESSENGER)
+
+    factory = abi.broadcasters["optimism_generic"]
+    admins = "0x" + encode(["(address,address,address)"], [(OWNERSHIP.agent, PARAMETER.agent, MESSENGER)]).hex()
+    mainnet_calls = {
+        (bd.STORAGE_PROOFS.address.lower(), _selector(abi.broadcasters["storage_proofs"], "admins")): admins,
+        (bd.OPTIMISM_GENERIC.address.lower(), _selector(factory, "admins")): admins,
+        (bd.OPTIMISM_GENERIC.address.lower(), _selector(factory, "destination_data")): "0x"
+        + encode(["(address,address,address)"], [(MESSENGER, MESSENGER, MESSENGER)]).hex(),
+    }
+    l2, l2_url, l2_requests = _node(252, calls, {RELAYER, MESSENGER})
+    mainnet, mainnet_url, _ = _node(1, mainnet_calls, set())
+    no_rpc = Chain(id=100, rpc="RPC_NOT_SET", broadcaster=bd.STORAGE_PROOFS, relayer=RELAYER)
+    monkeypatch.setenv("RPC_URLS_252", l2_url)
+    audit.clear_cache()
+    try:
+        report = audit.audit([chain, no_rpc], mainnet_rpc=mainnet_url)
+        assert {(m.chain_id, m.field) for m in report.mismatches} == {
+            (252, "EMERGENCY_AGENT.RELAYER"),
+            (1, "destination_data(252).relayer"),
+        }
+        assert [c.chain_id for c in report.skipped] == [100]
+        assert not report.ok
+        assert "MISMATCH" in str(report)
+
+        # same block, everything but the head comes from the cache
+        l2_requests.clear()
+        assert audit.audit([chain]).chains[0].mismatches == report.chains[0].mismatches
+        assert "eth_call" not in l2_requests
+    finally:
+        _pools.pop(252, None)
+        l2.shutdown()
+        mainnet.shutdown()
@@ -0,0 +1,73 @@
+import os
+
+import boa
+import pytest
+
+from voting import checkpoints, OWNERSHIP
+from voting.context import get_mock, use_clean_prepare_calldata
+from voting.create_vote import vote
+from voting.optimize import _replay
+
+POOL = os.path.join(os.path.dirname(__file__), "contracts", "Pool.vy")
+
+pytestmark = pytest.mark.mock
+
+
+def _actions(pools, fees):
+    with use_clean_prepare_calldata():
+        return [[pool.address, pool.set_fee.prepare_calldata(fee)] for pool, fee in zip(pools, fees)]
+
+
+def test_replay_resumes_from_checkpoint():
+    checkpoints.clear()
+    dao = get_mock()
+    pools = [dao.deploy(POOL, OWNERSHIP.agent) for _ in range(4)]
+
+    with boa.env.anchor():
+        effects, _ = _replay(OWNERSHIP, _actions(pools, [2, 3, 4, 5]))
+
+    # the last action changed, the first three are restored instead of executed
+    keys = checkpoints.prefix_keys(OWNERSHIP, _actions(pools, [2, 3, 4, 6]))
+    assert checkpoints.cached_prefix(keys) == effects[:3]
+    with boa.env.anchor():
+        edited, original = _replay(OWNERSHIP, _actions(pools, [2, 3, 4, 6]))
+        assert [pool.fee() for pool in pools] == [2, 3, 4, 6]
+    assert edited[:3] == effects[:3]
+    assert len(original) == 4 and set(original.values()) == {1}
+    assert [pool.fee() for pool in pools] == [1, 1, 1, 1]
+
+    # a changed slot ends the restored prefix
+    with boa.env.anchor():
+        pools[1].set_fee(9, sender=OWNERSHIP.agent)
+        changed, _ = _replay(OWNERSHIP, _actions(pools, [2, 3, 4, 5]))
+    assert changed[0] == effects[0] and changed[1] != effects[1]
+
+
+def test_first_revert():
+    dao = get_mock()
+    pools = [dao.deploy(POOL, OWNERSHIP.agent) for _ in range(5)]
+    # not owned by the agent
+    pools[3] = dao.deploy(POOL, dao.deploy(POOL, OWNERSHIP.agent).address)
+
+    actions = _actions(pools, [2, 3, 4, 5, 6])
+    index, _ = checkpoints.first_revert(OWNERSHIP, actions)
+    assert index == 3
+    assert checkpoints.first_revert(OWNERSHIP, actions[:3]) is None
+    assert [pool.fee() for pool in pools] == [1] * 5
+
+
+def test_vote_clears_checkpoints():
+    dao = get_mock()
+    pools = [dao.deploy(POOL, OWNERSHIP.agent) for _ in range(2)]
+    with boa.env.anchor():
+        _replay(OWNERSHIP, _actions(pools[:1], [2]))
+    keys = checkpoints.prefix_keys(OWNERSHIP, _actions(pools[:1], [2]))
+    assert checkpoints.cached_prefix(keys)
+
+    # the replayed action only reads `owner`, its checkpoint would survive the change
+    boa.env.evm.set_storage(pools[0].address, 0, 0xDEAD)
+    with vote(OWNERSHIP, "Set fee."):
+        pools[1].set_fee(2)
+    assert not checkpoints.cached_prefix(keys)
+    with boa.env.anchor(), pytest.raises(Exception):
+        _replay(OWNERSHIP, _actions(pools[:1], [2]))
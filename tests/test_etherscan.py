@@ -0,0 +1,117 @@
+import shutil
+
+import pytest
+
+from voting import etherscan
+
+ADDRESS = "0x50eD95CEb917443eE0790Eea97494121CA318a6C"
+ABI = [
+    {
+        "type": "function",
+        "name": "owner",
+        "inputs": [],
+        "outputs": [{"type": "address", "name": ""}],
+        "stateMutability": "view",
+    }
+]
+
+pytestmark = pytest.mark.mock
+
+
+def test_abi_cache_offline(tmp_path, monkeypatch):
+    monkeypatch.setattr(etherscan, "CACHE_DIR", tmp_path / "abi")
+    monkeypatch.setattr(etherscan, "SEED_FILE", tmp_path / "seed.json")
+    monkeypatch.setattr(etherscan, "_memory", {})
+    monkeypatch.setattr(etherscan, "_seed", None)
+
+    etherscan._store({etherscan._key(252, ADDRESS): ABI})
+    assert etherscan.fetch_abi(ADDRESS, chain_id=252) == ABI
+    assert etherscan.cached_abi(ADDRESS, chain_id=1) is None
+
+    # only the seed file is left, as on a machine without network
+    etherscan.export_seed([(252, ADDRESS)])
+    shutil.rmtree(tmp_path / "abi")
+    monkeypatch.setattr(etherscan, "_memory", {})
+    assert etherscan.cached_abi(ADDRESS.lower(), chain_id=252) == ABI
+
+
+class _Etherscan:
+    def __init__(self, abi=None):
+        self.abi = abi
+
+    def fetch_abi(self, address):
+        if self.abi is None:
+            raise ConnectionError("offline")
+        return self.abi
+
+
+def test_seed_is_a_fallback(tmp_path, monkeypatch):
+    monkeypatch.setattr(etherscan, "CACHE_DIR", tmp_path / "abi")
+    monkeypatch.setattr(etherscan, "SEED_FILE", tmp_path / "seed.json")
+    monkeypatch.setattr(etherscan, "_memory", {})
+    monkeypatch.setattr(etherscan, "_seed", None)
+    etherscan._store({etherscan._key(252, ADDRESS): ABI})
+    etherscan.export_seed([(252, ADDRESS)])
+    shutil.rmtree(tmp_path / "abi")
+    monkeypatch.setattr(etherscan, "_memory", {})
+
+    # a partial seed ABI does not shadow the verified one
+    full = ABI + [
+        {
+            "type": "function",
+            "name": "commit_future_owner",
+            "inputs": [],
+            "outputs": [],
+            "stateMutability": "nonpayable",
+        }
+    ]
+    monkeypatch.setattr(etherscan, "_etherscan", lambda chain_id, api_key: _Etherscan(full))
+    assert etherscan.fetch_abi(ADDRESS, chain_id=252) == full
+
+    monkeypatch.setattr(etherscan, "_memory", {})
+    shutil.rmtree(tmp_path / "abi")
+    monkeypatch.setattr(etherscan, "_etherscan", lambda chain_id, api_key: _Etherscan())
+    assert etherscan.fetch_abi(ADDRESS, chain_id=252) == ABI
+    with pytest.raises(ConnectionError):
+        etherscan.fetch_abi(ADDRESS, chain_id=1)
+
+
+def test_selector_index_built_once(monkeypatch):
+    from voting import decoder
+
+    builds = []
+    build = decoder.SelectorIndex.build.__func__
+    monkeypatch.setattr(decoder.SelectorIndex, "build", classmethod(lambda cls: builds.append(1) or build(cls)))
+    monkeypatch.setattr(decoder, "_shared", None)
+    monkeypatch.setattr(etherscan, "_memory", {})
+    monkeypatch.setattr(etherscan, "_remembered", {})
+    monkeypatch.setattr(etherscan, "_added", [])
+
+    abi = [{**ABI[0], "name": "commit_future_vault_owner"}]
+    (function,) = decoder._functions(abi)
+    assert decoder.selector_index().lookup(function.method_id) is None
+    etherscan.remember(252, ADDRESS, abi)
+    assert decoder.selector_index().lookup(function.method_id).name == "commit_future_vault_owner"
+    assert len(builds) == 1
+
+
+def test_remembered_abi_is_a_fallback(tmp_path, monkeypatch):
+    monkeypatch.setattr(etherscan, "CACHE_DIR", tmp_path / "abi")
+    monkeypatch.setattr(etherscan, "SEED_FILE", tmp_path / "seed.json")
+    monkeypatch.setattr(etherscan, "_memory", {})
+    monkeypatch.setattr(etherscan, "_remembered", {})
+    monkeypatch.setattr(etherscan, "_seed", None)
+
+    # bound with a one-function ABI in a vote
+    etherscan.remember(252, ADDRESS, ABI)
+    assert etherscan.cached_abi(ADDRESS, chain_id=252) == ABI
+
+    full = ABI + [{**ABI[0], "name": "future_owner"}]
+    monkeypatch.setattr(etherscan, "_etherscan", lambda chain_id, api_key: _Etherscan(full))
+    assert etherscan.fetch_abi(ADDRESS, chain_id=252) == full
+    assert etherscan.cached_abi(ADDRESS, chain_id=252) == full
+
+    monkeypatch.setattr(etherscan, "_memory", {})
+    shutil.rmtree(tmp_path / "abi")
+    monkeypatch.setattr(etherscan, "_etherscan", lambda chain_id, api_key: _Etherscan())
+    assert etherscan.fetch_abi(ADDRESS, chain_id=252) == ABI
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from voting import abi
+from voting.constants import GAUGE_CONTROLLER
+from voting.context import use_clean_prepare_calldata
+from voting.gauges import EmissionWeights, affects_emissions, apply_actions, project_emissions
+
+GAUGES = (
+    "0x0000000000000000000000000000000000000001",
+    "0x0000000000000000000000000000000000000002",
+    "0x0000000000000000000000000000000000000003",
+)
+NEW_GAUGE = "0x0000000000000000000000000000000000000004"
+
+pytestmark = pytest.mark.mock
+
+
+def _calldata(factory, name: str, *args) -> bytes:
+    (function,) = [f for f in factory.functions if f.name == name and len(f.argument_types) == len(args)]
+    with use_clean_prepare_calldata():
+        return function.prepare_calldata(*args)
+
+
+def _weights() -> EmissionWeights:
+    return EmissionWeights(
+        gauges=GAUGES,
+        types=np.array([0, 0, 1]),
+        gauge_weights=np.array([1.0, 3.0, 2.0]),
+        type_weights=np.array([1.0, 2.0]),
+        killed=np.array([False, False, False]),
+        rate=10**18,
+    )
+
+
+def test_relative_weights():
+    weights = _weights()
+    np.testing.assert_allclose(weights.relative_weights, [1 / 8, 3 / 8, 4 / 8])
+    assert weights.emissions.sum() == pytest.approx(7 * 86400)
+
+
+def test_project_emissions():
+    actions = [
+        (GAUGE_CONTROLLER, _calldata(abi.gauge_controller, "change_type_weight", 1, 0)),
+        (GAUGE_CONTROLLER, _calldata(abi.gauge_controller, "add_gauge", NEW_GAUGE, 0, 4)),
+        (GAUGES[1], _calldata(abi.liquidity_gauge_v6, "set_killed", True)),
+    ]
+    assert affects_emissions(actions)
+    # controller calls only count on the controller
+    assert not affects_emissions([(GAUGES[0], actions[0][1])])
+
+    projection = project_emissions(_weights(), apply_actions(_weights(), actions))
+    assert projection.gauges == GAUGES + (NEW_GAUGE,)
+    np.testing.assert_allclose(projection.relative_before, [1 / 8, 3 / 8, 4 / 8, 0])
+    np.testing.assert_allclose(projection.relative_after, [1 / 8, 3 / 8, 0, 4 / 8])
+    # killed gauges keep their weight but do not mint
+    assert projection.emissions_after[1] == 0
+    assert projection.emission_changes[3] == pytest.approx(7 * 86400 / 2)
+    assert NEW_GAUGE in str(projection)
+    assert projection.to_dict()[NEW_GAUGE]["relative_weight"] == [0.0, 0.5]
@@ -0,0 +1,100 @@
+import os
+
+import boa
+import pytest
+
+from voting import vote, vote_test, xvote, OWNERSHIP
+from voting.context import get_mock
+from voting.split import VoteLimits
+from voting.xgov.chains import FRAXTAL
+
+POOL = os.path.join(os.path.dirname(__file__), "contracts", "Pool.vy")
+
+pytestmark = pytest.mark.mock
+
+
+def test_mock_vote():
+    dao = get_mock()
+    pool = dao.deploy(POOL, OWNERSHIP.agent)
+    with boa.swap_env(dao.chain_env(FRAXTAL.id)):
+        l2_pool = dao.deploy(POOL, FRAXTAL.agent_address(OWNERSHIP))
+
+    with vote(OWNERSHIP, "Set fees.") as report:
+        pool.set_fee(5)
+        with vote_test():
+            assert pool.fee() == 5
+        with xvote(FRAXTAL, "unused"):
+            l2_pool.set_fee(7)
+
+    assert pool.fee() == 5
+    assert report.events.find("ExecuteVote", address=OWNERSHIP.voting)
+    (xvote_report,) = report.xvotes
+    (change,) = xvote_report.diff.storage
+    assert (change.address, change.after) == (l2_pool.address, 7)
+
+
+def test_preview_decodes_messages(capsys):
+    dao = get_mock()
+    with boa.swap_env(dao.chain_env(FRAXTAL.id)):
+        l2_pool = dao.deploy(POOL, FRAXTAL.agent_address(OWNERSHIP))
+
+    with vote(OWNERSHIP, "Set fees.", prune=None):
+        with xvote(FRAXTAL, "unused"):
+            l2_pool.set_fee(7)
+
+    preview = capsys.readouterr().out
+    assert f"Messages (chain {FRAXTAL.id})" in preview
+    assert f"To: {l2_pool.address}\n     ├─ Function: set_fee" in preview
+
+
+def test_vote_split():
+    dao = get_mock()
+    pools = [dao.deploy(POOL, OWNERSHIP.agent) for _ in range(5)]
+
+    # script header and two `set_fee` actions of 220 bytes per vote
+    limits = VoteLimits(max_script_bytes=4 + 2 * 220)
+    with vote(OWNERSHIP, "Set fees.", limits=limits) as report:
+        for fee, pool in enumerate(pools, 2):
+            pool.set_fee(fee)
+
+    assert [len(part.actions) for part in report.parts] == [2, 2, 1]
+    assert sum((part.actions for part in report.parts), []) == report.actions
+    assert all(len(part.evm_script) <= limits.max_script_bytes for part in report.parts)
+    assert report.evm_script is None and report.diff is None
+    assert [pool.fee() for pool in pools] == [2, 3, 4, 5, 6]
+
+
+def test_vote_profile(tmp_path):
+    dao = get_mock()
+    pool = dao.deploy(POOL, OWNERSHIP.agent)
+
+    with vote(OWNERSHIP, "Set fees.", profile=tmp_path):
+        pool.set_fee(5)
+
+    (folded,) = tmp_path.glob("*.folded")
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded.read_text().splitlines())
+    (allocations,) = tmp_path.glob("*.allocations.txt")
+    allocations = allocations.read_text()
+    for phase in ("capture", "preview", "script", "simulation"):
+        assert f"\n{phase} " in allocations
+
+
+def test_profile_paused_for_fork(tmp_path):
+    from voting import profiling
+
+    with profiling.profile(tmp_path) as profiler:
+        # sensitivity workers are forked with no sampler thread running
+        with profiling.paused():
+            assert not profiler._sampler.is_alive()
+        assert profiler._sampler.is_alive()
+
+
+def test_vote_too_many_actions():
+    dao = get_mock()
+    pool = dao.deploy(POOL, OWNERSHIP.agent)
+
+    # the mock voting runs at most 128 actions, it must not skip the rest
+    with pytest.raises(Exception, match="EVMCALLS_TOO_MANY_ACTIONS"):
+        with vote(OWNERSHIP, "Set fees.", prune=None, limits=None):
+            for fee in range(129):
+                pool.set_fee(fee)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from voting import abi
+from voting.models import (
+    StableswapState,
+    TwocryptoState,
+    check_get_dy,
+    stableswap_D,
+    stableswap_y,
+    twocrypto_D,
+    twocrypto_y,
+)
+
+
+@pytest.mark.mock
+def test_stableswap_keeps_D():
+    xp = np.array([1e24, 1.2e24, 0.8e24])
+    amp = np.array([10000, 150000, 500000])[:, None]
+    D = stableswap_D(xp, amp)[..., 0]
+    y = stableswap_y(0, 2, xp[0] + np.array([1e20, 1e23]), xp, amp, D[:, None])
+    new_xp = np.stack(np.broadcast_arrays(xp[0] + np.array([1e20, 1e23]), xp[1], y), axis=-1)
+    assert np.allclose(stableswap_D(new_xp, amp), D[:, None], rtol=1e-12)
+
+
+@pytest.mark.mock
+def test_twocrypto_keeps_D():
+    A = np.array([200000, 400000, 800000])[:, None]
+    gamma = np.array([1e14, 2e14])[None, :]
+    D = twocrypto_D(A, gamma, 1e24, 9e23)
+    # D is between the constant product and constant sum invariants
+    assert np.all((2 * np.sqrt(9e47) <= D) & (D <= 1.9e24))
+    assert np.allclose(twocrypto_y(A, gamma, 1e24, D), 9e23, rtol=1e-12)
+    y = twocrypto_y(A, gamma, 1.1e24, D)
+    assert np.allclose(twocrypto_D(A, gamma, 1.1e24, y), D, rtol=1e-12)
+
+
+@pytest.mark.parametrize(
+    "factory,state_cls,address",
+    [
+        (abi.stableswap_ng_mainnet_pool, StableswapState, "0x4f493B7dE8aAC7d55F71853688b1F7C8F0243C85"),
+        (abi.twocrypto_ng_mainnet_pool, TwocryptoState, "0xee351f12eae8c2b8b9d1b9bfd3c5dd565234578d"),
+    ],
+)
+def test_get_dy_matches_pool(factory, state_cls, address):
+    pool = factory.at(address)
+    state = state_cls.read(pool)
+    # from a small swap to a tenth of the pool, both directions
+    for i, j in ((0, 1), (1, 0)):
+        balance = float(pool.balances(i))
+        amounts = np.array([1e-4, 1e-2, 1e-1]) * balance
+        check_get_dy(pool, state, i, j, amounts)
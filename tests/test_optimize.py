@@ -0,0 +1,27 @@
+from voting import abi, OWNERSHIP
+from voting.optimize import find_redundant_actions, prune_actions
+
+POOL = "0x4f493B7dE8aAC7d55F71853688b1F7C8F0243C85"
+
+
+def _set_new_fee(pool, fee, offpeg_fee_multiplier):
+    return [POOL, pool.set_new_fee.prepare_calldata(fee, offpeg_fee_multiplier)]
+
+
+def test_redundant_fee_changes():
+    pool = abi.stableswap_ng_mainnet_pool.at(POOL)
+    fee, offpeg_fee_multiplier = pool.fee(), pool.offpeg_fee_multiplier()
+
+    actions = [
+        _set_new_fee(pool, fee, offpeg_fee_multiplier),  # sets what is already there
+        _set_new_fee(pool, 3000000, offpeg_fee_multiplier),  # overwritten by the next one
+        _set_new_fee(pool, 2000000, offpeg_fee_multiplier),
+    ]
+
+    report = find_redundant_actions(OWNERSHIP, actions)
+    assert report.no_op == [0]
+    assert report.overwritten == [1]
+    assert report.gas_saved > 0
+
+    assert prune_actions(OWNERSHIP, actions, "warn") == actions
+    assert prune_actions(OWNERSHIP, actions, "remove") == actions[2:]
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from voting.oracle import replay_ema
+
+pytestmark = pytest.mark.mock
+
+
+def test_replay_ema_matches_pool_recursion():
+    rng = np.random.default_rng(0)
+    timestamps = np.cumsum(rng.integers(12, 600, 200)).astype(float)
+    prices = 10**18 * (1 + np.cumsum(rng.normal(size=200)) / 1e4)
+    replay = replay_ema(timestamps, prices, [prices[0]], [600, 866, 3000])
+
+    ema = prices[0]
+    for t in range(1, len(timestamps)):
+        alpha = np.exp(-(timestamps[t] - timestamps[t - 1]) / 866)
+        ema = prices[t - 1] * (1 - alpha) + ema * alpha
+    assert replay.ema[-1, 1, 0] == pytest.approx(ema)
+    # longer ma times lag more and move less
+    assert np.all(np.diff(replay.lag) > 0) and np.all(np.diff(replay.noise) < 0)
@@ -0,0 +1,72 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+
+import pytest
+
+from voting import OWNERSHIP
+from voting.preflight import Preflight, PreflightError
+
+ACCOUNT = "0x0000000000000000000000000000000000000bad"
+
+pytestmark = pytest.mark.mock
+
+
+def _node(ve_balance: int, can_create: bool):
+    results = {
+        "eth_chainId": hex(1),
+        "eth_getBalance": hex(10**18),
+        "eth_gasPrice": hex(10 * 10**9),
+        "eth_getTransactionCount": hex(7),
+    }
+    # canCreateNewVote, minBalance and balanceOf, in the order they are sent
+    calls = [int(can_create), 2500 * 10**18, ve_balance]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            requests = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            eth_calls = iter(calls)
+            body = json.dumps(
+                [
+                    {
+                        "jsonrpc": "2.0",
+                        "id": request["id"],
+                        "result": "0x" + next(eth_calls).to_bytes(32, "big").hex()
+                        if request["method"] == "eth_call"
+                        else results[request["method"]],
+                    }
+                    for request in requests
+                ]
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def test_preflight():
+    server, url = _node(ve_balance=3000 * 10**18, can_create=True)
+    try:
+        result = Preflight(OWNERSHIP, url, ACCOUNT).start().wait()
+        assert result.can_create_vote and not result.problems
+        assert result.ve_balance == 3000 * 10**18 and result.nonce == 7
+    finally:
+        server.shutdown()
+
+    server, url = _node(ve_balance=10**18, can_create=False)
+    try:
+        preflight = Preflight(OWNERSHIP, url, ACCOUNT).start()
+        with pytest.raises(PreflightError, match="2500.00 needed"):
+            preflight.wait()
+        # once failed, every later step of the simulation stops
+        with pytest.raises(PreflightError):
+            preflight.check()
+    finally:
+        server.shutdown()
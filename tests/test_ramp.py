@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+import pytest
+
+from voting import OWNERSHIP
+from voting.context import get_mock
+from voting.ramp import ramp_grid, simulate_ramps
+
+POOL = os.path.join(os.path.dirname(__file__), "contracts", "RampPool.vy")
+DAY = 86400
+
+pytestmark = pytest.mark.mock
+
+
+def test_ramp_grid():
+    grid = ramp_grid([400000, 800000], [10**14, 2 * 10**14], [DAY, 7 * DAY])
+    assert grid.shape == (8, 3)
+    assert {tuple(row) for row in grid} == {
+        (A, gamma, t) for A in (400000, 800000) for gamma in (10**14, 2 * 10**14) for t in (DAY, 7 * DAY)
+    }
+
+
+def test_simulate_ramps():
+    pool = get_mock().deploy(POOL, OWNERSHIP.agent, 200000, 10**14)
+    # ramps shorter than a day revert
+    candidates = ramp_grid([400000, 100000], [2 * 10**14], [3600, 2 * DAY])
+    trajectory = simulate_ramps(pool, candidates, n_points=5, swap_amounts=[10**18, 0])
+
+    assert trajectory.valid.tolist() == [False, True, False, True]
+    assert np.isnan(trajectory.A[~trajectory.valid]).all()
+    np.testing.assert_array_equal(trajectory.times[1], np.linspace(0, 2 * DAY, 5).astype(int))
+    np.testing.assert_allclose(trajectory.A[1], [200000, 250000, 300000, 350000, 400000])
+    np.testing.assert_allclose(trajectory.A[3], [200000, 175000, 150000, 125000, 100000])
+    np.testing.assert_allclose(trajectory.gamma[1, [0, -1]], [10**14, 2 * 10**14])
+    np.testing.assert_allclose(trajectory.dy[1, -1, 0], 10**18 * 400000 // 10**6)
+    # a read that reverts is NaN, the other reads of the sample are kept
+    assert np.isnan(trajectory.dy[trajectory.valid, :, 1]).all()
+    assert (trajectory.price_scale[trajectory.valid] == 10**18).all()
+    # every candidate starts from the same state
+    assert pool.A() == 200000
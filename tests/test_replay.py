@@ -0,0 +1,118 @@
+import os
+
+import boa
+from eth_abi import encode
+import numpy as np
+import pytest
+
+from voting import OWNERSHIP, history
+from voting.context import get_mock
+from voting.replay import TOKEN_EXCHANGE_TOPIC, Swap, fetch_exchanges, replay_swaps
+
+CONTRACTS = os.path.join(os.path.dirname(__file__), "contracts")
+POOL_ADDRESS = "0x00000000000000000000000000000000000000aa"
+MID_FEE = 3 * 10**7
+STEP = 10**16
+
+pytestmark = pytest.mark.mock
+
+
+def _log(block: int, log_index: int, i: int, dx: int, j: int, dy: int, removed: bool = False) -> dict:
+    data = encode(["uint256"] * 6, [i, dx, j, dy, 0, 0])
+    return {
+        "address": POOL_ADDRESS,
+        "topics": [TOKEN_EXCHANGE_TOPIC, "0x" + "00" * 32],
+        "data": "0x" + data.hex(),
+        "blockNumber": hex(block),
+        "logIndex": hex(log_index),
+        "removed": removed,
+    }
+
+
+class FakeRPC:
+    def __init__(self, logs):
+        self.logs = logs
+
+    def fetch_multi(self, payloads):
+        results = []
+        for method, params in payloads:
+            if method == "eth_getLogs":
+                start, end = int(params[0]["fromBlock"], 16), int(params[0]["toBlock"], 16)
+                results.append([log for log in self.logs if start <= int(log["blockNumber"], 16) <= end])
+            else:
+                results.append({"timestamp": hex(12 * int(params[0], 16))})
+        return results
+
+
+def test_fetch_exchanges(monkeypatch):
+    logs = [
+        _log(150, 3, 1, 5 * 10**18, 0, 10**18),
+        _log(100, 7, 0, 10**18, 1, 2 * 10**18),
+        _log(100, 2, 0, 3 * 10**18, 1, 6 * 10**18),
+        _log(120, 0, 0, 10**18, 1, 10**18, removed=True),
+    ]
+    monkeypatch.setattr(history, "rpc", lambda url=None: FakeRPC(logs))
+    swaps = fetch_exchanges(POOL_ADDRESS, 50, 200)
+    assert swaps == [
+        Swap(100, 1200, 2, 0, 1, 3 * 10**18, 6 * 10**18),
+        Swap(100, 1200, 7, 0, 1, 10**18, 2 * 10**18),
+        Swap(150, 1800, 3, 1, 0, 5 * 10**18, 10**18),
+    ]
+
+
+def _model(balances, swaps, step):
+    """price_scale and fees of TwocryptoPool.vy after every swap"""
+    balances = list(balances)
+    price_scale = balances[0] * 10**18 // balances[1]
+    fees, prices = [0, 0], []
+    for swap in swaps:
+        dy = balances[swap.j] * swap.dx // (balances[swap.i] + swap.dx)
+        fee = dy * MID_FEE // 10**10
+        balances[swap.i] += swap.dx
+        balances[swap.j] -= dy - fee
+        fees[swap.j] += fee
+        price = balances[0] * 10**18 // balances[1]
+        if abs(price - price_scale) > price_scale * step // 10**18:
+            price_scale = price
+        prices.append(price_scale)
+    return fees, prices
+
+
+def test_replay_swaps():
+    dao = get_mock()
+    coins = [dao.deploy(os.path.join(CONTRACTS, "Token.vy")) for _ in range(2)]
+    balances = [2 * 10**24, 10**24]
+    pool = dao.deploy(
+        os.path.join(CONTRACTS, "TwocryptoPool.vy"),
+        OWNERSHIP.agent,
+        [coin.address for coin in coins],
+        balances,
+        MID_FEE,
+        STEP,
+    )
+    for coin, balance in zip(coins, balances):
+        boa.deal(coin, pool.address, balance)
+
+    swaps = [
+        Swap(100, 1200, 0, 0, 1, 10**21, 5 * 10**20),
+        Swap(100, 1200, 1, 0, 1, 2 * 10**22, 10**22),
+        Swap(101, 1212, 0, 1, 0, 3 * 10**22, 6 * 10**22),
+        # reverts in the pool
+        Swap(102, 1224, 0, 1, 1, 10**21, 10**21),
+        Swap(103, 1236, 0, 0, 1, 10**22, 5 * 10**21),
+    ]
+    valid = [swap for swap in swaps if swap.i != swap.j]
+
+    current, wide = [replay_swaps(pool, swaps, parameters) for parameters in ({}, {"adjustment_step": 10**17})]
+    for result, step in ((current, STEP), (wide, 10**17)):
+        fees, prices = _model(balances, valid, step)
+        assert result.fees == fees
+        assert result.failed == 1
+        assert np.isnan(result.price_scale[3])
+        np.testing.assert_array_equal(result.price_scale[[0, 1, 2, 4]], prices)
+        assert result.rebalances == np.count_nonzero(np.diff(prices))
+        executed = np.array([swap.dx / swap.dy if swap.i == 0 else swap.dy / swap.dx for swap in valid]) * 1e18
+        assert result.tracking_error == pytest.approx(np.mean(np.abs(np.array(prices) / executed - 1)))
+    assert current.rebalances > wide.rebalances == 0
+    # replays run in an anchor
+    assert pool.adjustment_step() == STEP and pool.balances(0) == balances[0]
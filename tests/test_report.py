@@ -0,0 +1,35 @@
+from voting import abi, vote, OWNERSHIP
+from voting.storage import register_layout
+
+POOL = "0x4f493B7dE8aAC7d55F71853688b1F7C8F0243C85"
+
+
+def test_vote_state_diff():
+    pool = abi.stableswap_ng_mainnet_pool.at(POOL)
+    fee, offpeg_fee_multiplier = pool.fee(), pool.offpeg_fee_multiplier()
+
+    with vote(OWNERSHIP, "Set fee.") as report:
+        pool.set_new_fee(fee + 1, offpeg_fee_multiplier)
+
+    assert report.vote_id is not None
+    assert len(report.actions) == 1
+    (change,) = [change for change in report.diff.storage if change.address == POOL]
+    assert (change.before, change.after) == (fee, fee + 1)
+
+    register_layout(POOL, {change.slot: "fee"})
+    with vote(OWNERSHIP, "Set fee.") as report:
+        pool.set_new_fee(fee + 2, offpeg_fee_multiplier)
+
+    assert [c.name for c in report.diff.storage if c.address == POOL] == ["fee"]
+
+
+def test_vote_events():
+    pool = abi.stableswap_ng_mainnet_pool.at(POOL)
+    fee, offpeg_fee_multiplier = pool.fee(), pool.offpeg_fee_multiplier()
+
+    with vote(OWNERSHIP, "Set fee.") as report:
+        pool.set_new_fee(fee + 1, offpeg_fee_multiplier)
+
+    event = report.events.one("ApplyNewFee", address=POOL)
+    assert event["fee"] == fee + 1
+    assert report.events.find("ExecuteVote", address=OWNERSHIP.voting, voteId=report.vote_id)
@@ -0,0 +1,104 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+
+import pytest
+
+from voting.xgov.rpc import RPCPool
+
+pytestmark = pytest.mark.mock
+
+
+def _endpoint(head: int, delay: float = 0.0, status: int = 200):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(delay)
+            result = hex(head)
+            if request["method"] == "eth_getBlockByNumber":
+                # 2 second blocks
+                result = {"number": hex(head), "timestamp": hex(2 * head)}
+            body = json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": result}).encode()
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def test_rpc_pool_ranking_and_failover():
+    servers, urls = zip(
+        _endpoint(1000, delay=0.2),  # slow
+        _endpoint(1000),  # fast
+        _endpoint(900),  # 200 seconds behind
+        _endpoint(1000, status=500),  # down
+    )
+    try:
+        pool = RPCPool(urls)
+        assert [e.url for e in pool.ranked()] == [urls[1], urls[0]]
+        assert pool.best() == urls[1]
+        assert pool.fetch("eth_blockNumber", []) == hex(1000)
+
+        def _fork(url):
+            if url == urls[1]:
+                raise ConnectionError("fork failed")
+            return url
+
+        assert pool.call(_fork) == urls[0]
+        assert pool.best() == urls[0]
+
+        # reverts fail on every endpoint, they are raised without failing over
+        def _revert(url):
+            raise ValueError("execution reverted")
+
+        with pytest.raises(ValueError):
+            pool.call(_revert)
+        assert pool.best() == urls[0]
+        metrics = {m["url"]: m for m in pool.metrics()}
+        assert metrics[urls[1]]["failures"] == 1
+        assert metrics[urls[3]]["failures"] == 1 and metrics[urls[3]]["latency"] is None
+    finally:
+        for server in servers:
+            server.shutdown()
+
+
+def test_relay_gas_fails_over(monkeypatch):
+    from contextlib import contextmanager
+
+    from voting import OWNERSHIP
+    from voting.xgov import broadcasters
+    from voting.xgov.chains import Chain
+    from voting.xgov.rpc import _pools
+
+    servers, urls = zip(_endpoint(1000), _endpoint(1000, delay=0.1))
+    chain = Chain(id=252, rpc="", broadcaster=broadcasters.OPTIMISM_GENERIC, relayer="", rpcs=urls)
+    forked = []
+
+    @contextmanager
+    def _open_chain(chain_id, fork_params):
+        forked.append(fork_params["url"])
+        if fork_params["url"] == urls[0]:
+            raise ConnectionError("fork failed")
+        yield
+
+    broadcaster = chain.broadcaster
+    monkeypatch.setattr(broadcasters, "has_mock", lambda: False)
+    monkeypatch.setattr(broadcasters, "open_chain", _open_chain)
+    monkeypatch.setattr(broadcaster, "agent", lambda chain, dao: None, raising=False)
+    monkeypatch.setattr(broadcaster, "relayer", lambda chain: None, raising=False)
+    monkeypatch.setattr(broadcaster, "_relay_gas", lambda agent, relayer, chunk: len(chunk), raising=False)
+    try:
+        costs = broadcaster._calculate_relay_gas(chain, OWNERSHIP, {"url": urls[0]}, [("0x", b"")] * 9)
+        assert costs == [8, 1]
+        assert forked == list(urls)
+    finally:
+        _pools.pop(252, None)
+        for server in servers:
+            server.shutdown()
@@ -0,0 +1,51 @@
+import pytest
+
+from voting.sensitivity import BlockOutcome, SensitivityReport, resolve_block
+from voting.storage import SlotChange, StateDiff
+
+POOL = "0x4f493B7dE8aAC7d55F71853688b1F7C8F0243C85"
+
+pytestmark = pytest.mark.mock
+
+
+def test_resolve_block():
+    head = 20_000_000
+    assert resolve_block("head", head) == head
+    assert resolve_block("-1d", head) == head - 7200
+    assert resolve_block(-10, head) == head - 10
+    assert resolve_block(19_000_000, head) == 19_000_000
+    with pytest.raises(ValueError):
+        resolve_block("yesterday", head)
+
+
+def _outcome(block, future_A, initial_time, check_error=None):
+    return BlockOutcome(
+        block,
+        check_error=check_error,
+        gas_used=100_000,
+        diff=StateDiff(
+            [
+                SlotChange(POOL, 1, "future_A", 100, future_A),
+                SlotChange(POOL, 2, "initial_time", 0, initial_time),
+            ]
+        ),
+    )
+
+
+def test_compare_outcomes():
+    report = SensitivityReport(
+        [
+            _outcome(100, 200, 1000),
+            _outcome(90, 200, 880),
+            BlockOutcome(80, error="BoaError: ramp time too short"),
+            _outcome(70, 300, 760, check_error="AssertionError: A out of range"),
+        ]
+    )
+    assert [outcome.block for outcome in report.failed] == [80, 70]
+    assert not report.stable
+    # blocks that reverted have no writes to compare
+    assert report.differing_writes() == {
+        (POOL, "future_A"): {100: 200, 90: 200, 70: 300},
+        (POOL, "initial_time"): {100: 1000, 90: 880, 70: 760},
+    }
+    assert "ramp time too short" in str(report)
@@ -0,0 +1,51 @@
+import json
+import os
+
+import boa
+import pytest
+
+from voting import OWNERSHIP
+from voting.context import get_mock
+from voting.spec import build_votes, parse_spec
+
+POOL = os.path.join(os.path.dirname(__file__), "contracts", "Pool.vy")
+
+pytestmark = pytest.mark.mock
+
+
+def _spec(address, fee, expected):
+    return {
+        "vote": [
+            {
+                "description": f"Set fee to {fee}.",
+                "action": [
+                    {
+                        "abi": "pool",
+                        "address": address,
+                        "method": "set_fee",
+                        "args": [fee],
+                        "expect": {"fee": expected},
+                    }
+                ],
+            }
+        ]
+    }
+
+
+def test_spec_votes():
+    pool = get_mock().deploy(POOL, OWNERSHIP.agent)
+    abis = {"pool": boa.loads_abi(json.dumps(pool.abi), name="Pool")}
+
+    (report,) = build_votes(parse_spec(_spec(pool.address, 5, 5), abis), abis)
+    (change,) = [c for c in report.diff.storage if c.address == pool.address]
+    assert (change.before, change.after) == (1, 5)
+    # every vote runs on its own anchor
+    assert pool.fee() == 1
+
+    with pytest.raises(AssertionError, match="expected 6"):
+        build_votes(parse_spec(_spec(pool.address, 5, 6), abis), abis)
+
+    spec = _spec(pool.address, 5, 5)
+    spec["vote"][0]["action"][0]["method"] = "set_fees"
+    with pytest.raises(ValueError, match="no function 'set_fees'"):
+        parse_spec(spec, abis)
@@ -0,0 +1,55 @@
+import numpy as np
+
+from voting import OWNERSHIP, PARAMETER, abi
+from voting.config import CONVEX_VOTER_PROXY
+from voting.turnout import PCT_BASE, all_scenarios, snapshot_turnout
+
+STAKEDAO_LOCKER = "0x52f541764E6e90eeBc5c21Ff570De0e2D63766B6"
+YEARN_VOTER = "0xF147b8125d2ef93FB6965Db97D6746952a133934"
+
+
+def test_snapshot_thresholds():
+    for dao in [OWNERSHIP, PARAMETER]:
+        snapshot = snapshot_turnout(dao)
+        assert snapshot.quorum == dao.quorum / 100
+        assert 0 < snapshot.support_required < 1
+        assert snapshot.balances[0] > 0
+        assert snapshot.voting_power >= snapshot.balances.sum()
+
+
+def test_convex_alone_matches_simulation():
+    # _create_vote relies on convex passing the vote on its own
+    snapshot = snapshot_turnout(OWNERSHIP, holders=[CONVEX_VOTER_PROXY])
+    projection = snapshot.project(all_scenarios(1))
+    assert projection.passes.tolist() == [False, True]
+
+
+def test_can_pass_without():
+    holders = [CONVEX_VOTER_PROXY, STAKEDAO_LOCKER, YEARN_VOTER]
+    snapshot = snapshot_turnout(OWNERSHIP, holders=holders)
+    assert (snapshot.balances > 0).all()
+    # only the excluded holder abstains
+    for k, holder in enumerate(holders):
+        yes = np.ones(len(holders))
+        yes[k] = 0
+        assert snapshot.can_pass_without(holder) == snapshot.project(yes).passes[0]
+    assert not snapshot.can_pass_without(CONVEX_VOTER_PROXY)
+    assert snapshot.can_pass_without(YEARN_VOTER)
+    assert not snapshot.can_pass_without(*holders)
+
+
+def test_snapshot_of_existing_vote():
+    voting = abi.voting.at(OWNERSHIP.voting)
+    vote_id = voting.votesLength() - 1
+    vote = voting.getVote(vote_id)
+    snapshot = snapshot_turnout(OWNERSHIP, vote_id=vote_id)
+    assert snapshot.snapshot_block == vote[3]
+    assert snapshot.support_required == vote[4] / PCT_BASE
+
+
+def test_project_shapes():
+    snapshot = snapshot_turnout(PARAMETER)
+    yes = np.random.default_rng(0).random((1000, len(snapshot.holders)))
+    projection = snapshot.project(yes, 1 - yes)
+    assert projection.passes.shape == (1000,)
+    assert np.allclose(projection.yea + projection.nay, snapshot.balances.sum())
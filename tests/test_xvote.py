@@ -4,6 +4,7 @@ import pytest
 import boa
 
 from voting import vote, xvote, OWNERSHIP, PARAMETER
+from voting.etherscan import from_etherscan
 from voting.xgov.chains import SONIC, FRAXTAL, OPTIMISM, TAIKO, X_LAYER
 
 
@@ -28,7 +29,7 @@ def test_vault_transfer():
     future_owner = "0x71F718D3e4d1449D1502A6A7595eb84eBcCB1683"
     with vote(OWNERSHIP, description="Empty test vote"):
         with xvote(FRAXTAL, FRAXTAL.rpc):
-            vault = boa.from_etherscan(
+            vault = from_etherscan(
                 "0x50eD95CEb917443eE0790Eea97494121CA318a6C",
                 api_key=os.environ["ETHERSCAN_V2_TOKEN"],
             )
@@ -0,0 +1,119 @@
+"""
+Per-action checkpoints of the replays of a vote's actions.
+
+Replaying actions the way `executeVote` runs them (`voting.optimize`)
+records the storage every action changes. Those changes are kept, keyed by
+the starting state and the actions up to and including that action. A
+later replay of actions that start the same way (pruning, splitting,
+running the script again after editing a later action) restores the
+stored changes of the longest known prefix and only executes the rest.
+Actions that move ether or create contracts end a prefix, as their effects
+are not in storage, and so does an action whose slots changed since.
+
+Only the slots an action wrote are checked, not the ones it read, so
+checkpoints are only valid on an unchanged state. `vote()` clears them
+when its cleanup starts and once it is done, replays outside of `vote()`
+must `clear()` them whenever the state changes.
+
+When `executeVote` reverts, `first_revert` replays the actions one by one
+on the same state and stops at the first one that reverts, a single
+replay instead of running the vote again for every guess.
+"""
+from __future__ import annotations
+import hashlib
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import boa
+
+from voting import abi
+from voting.config import DAOParameters
+from voting.context import use_clean_prepare_calldata
+
+if TYPE_CHECKING:
+    from voting.optimize import ActionEffect
+
+# prefix key -> effect of the prefix's last action
+_checkpoints: Dict[bytes, "ActionEffect"] = {}
+MAX_CHECKPOINTS = 100_000
+
+
+def clear() -> None:
+    _checkpoints.clear()
+
+
+def _base_key(dao: DAOParameters) -> bytes:
+    # the same fork at the same block and time, other changes need `clear`
+    patch = boa.env.evm.patch
+    base = f"{patch.chain_id}:{patch.block_number}:{patch.timestamp}:{dao.agent}"
+    return hashlib.sha256(base.encode()).digest()
+
+
+def prefix_keys(dao: DAOParameters, actions: Sequence) -> List[bytes]:
+    """Key of every prefix of `actions`, from the current state."""
+    keys, key = [], _base_key(dao)
+    for address, calldata in actions:
+        key = hashlib.sha256(key + str(address).lower().encode() + bytes(calldata)).digest()
+        keys.append(key)
+    return keys
+
+
+def cached_prefix(keys: Sequence[bytes]) -> List["ActionEffect"]:
+    """Effects of the longest prefix that was replayed before."""
+    effects = []
+    for key in keys:
+        effect = _checkpoints.get(key)
+        if effect is None:
+            break
+        effects.append(effect)
+    return effects
+
+
+def restore(effects: Sequence["ActionEffect"]) -> Tuple[List["ActionEffect"], Dict[Tuple[bytes, int], int]]:
+    """
+    Applies the storage changes of replayed actions to the current state.
+    Stops at the first action whose slots do not hold the values they had
+    when it was replayed, the state changed since then. Returns the
+    actions applied and the value every changed slot had before them.
+    """
+    state = boa.env.evm.vm.state
+    applied, original = [], {}
+    for effect in effects:
+        writes = [
+            ((address.canonical_address, slot), before, after)
+            for (address, slot), (before, after) in effect.writes.items()
+        ]
+        if any(state.get_storage(*key) != before for key, before, _ in writes):
+            break
+        for key, before, after in writes:
+            original.setdefault(key, before)
+            state.set_storage(*key, after)
+        applied.append(effect)
+    return applied, original
+
+
+def store(keys: Sequence[bytes], effects: Sequence["ActionEffect"]) -> None:
+    if len(_checkpoints) > MAX_CHECKPOINTS:
+        _checkpoints.clear()
+    for key, effect in zip(keys, effects):
+        if effect.other_effects:
+            break
+        _checkpoints[key] = effect
+
+
+def first_revert(dao: DAOParameters, actions: Sequence) -> Optional[Tuple[int, Exception]]:
+    """
+    The first action that reverts when the actions run one after the other
+    as in `executeVote` on the current state, and its error. `None` if they
+    all execute. The state is left unchanged.
+    """
+    aragon_agent = abi.aragon_agent.at(dao.agent)
+    with use_clean_prepare_calldata(), boa.env.anchor():
+        for i, (address, calldata) in enumerate(actions):
+            computation = boa.env.execute_code(
+                to_address=dao.agent,
+                sender=dao.voting,
+                data=aragon_agent.execute.prepare_calldata(address, 0, calldata),
+            )
+            if computation.is_error:
+                return i, computation.error
+    return None
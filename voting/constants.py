@@ -1 +1,3 @@
 ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+GAUGE_CONTROLLER = "0x2F50D538606Fa9EDD2B11E2446BEb18C9D5846bB"
@@ -1,4 +1,7 @@
 from contextlib import contextmanager
+from typing import Callable, Union
+
+import boa
 
 from boa.contracts.abi.abi_contract import ABIFunction
 
@@ -13,8 +16,14 @@ def use_dao(dao: DAOParameters):
     global _dao
     assert not _dao, "DAO is already set"
     _dao = dao
-    yield
-    _dao = None
+    try:
+        yield
+    finally:
+        _dao = None
+
+
+def has_dao() -> bool:
+    return _dao is not None
 
 
 def get_dao() -> DAOParameters:
@@ -26,11 +35,97 @@ def get_dao() -> DAOParameters:
 def use_prepare_calldata(_prepare_calldata):
     prev_prepare_calldata = ABIFunction.prepare_calldata
     ABIFunction.prepare_calldata = _prepare_calldata
-    yield
-    ABIFunction.prepare_calldata = prev_prepare_calldata
+    try:
+        yield
+    finally:
+        ABIFunction.prepare_calldata = prev_prepare_calldata
 
 
 @contextmanager
 def use_clean_prepare_calldata():
     with use_prepare_calldata(_clean_prepare_calldata):
         yield
+
+
+_report = None
+
+
+@contextmanager
+def use_report(report):
+    global _report
+    prev_report = _report
+    _report = report
+    try:
+        yield
+    finally:
+        _report = prev_report
+
+
+def get_report():
+    return _report
+
+
+_mock = None
+
+
+@contextmanager
+def use_mock(mock):
+    global _mock
+    assert not _mock, "Mock DAO is already set"
+    _mock = mock
+    try:
+        yield
+    finally:
+        _mock = None
+
+
+def has_mock() -> bool:
+    return _mock is not None
+
+
+def get_mock():
+    assert _mock, "No mock DAO set"
+    return _mock
+
+
+_forks = None
+
+
+@contextmanager
+def reuse_forks(block_identifier: Callable[[str], Union[int, str]] = lambda url: "safe"):
+    """
+    Makes `open_chain` fork every chain once and revert it after each use
+    instead of forking again. `block_identifier(url)` picks the fork block.
+    """
+    global _forks
+    prev_forks = _forks
+    _forks = ({}, block_identifier)
+    try:
+        yield
+    finally:
+        _forks = prev_forks
+
+
+@contextmanager
+def open_chain(chain_id: int, fork_params: dict):
+    """
+    Forks the chain, or switches to its local mock when the mock DAO is
+    used, or to its already forked env inside `reuse_forks()`.
+    """
+    if _mock is not None:
+        env = _mock.chain_env(chain_id)
+    elif _forks is not None:
+        envs, block_identifier = _forks
+        url = fork_params["url"]
+        if url not in envs:
+            env = boa.Env()
+            env.fork(url=url, block_identifier=block_identifier(url), deprecated=False)
+            envs[url] = env
+        env = envs[url]
+    else:
+        with boa.fork(**fork_params):
+            yield
+        return
+
+    with boa.swap_env(env), env.anchor():
+        yield
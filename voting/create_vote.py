@@ -1,10 +1,11 @@
 from __future__ import annotations
 from contextlib import contextmanager, ExitStack
 import os
-from typing import Optional, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 
 import boa
 import logging
+from boa.contracts.base_evm_contract import BoaError
 from dotenv import load_dotenv
 from hexbytes import HexBytes
 
@@ -14,10 +15,30 @@ import hashlib
 import json
 from datetime import datetime
 from voting import abi 
-from boa.util.abi import abi_decode
 
-from voting.context import use_dao, use_prepare_calldata, use_clean_prepare_calldata, get_dao
+from voting import checkpoints, decoder, etherscan, profiling
+from voting.constants import GAUGE_CONTROLLER
+from voting.context import (
+    use_dao,
+    use_prepare_calldata,
+    use_clean_prepare_calldata,
+    get_dao,
+    use_report,
+    get_report,
+    has_mock,
+    open_chain,
+)
+from voting.decoder import DecodedCall
+from voting.events import EventIndex
+from voting.gauges import affects_emissions, apply_actions, project_emissions, read_emission_weights
 from voting.live_env import LiveEnv
+from voting.multicall import _fork_rpc
+from voting.optimize import prune_actions
+from voting.preflight import Preflight
+from voting.report import VoteReport, XVoteReport
+from voting.sensitivity import Sensitivity, simulate_at_blocks
+from voting.split import split_actions, VoteLimits
+from voting.storage import record_writes, state_diff
 
 if TYPE_CHECKING:
     from voting.xgov.chains import Chain
@@ -110,48 +131,60 @@ def _prepare_evm_script(dao: DAOParameters, actions):
     return evm_script
 
 
+def _format_value(value):
+    # Human-readable bytes
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+
+    # Recursive
+    if isinstance(value, (list, tuple)):
+        return [_format_value(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _format_value(v) for k, v in value.items()}
+    return value
+
+
+def _preview_call(call: DecodedCall, indent: str = " ") -> List[str]:
+    if call.function is None:
+        # Neither a bound contract, `voting.abi` nor the ABI cache knows the function
+        return [
+            f"{indent}├─ To: {call.address}",
+            f"{indent}└─ Calldata: 0x{call.calldata.hex()}",
+        ]
+
+    inputs_list = []
+    for abi_input, value in call.args:
+        # messages are shown decoded below the call
+        if decoder._is_messages(abi_input):
+            value = f"<{len(value)} messages>"
+        inputs_list.append(f"('{abi_input['type']}', '{abi_input['name']}', '{_format_value(value)}')")
+    inputs_str = f"[{', '.join(inputs_list)}]"
+    lines = [
+        f"{indent}├─ To: {call.address}",
+        f"{indent}├─ Function: {call.name}",
+        f"{indent}{'├' if call.messages else '└'}─ Inputs: {inputs_str}",
+    ]
+    if call.messages:
+        chain = call.messages[0].chain_id
+        lines.append(f"{indent}└─ Messages (chain {chain if chain is not None else 'unknown'}):")
+        for i, message in enumerate(call.messages):
+            lines.append(f"{indent}    [{i}]")
+            lines += _preview_call(message, indent + "    ")
+    return lines
+
+
 def _generate_preview(dao: DAOParameters, actions):
     """
-    Generates a human-readable preview of the transaction payload.
-    This version assumes all actions are valid and decodable.
+    Generates a human-readable preview of the transaction payload. L2
+    messages of broadcaster calls are decoded per chain and message.
     """
-    def _format_value(value):
-        # Human-readable bytes
-        if isinstance(value, (bytes, bytearray, memoryview)):
-            return bytes(value).hex()
-
-        # Recursive
-        if isinstance(value, list):
-            return [_format_value(v) for v in value]
-        if isinstance(value, dict):
-            return {k: _format_value(v) for k, v in value.items()}
-        return value
+    index = decoder.selector_index()
+    chain_id = boa.env.evm.patch.chain_id
 
     preview_blocks = []
     for address, calldata in actions:
-        
-        block = f"Call via agent ({dao.agent}):\n"
-
-        # Directly get the contract and function, assuming they exist
-        contract = boa.env.lookup_contract(address)
-        method_id = calldata[:4]
-        func = contract.method_id_map[method_id]
-
-        # Directly decode arguments, assuming it will succeed
-        arg_data = calldata[4:]
-        decoded_inputs = abi_decode(func.signature, arg_data)
-
-        # Format the decoded inputs into a readable string
-        inputs_list = [
-            f"('{abi_input['type']}', '{abi_input['name']}', '{_format_value(value)}')"
-            for abi_input, value in zip(func._abi['inputs'], decoded_inputs)
-        ]
-        inputs_str = f"[{', '.join(inputs_list)}]"
-        
-        # Build the preview block for this action
-        block += f" ├─ To: {address}\n"
-        block += f" ├─ Function: {func.name}\n"
-        block += f" └─ Inputs: {inputs_str}\n"
+        call = decoder.decode_call(address, calldata, index, chain_id)
+        block = f"Call via agent ({dao.agent}):\n" + "\n".join(_preview_call(call))
         preview_blocks.append(block)
 
     # Join each action's preview block with a newline for clear separation
@@ -164,11 +197,14 @@ def _create_vote(
         actions,
         description: str,
         live_env: Optional[LiveEnv] = None,
+        report: Optional[VoteReport] = None,
+        preflight: Optional[Preflight] = None,
 ) -> Optional[int]:
     logger.info(f"Creating vote in {'live' if live_env else 'simulation'} mode")
     
     # Prepare the EVM script
-    evm_script = _prepare_evm_script(dao, actions)
+    with profiling.phase("script"):
+        evm_script = _prepare_evm_script(dao, actions)
     logger.info(f"EVM script prepared.")
 
     # For now, use empty string as placeholder
@@ -178,24 +214,48 @@ def _create_vote(
     logger.info(f"Voting contract loaded: {voting.address}")
 
     # Always sim regardless of whether the vote is going live or not
-    vote_id = voting.newVote(evm_script, "", False, False, sender=CONVEX_VOTER_PROXY)
-
-    logger.info("Simulating vote creation")
-    assert voting.canVote(vote_id, CONVEX_VOTER_PROXY)
-    with boa.env.prank(CONVEX_VOTER_PROXY):
-        voting.vote(vote_id, True, False)
-
-    boa.env.time_travel(seconds=voting.voteTime())
-
-    logger.info("Simulating vote execution")
-    assert voting.canExecute(vote_id)
-    voting.executeVote(vote_id)
+    with profiling.phase("simulation"):
+        vote_id = voting.newVote(evm_script, "", False, False, sender=CONVEX_VOTER_PROXY)
+
+        logger.info("Simulating vote creation")
+        assert voting.canVote(vote_id, CONVEX_VOTER_PROXY)
+        with boa.env.prank(CONVEX_VOTER_PROXY):
+            voting.vote(vote_id, True, False)
+
+        boa.env.time_travel(seconds=voting.voteTime())
+
+        logger.info("Simulating vote execution")
+        assert voting.canExecute(vote_id)
+        with record_writes() as recorder:
+            try:
+                voting.executeVote(vote_id)
+            except BoaError:
+                failed = checkpoints.first_revert(dao, actions)
+                if failed is not None:
+                    i, error = failed
+                    logger.error(f"Action {i} ({actions[i][0]}) reverts in executeVote: {error}")
+                raise
+        diff = state_diff(boa.env, recorder, [voting._computation])
+        events = EventIndex.from_computations([voting._computation])
+        gas_used = voting._computation.get_gas_used()
+    print(f"State diff\n{diff}\n")
+
+    if report is not None:
+        report.evm_script = evm_script
+        report.vote_id = vote_id
+        report.diff = diff
+        report.events = events
+        report.gas_used = gas_used
 
     # Live voting
     if live_env:
+        if preflight is not None:
+            preflight.wait()
         vote_description_hash = _pin_to_ipfs(description)
         if not live_env.set():
             return None
+        if preflight is not None and str(boa.env.eoa).lower() != preflight.address.lower():
+            logger.warning(f"Connected as {boa.env.eoa}, the preflight checked {preflight.address}")
 
         # Refresh contract binding so calls use the browser environment signer
         voting = abi.voting.at(dao.voting)
@@ -210,15 +270,35 @@ def _create_vote(
             sender=boa.env.eoa,
         )
         logger.info(f"Live vote created with ID: {vote_id}")
+        if report is not None:
+            report.vote_id = vote_id
 
     return vote_id
 
 
+def _start_preflight(dao: DAOParameters, live_env: Optional[LiveEnv]) -> Optional[Preflight]:
+    if live_env is None or has_mock():
+        return None
+    rpc_url, address = live_env.preflight_target()
+    if address is None:
+        logger.info("No address to check before submitting the vote live")
+        return None
+    if rpc_url is None:
+        if not boa.env.evm.is_forked:
+            return None
+        rpc_url = _fork_rpc()._rpc_url
+    return Preflight(dao, rpc_url, address).start()
+
+
 @contextmanager
 def vote(
     dao: DAOParameters,
     description: str,
     live_env: Optional[LiveEnv] = None,
+    prune: Optional[str] = "warn",
+    limits: Optional[VoteLimits] = VoteLimits(),
+    profile: Optional[str] = None,
+    sensitivity: Optional[Sensitivity] = None,
 ):
     """
     A context manager to patch boa's ABIFunction.prepare_calldata that
@@ -231,39 +311,127 @@ def vote(
     Inside the `with` block, any call to a mutable function on an
     ABIContract will have its calldata captured. The payload is
     stored as a list of [target_address, calldata] pairs.
+
+    Before the EVM script is assembled, actions that change no storage or
+    whose changes are overwritten by later actions are reported
+    (`prune="warn"`), dropped (`prune="remove"`) or ignored (`prune=None`).
+
+    Actions that would exceed `limits` (gas of newVote or executeVote,
+    script size) in one vote are split into several votes, simulated one
+    after the other, each with its own report in `report.parts`. Split
+    votes are not created live, as one account can only create a vote
+    every 12 hours.
+
+    With `profile` (a directory, or `python -m voting.profiling`), CPU
+    samples and allocations of every phase are written there
+    (`voting.profiling`).
+
+    With `sensitivity`, the actions are also simulated at other blocks (by
+    default a day and a week before the fork block) in worker processes,
+    and the outcomes are compared in `report.sensitivity`
+    (`voting.sensitivity`).
+
+    With `live_env`, the account and network it submits with are checked
+    in the background while the vote is simulated (`voting.preflight`),
+    which stops early when submission would fail.
+
+    Yields a `VoteReport` that is filled in when the block exits, with the
+    actions, the EVM script and the storage and balance diff of the
+    simulated `executeVote` (and of every `xvote` block).
     """
     # TODO forbid ops like deploying contracts inside to keep the vote clean
 
     captured_actions = []
+    report = VoteReport(dao, description)
+    preflight = _start_preflight(dao, live_env)
 
     def _patched_prepare_calldata(self, *args, **kwargs):
         with use_clean_prepare_calldata():
             calldata = self.prepare_calldata(*args, **kwargs)
         if self.is_mutable:
+            if preflight is not None:
+                preflight.check()
             contract_address = str(self.contract.address)
+            etherscan.remember(boa.env.evm.patch.chain_id, contract_address, self.contract.abi)
             captured_actions.append([contract_address, calldata])
         return calldata
 
-    with ExitStack() as stack:
-        def _cleanup():
-            print(f"Metadata\n{description}\n")
-            _generate_preview(dao, captured_actions)
-            _create_vote(dao, captured_actions, description, live_env)
+    out_dir = profiling.profile_dir(profile)
+    # the simulation of the vote time travels, other blocks are relative to this one
+    head = boa.env.evm.patch.block_number
 
-        stack.callback(_cleanup)
+    with ExitStack() as stack:
+        if out_dir:
+            stack.enter_context(profiling.profile(out_dir))
+
+        def _cleanup(exc_type, exc, tb):
+            # a block that raised does not produce a vote
+            if exc_type is not None:
+                return
+            # replays below share checkpoints, the state they start from is fixed from here
+            checkpoints.clear()
+            if preflight is not None:
+                preflight.check()
+            with profiling.phase("prune"):
+                actions = prune_actions(dao, captured_actions, prune)
+            report.actions = actions
+            with profiling.phase("split"):
+                parts = split_actions(dao, actions, limits) if limits and actions else [actions]
+            if boa.env.evm.is_forked and affects_emissions(actions):
+                with profiling.phase("emissions"):
+                    weights = read_emission_weights(abi.gauge_controller.at(GAUGE_CONTROLLER))
+                    report.emissions = project_emissions(weights, apply_actions(weights, actions))
+                print(f"Emissions\n{report.emissions}\n")
+            if sensitivity and actions:
+                # workers are forked, the preflight thread must be done by then
+                if preflight is not None:
+                    preflight.wait()
+                with profiling.phase("sensitivity"):
+                    report.sensitivity = simulate_at_blocks(dao, actions, sensitivity, head)
+                if not report.sensitivity.stable:
+                    logger.warning(f"Vote fails at some blocks:\n{report.sensitivity}")
+                else:
+                    logger.info(f"Vote outcome at other blocks:\n{report.sensitivity}")
+            if len(parts) == 1:
+                print(f"Metadata\n{description}\n")
+                with profiling.phase("preview"):
+                    _generate_preview(dao, actions)
+                if preflight is not None:
+                    preflight.check()
+                _create_vote(dao, actions, description, live_env, report, preflight)
+                return
+
+            for i, part in enumerate(parts, 1):
+                part_report = VoteReport(dao, f"{description}\n\nPart {i}/{len(parts)}.", actions=part)
+                print(f"Metadata\n{part_report.description}\n")
+                with profiling.phase("preview"):
+                    _generate_preview(dao, part)
+                _create_vote(dao, part, part_report.description, None, part_report)
+                if part_report.gas_used > limits.max_gas:
+                    logger.warning(f"Part {i} used {part_report.gas_used} gas in executeVote")
+                report.parts.append(part_report)
+            if live_env:
+                raise ValueError(
+                    f"Actions were split into {len(parts)} votes, create them one by one from `report.parts`"
+                )
+
+        stack.callback(checkpoints.clear)
+        stack.push(_cleanup)
 
         stack.enter_context(boa.env.prank(dao.agent)) 
         stack.enter_context(boa.env.anchor())
         stack.enter_context(use_dao(dao))
+        stack.enter_context(use_report(report))
         stack.enter_context(use_prepare_calldata(_patched_prepare_calldata))
+        stack.enter_context(profiling.phase("capture"))
 
-        yield
+        yield report
 
 
 @contextmanager
 def xvote(
     chain: Chain,
-    rpc: str,
+    rpc: Optional[str] = None,
     broadcaster_parameters: Optional[dict]=None,
 ):
     """
@@ -276,6 +444,9 @@ def xvote(
         with xvote(FRAXTAL, "https://rpc.frax.com"):
             things.set()
     ```
+
+    Without `rpc`, the chain is forked from the fastest healthy endpoint of
+    `chain.rpc_pool()`, failing over to the next ones.
     """
 
     messages = []
@@ -285,23 +456,58 @@ def xvote(
             calldata = self.prepare_calldata(*args, **kwargs)
         if self.is_mutable:
             contract_address = str(self.contract.address)
+            etherscan.remember(chain.id, contract_address, self.contract.abi)
             messages.append((contract_address, calldata))
         return calldata  # calldata is prepared, but I need gas_used available after execution
 
     fork_params = {"url": rpc, "allow_dirty": True}
 
+    def _open_chain(url):
+        stack.enter_context(open_chain(chain.id, {**fork_params, "url": url}))
+        fork_params["url"] = url
+
     dao_params = get_dao()
+    report = get_report()
+
+    def _record_effects(exc_type, exc, tb):
+        if exc_type is not None:
+            return
+        # Replays the messages the way the relayer executes them, on the
+        # chain's state from before the block
+        computations = []
+        with use_clean_prepare_calldata(), boa.env.anchor(), record_writes() as recorder:
+            agent = chain.broadcaster.agent(chain, dao_params)
+            relayer = chain.broadcaster.relayer(chain)
+            for chunk in chain.broadcaster._chunk_messages(messages):
+                computation = boa.env.execute_code(
+                    to_address=agent.address,
+                    sender=relayer.address,
+                    data=agent.execute.prepare_calldata(chunk),
+                )
+                if computation.is_error:
+                    raise computation.error
+                computations.append(computation)
+            diff = state_diff(boa.env, recorder, computations)
+            events = EventIndex.from_computations(computations)
+        report.xvotes.append(XVoteReport(chain.id, list(messages), diff, events))
 
     with ExitStack() as stack:
         stack.enter_context(boa.env.anchor())
-        stack.enter_context(boa.fork(**fork_params))
+        if rpc is None and not has_mock():
+            chain.rpc_pool().call(_open_chain)
+        else:
+            _open_chain(rpc)
+        if report is not None:
+            stack.push(_record_effects)
+            stack.enter_context(boa.env.anchor())
 
         stack.enter_context(boa.env.prank(chain.agent_address(dao_params)))
         stack.enter_context(use_prepare_calldata(_patched_prepare_calldata))
 
         yield
     # TODO: how to represent xgov votes?
-    chain.broadcast(dao_params, fork_params, messages, broadcaster_parameters)
+    with profiling.phase(f"broadcast:{chain.id}"):
+        chain.broadcast(dao_params, fork_params, messages, broadcaster_parameters)
 
 
 @contextmanager
@@ -0,0 +1,184 @@
+"""
+Decodes vote actions, including the L2 messages nested in broadcaster
+calls, from the ABIs the library already knows: the contracts bound in
+boa, `voting.abi` and the ABI cache (`voting.etherscan`). Nothing is
+fetched, functions not known anywhere are kept as raw calldata.
+
+```py
+from voting.decoder import decode_call, selector_index
+
+index = selector_index()
+call = decode_call(address, calldata, index, chain_id=1)
+for message in call.messages:
+    print(message.chain_id, message.address, message.name)
+```
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import boa
+from boa.contracts.abi.abi_contract import ABIFunction
+from boa.util.abi import abi_decode
+
+from voting import etherscan
+from voting.events import _factories
+
+MESSAGE_COMPONENTS = ["address", "bytes"]
+
+
+def _functions(contract_abi: Iterable[dict], name: str = "<anonymous contract>") -> List[ABIFunction]:
+    return [ABIFunction(item, name) for item in contract_abi if item.get("type") == "function"]
+
+
+@lru_cache(maxsize=None)
+def _known_functions() -> Dict[bytes, ABIFunction]:
+    """selector -> function, for every function in `voting.abi`."""
+    ret = {}
+    for factory in _factories():
+        for func in factory.functions:
+            ret.setdefault(func.method_id, func)
+    return ret
+
+
+class SelectorIndex:
+    """
+    selector -> ABI function, built once from `voting.abi` and the cached
+    ABIs, plus the functions of single contracts (by chain and address).
+    Contract ABIs win over the selector table, which only knows one
+    function per selector.
+    """
+
+    def __init__(self, functions: Optional[Dict[bytes, ABIFunction]] = None):
+        self.functions: Dict[bytes, ABIFunction] = dict(functions or {})
+        # (chain id, address) -> selector -> function, filled lazily
+        self._contracts: Dict[Tuple[int, str], Dict[bytes, ABIFunction]] = {}
+
+    @classmethod
+    def build(cls) -> "SelectorIndex":
+        index = cls(_known_functions())
+        for contract_abi in etherscan.cached_abis():
+            index.add(contract_abi)
+        return index
+
+    def add(self, contract_abi: List[dict]) -> None:
+        for func in _functions(contract_abi):
+            self.functions.setdefault(func.method_id, func)
+
+    def _contract_functions(self, chain_id: int, address: str) -> Dict[bytes, ABIFunction]:
+        key = (chain_id, str(address).lower())
+        if key not in self._contracts:
+            functions = {}
+            if chain_id == boa.env.evm.patch.chain_id:
+                contract = boa.env.lookup_contract(address)
+                functions.update(getattr(contract, "method_id_map", None) or {})
+            contract_abi = etherscan.cached_abi(address, chain_id)
+            if contract_abi is not None:
+                for func in _functions(contract_abi):
+                    functions.setdefault(func.method_id, func)
+            self._contracts[key] = functions
+        return self._contracts[key]
+
+    def lookup(
+        self, selector: bytes, address: Optional[str] = None, chain_id: Optional[int] = None
+    ) -> Optional[ABIFunction]:
+        selector = bytes(selector)
+        if address is not None and chain_id is not None:
+            func = self._contract_functions(chain_id, address).get(selector)
+            if func is not None:
+                return func
+        return self.functions.get(selector)
+
+
+# Selector table of the ABI cache, built once per process by `selector_index`
+_shared: Optional[SelectorIndex] = None
+# ABIs of `etherscan._added` already in `_shared`
+_shared_added = 0
+
+
+def selector_index() -> SelectorIndex:
+    """
+    An index over the selector table of `voting.abi` and the ABI cache.
+    The table is built on first use, then only extended with the ABIs
+    remembered or fetched since. Contract lookups start empty every time,
+    as the contracts bound in boa change between forks.
+    """
+    global _shared, _shared_added
+    if _shared is None:
+        _shared_added = len(etherscan._added)
+        _shared = SelectorIndex.build()
+    for contract_abi in etherscan._added[_shared_added:]:
+        _shared.add(contract_abi)
+    _shared_added = len(etherscan._added)
+    return SelectorIndex(_shared.functions)
+
+
+@dataclass
+class DecodedCall:
+    address: str
+    calldata: bytes
+    chain_id: Optional[int]  # None if the chain of a message is not known
+    function: Optional[ABIFunction] = None  # None if no ABI knows the selector
+    args: List[Tuple[dict, Any]] = field(default_factory=list)  # (abi input, value)
+    messages: List["DecodedCall"] = field(default_factory=list)  # nested L2 messages
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.function.name if self.function is not None else None
+
+
+def _is_messages(abi_input: dict) -> bool:
+    components = [c["type"] for c in abi_input.get("components", [])]
+    return abi_input["type"] == "tuple[]" and components == MESSAGE_COMPONENTS
+
+
+@lru_cache(maxsize=None)
+def _broadcaster_chains() -> Dict[str, List[int]]:
+    """broadcaster address -> ids of the chains it broadcasts to."""
+    from voting.xgov import chains
+
+    ret: Dict[str, List[int]] = {}
+    for value in vars(chains).values():
+        if isinstance(value, chains.Chain):
+            ret.setdefault(value.broadcaster.address.lower(), []).append(value.id)
+    return ret
+
+
+def _message_chain(address: str, args: Dict[str, Any]) -> Optional[int]:
+    # generic broadcasters take the chain id, the others serve one chain
+    if "_chain_id" in args:
+        return args["_chain_id"]
+    chain_ids = _broadcaster_chains().get(str(address).lower(), [])
+    return chain_ids[0] if len(chain_ids) == 1 else None
+
+
+def decode_call(
+    address: str,
+    calldata: bytes,
+    index: SelectorIndex,
+    chain_id: Optional[int] = None,
+) -> DecodedCall:
+    """Decodes a call and, recursively, every `(target, data)[]` message list it carries."""
+    calldata = bytes(calldata)
+    call = DecodedCall(str(address), calldata, chain_id)
+    func = index.lookup(calldata[:4], address, chain_id)
+    if func is None:
+        return call
+    try:
+        values = abi_decode(func.signature, calldata[4:])
+    except Exception:
+        return call
+
+    call.function = func
+    inputs = func._abi["inputs"]
+    call.args = list(zip(inputs, values))
+    named = {abi_input["name"]: value for abi_input, value in call.args}
+    for abi_input, value in call.args:
+        if not _is_messages(abi_input):
+            continue
+        # messages for an unknown chain are decoded with the selector table only
+        message_chain = _message_chain(address, named)
+        for target, data in value:
+            call.messages.append(decode_call(target, data, index, message_chain))
+    return call
@@ -0,0 +1,255 @@
+"""
+Persistent cache of contract ABIs fetched from Etherscan.
+
+ABIs are stored content-addressed (by the hash of the ABI) in
+`~/.cache/curve-voting-lib/abi`, with an index keyed by (chain id, address),
+so the hundreds of pools sharing one ABI are stored once. Lookups go memory,
+disk cache, then Etherscan. The seed file (`voting/data/abi_seed.json`, or
+`CURVE_VOTING_ABI_SEED`) is only a fallback for when Etherscan cannot be
+reached, and for offline lookups like the vote preview's. So are the ABIs
+contracts were bound with in a vote (`remember`), often partial ones from
+`voting.abi`.
+
+```py
+from voting.etherscan import from_etherscan, prefetch
+
+prefetch(["0x50eD95CEb917443eE0790Eea97494121CA318a6C"], chain_id=252)
+vault = from_etherscan("0x50eD95CEb917443eE0790Eea97494121CA318a6C")
+```
+"""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import boa
+from boa.contracts.abi.abi_contract import ABIContract, ABIContractFactory
+from boa.explorer import Etherscan
+from boa.util.abi import Address
+
+CACHE_DIR = Path(os.path.expanduser("~/.cache/curve-voting-lib/abi"))
+SEED_FILE = Path(os.getenv("CURVE_VOTING_ABI_SEED", Path(__file__).parent / "data" / "abi_seed.json"))
+
+Key = Tuple[int, str]
+
+# (chain id, address) -> abi, for everything looked up or captured in this process
+_memory: Dict[Key, list] = {}
+# (chain id, address) -> abi the contract was bound with, below Etherscan
+_remembered: Dict[Key, list] = {}
+# ABIs added in this process, in order, for `voting.decoder.selector_index`
+_added: List[list] = []
+_seed: Optional[dict] = None
+
+
+def _key(chain_id: int, address: str) -> Key:
+    return chain_id, str(address).lower()
+
+
+def _index_key(key: Key) -> str:
+    return f"{key[0]}:{key[1]}"
+
+
+def _abi_hash(abi: list) -> str:
+    return hashlib.sha256(json.dumps(abi, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def _load_index() -> dict:
+    try:
+        return json.loads((CACHE_DIR / "index.json").read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _load_seed() -> dict:
+    global _seed
+    if _seed is None:
+        try:
+            _seed = json.loads(SEED_FILE.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            _seed = {"index": {}, "abis": {}}
+    return _seed
+
+
+def _from_disk(key: Key) -> Optional[list]:
+    abi_hash = _load_index().get(_index_key(key))
+    if abi_hash is None:
+        return None
+    try:
+        return json.loads((CACHE_DIR / f"{abi_hash}.json").read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _from_seed(key: Key) -> Optional[list]:
+    seed = _load_seed()
+    abi_hash = seed["index"].get(_index_key(key))
+    return seed["abis"].get(abi_hash) if abi_hash else None
+
+
+def _store(entries: Dict[Key, list]) -> None:
+    """Writes ABIs to the disk cache, the index is rewritten once per batch."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    index = _load_index()
+    for key, abi in entries.items():
+        abi_hash = _abi_hash(abi)
+        path = CACHE_DIR / f"{abi_hash}.json"
+        if not path.exists():
+            path.write_text(json.dumps(abi))
+        index[_index_key(key)] = abi_hash
+    tmp = CACHE_DIR / f"index.json.{os.getpid()}"
+    tmp.write_text(json.dumps(index, indent=1, sort_keys=True))
+    os.replace(tmp, CACHE_DIR / "index.json")
+
+
+def _chain_id(chain_id: Optional[int]) -> int:
+    return chain_id if chain_id is not None else boa.env.evm.patch.chain_id
+
+
+def _etherscan(chain_id: int, api_key: Optional[str]) -> Etherscan:
+    return Etherscan(api_key=api_key or os.getenv("ETHERSCAN_V2_TOKEN"), chain_id=chain_id)
+
+
+def remember(chain_id: int, address: str, abi: list) -> None:
+    """
+    Keeps the ABI a contract was bound with (e.g. in a vote) for offline
+    lookups. It never shadows the disk cache or Etherscan.
+    """
+    key = _key(chain_id, address)
+    if key not in _remembered:
+        _remembered[key] = abi
+        _added.append(abi)
+
+
+def _cached(key: Key) -> Optional[list]:
+    if key not in _memory:
+        abi = _from_disk(key)
+        if abi is None:
+            return None
+        _memory[key] = abi
+    return _memory[key]
+
+
+def cached_abi(address: str, chain_id: Optional[int] = None) -> Optional[list]:
+    """
+    The ABI from memory, the disk cache, the ABIs contracts were bound with
+    or the seed file. Never goes to the network.
+    """
+    key = _key(_chain_id(chain_id), address)
+    # remembered and seed ABIs are not kept in memory, Etherscan still comes first for `prefetch`
+    return _cached(key) or _remembered.get(key) or _from_seed(key)
+
+
+def cached_abis() -> Iterator[list]:
+    """Every distinct ABI in memory, the disk cache, the remembered ones and the seed file."""
+    seen = set()
+
+    def _new(abi):
+        abi_hash = _abi_hash(abi)
+        if abi_hash in seen:
+            return False
+        seen.add(abi_hash)
+        return True
+
+    for abi in [*_memory.values(), *_remembered.values()]:
+        if _new(abi):
+            yield abi
+    for path in sorted(CACHE_DIR.glob("*.json")) if CACHE_DIR.exists() else ():
+        if path.name == "index.json" or path.stem in seen:
+            continue
+        try:
+            abi = json.loads(path.read_text())
+        except json.JSONDecodeError:
+            continue
+        if _new(abi):
+            yield abi
+    for abi in _load_seed()["abis"].values():
+        if _new(abi):
+            yield abi
+
+
+def prefetch(
+    addresses: Sequence[str], chain_id: Optional[int] = None, api_key: Optional[str] = None
+) -> Dict[str, list]:
+    """
+    Makes sure the ABIs of all `addresses` are cached, fetching the missing
+    ones from Etherscan concurrently. ABIs Etherscan cannot provide come
+    from `remember` or the seed file if they have them. Returns address -> abi.
+    """
+    chain_id = _chain_id(chain_id)
+    ret = {address: _cached(_key(chain_id, address)) for address in addresses}
+    missing = [address for address, abi in ret.items() if abi is None]
+    if not missing:
+        return ret
+
+    etherscan = _etherscan(chain_id, api_key)
+
+    def _fetch(address: str) -> Tuple[Optional[list], Optional[Exception]]:
+        try:
+            return etherscan.fetch_abi(str(Address(address))), None
+        except Exception as e:
+            return None, e
+
+    # boa's Etherscan retries with backoff when rate limited
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        fetched = list(executor.map(_fetch, missing))
+    entries = {}
+    for address, (abi, error) in zip(missing, fetched):
+        if error is None:
+            entries[_key(chain_id, address)] = abi
+        else:
+            key = _key(chain_id, address)
+            abi = _remembered.get(key) or _from_seed(key)
+            if abi is None:
+                raise error
+        ret[address] = abi
+    if entries:
+        _store(entries)
+        _memory.update(entries)
+        _added.extend(entries.values())
+    return ret
+
+
+def fetch_abi(address: str, chain_id: Optional[int] = None, api_key: Optional[str] = None) -> list:
+    return prefetch([address], chain_id, api_key)[address]
+
+
+def from_etherscan(
+    address: str,
+    name: Optional[str] = None,
+    chain_id: Optional[int] = None,
+    api_key: Optional[str] = None,
+) -> ABIContract:
+    """Drop-in replacement for `boa.from_etherscan` that goes through the cache."""
+    abi = fetch_abi(address, chain_id, api_key)
+    return ABIContractFactory.from_abi_dict(abi, name=name or "<etherscan contract>").at(address)
+
+
+def export_seed(keys: Sequence[Key], path: Optional[Path] = None) -> None:
+    """Adds the cached ABIs of `keys` ((chain id, address) pairs) to a seed file for offline use."""
+    global _seed
+    path = Path(path or SEED_FILE)
+    try:
+        seed = json.loads(path.read_text())
+    except FileNotFoundError:
+        seed = {"index": {}, "abis": {}}
+    for chain_id, address in keys:
+        abi = cached_abi(address, chain_id)
+        assert abi is not None, f"ABI of {address} on chain {chain_id} is not cached"
+        abi_hash = _abi_hash(abi)
+        seed["index"][_index_key(_key(chain_id, address))] = abi_hash
+        seed["abis"][abi_hash] = abi
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(seed, indent=1, sort_keys=True) + "\n")
+    _seed = None
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python -m voting.etherscan <chain_id> <address>... adds the ABIs to the seed file
+    chain_id, addresses = int(sys.argv[1]), sys.argv[2:]
+    prefetch(addresses, chain_id)
+    export_seed([(chain_id, address) for address in addresses])
@@ -0,0 +1,177 @@
+from __future__ import annotations
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import boa
+from boa.contracts.abi.abi_contract import ABIContractFactory, _abi_from_json
+from boa.contracts.event_decoder import RawLogEntry, decode_log
+from boa.util.abi import Address
+from vyper.utils import keccak256
+
+from voting import abi
+
+
+@dataclass(frozen=True)
+class Event:
+    address: str
+    name: Optional[str]  # None if no ABI knows the event
+    args: dict
+    log_id: int
+    topics: Tuple[int, ...]
+    data: bytes
+
+    def __getitem__(self, field: str):
+        return self.args[field]
+
+    def to_dict(self) -> dict:
+        return {
+            "address": self.address,
+            "name": self.name,
+            "args": {k: _to_json(v) for k, v in self.args.items()},
+            "topics": [hex(topic) for topic in self.topics],
+            "data": "0x" + self.data.hex(),
+        }
+
+
+def _to_json(value):
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, int) and not isinstance(value, bool) and abs(value) >= 2**53:
+        return str(value)
+    return value
+
+
+def _factories() -> Iterable[ABIContractFactory]:
+    for value in vars(abi).values():
+        if isinstance(value, ABIContractFactory):
+            yield value
+        elif isinstance(value, dict):
+            yield from (v for v in value.values() if isinstance(v, ABIContractFactory))
+
+
+def _event_key(event_abi: dict) -> Tuple[int, int]:
+    signature = ",".join(_abi_from_json(item) for item in event_abi["inputs"])
+    event_id = int.from_bytes(keccak256(f"{event_abi['name']}({signature})".encode()), "big")
+    n_topics = 1 + sum(1 for item in event_abi["inputs"] if item["indexed"])
+    return event_id, n_topics
+
+
+@lru_cache(maxsize=None)
+def _known_events() -> Dict[Tuple[int, int], dict]:
+    """(topic0, number of topics) -> event abi, for every event in `voting.abi`."""
+    ret = {}
+    for factory in _factories():
+        for event_abi in factory.events:
+            if event_abi.get("anonymous"):
+                continue
+            ret.setdefault(_event_key(event_abi), event_abi)
+    return ret
+
+
+def _contract_events(env, address) -> Dict[Tuple[int, int], dict]:
+    contract = env.lookup_contract(address)
+    contract_abi = getattr(contract, "abi", None) or []
+    return {
+        _event_key(item): item
+        for item in contract_abi
+        if item.get("type") == "event" and not item.get("anonymous")
+    }
+
+
+def _decode(entry: RawLogEntry, contract_events: Dict[Tuple[int, int], dict]) -> Event:
+    address = str(Address(entry.address))
+    name, args = None, {}
+    if entry.topics:
+        key = (entry.topics[0], len(entry.topics))
+        # the ABI of a contract bound at that address wins over the generic table
+        event_abi = contract_events.get(key) or _known_events().get(key)
+        if event_abi is not None:
+            try:
+                decoded = decode_log(Address(entry.address), {entry.topics[0]: event_abi}, entry)
+            except Exception:
+                pass
+            else:
+                name = event_abi["name"]
+                args = dict(zip((item["name"] for item in event_abi["inputs"]), decoded[1:]))
+    return Event(address, name, args, entry.log_id, tuple(entry.topics), bytes(entry.data))
+
+
+class EventIndex:
+    """
+    Every event emitted by a simulation, decoded through `voting.abi` and
+    indexed by contract and event name.
+
+    ```py
+    with vote(OWNERSHIP, "Set things.") as report:
+        things.set()
+
+    assert report.events.find("ApplyAdmins", address=things.address)
+    assert report.events.one("Transfer", receiver=treasury)["value"] == amount
+    ```
+    """
+
+    def __init__(self, events: Sequence[Event] = ()):
+        self.events: List[Event] = list(events)
+        self._by_address: Dict[str, List[int]] = defaultdict(list)
+        self._by_name: Dict[Optional[str], List[int]] = defaultdict(list)
+        for i, event in enumerate(self.events):
+            self._by_address[event.address.lower()].append(i)
+            self._by_name[event.name].append(i)
+
+    @classmethod
+    def from_computations(cls, computations: Sequence, env=None) -> "EventIndex":
+        env = env or boa.env
+        entries = sorted(
+            entry for computation in computations for entry in computation.get_raw_log_entries()
+        )
+        events = []
+        contract_events: Dict[bytes, Dict[Tuple[int, int], dict]] = {}
+        for entry in entries:
+            entry = RawLogEntry(*entry)
+            if entry.address not in contract_events:
+                contract_events[entry.address] = _contract_events(env, entry.address)
+            events.append(_decode(entry, contract_events[entry.address]))
+        return cls(events)
+
+    def find(self, name: Optional[str] = None, address: Optional[str] = None, **fields) -> List[Event]:
+        """Events matching the name, the emitting contract and every given field."""
+        candidates = None
+        if address is not None:
+            candidates = self._by_address.get(str(address).lower(), [])
+        if name is not None:
+            by_name = self._by_name.get(name, [])
+            candidates = by_name if candidates is None else sorted(set(candidates) & set(by_name))
+        if candidates is None:
+            candidates = range(len(self.events))
+
+        ret = []
+        for i in candidates:
+            event = self.events[i]
+            if all(field in event.args and _equal(event.args[field], value) for field, value in fields.items()):
+                ret.append(event)
+        return ret
+
+    def one(self, name: Optional[str] = None, address: Optional[str] = None, **fields) -> Event:
+        events = self.find(name, address, **fields)
+        assert len(events) == 1, f"Expected one {name or 'event'} event, found {len(events)}"
+        return events[0]
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def to_list(self) -> List[dict]:
+        return [event.to_dict() for event in self.events]
+
+
+def _equal(a, b) -> bool:
+    # addresses compare case-insensitively
+    if isinstance(a, str) and isinstance(b, str):
+        return a.lower() == b.lower()
+    return a == b
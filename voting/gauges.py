@@ -0,0 +1,322 @@
+from __future__ import annotations
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from boa.util.abi import abi_decode
+
+from voting import abi
+from voting.constants import GAUGE_CONTROLLER, MULTICALL3
+from voting.multicall import multicall
+
+WEEK = 7 * 86400
+
+
+def gauge_types(gauge_controller, gauges: Sequence[str]) -> List[Optional[int]]:
+    """
+    Returns the type of every gauge in a single batched read, or `None` for
+    gauges that are not in the controller (`gauge_types` reverts for them).
+    """
+    return multicall([(gauge_controller.gauge_types, gauge) for gauge in gauges])
+
+
+@dataclass(frozen=True)
+class GaugeState:
+    address: str
+    gauge_type: int
+    version: Optional[str]  # None if the gauge has no `version()` (not a factory gauge)
+    is_killed: Optional[bool]
+    relative_weight: float  # share of the emissions, 1.0 = 100%
+    total_supply: Optional[int]  # staked LP
+    working_supply: Optional[int]
+    active_rewards: int  # reward tokens still being distributed
+
+    @property
+    def is_v6(self) -> bool:
+        return self.version is not None and self.version.startswith("v6")
+
+
+@dataclass(frozen=True)
+class KillCriteria:
+    """
+    Gauges matching every criterion are kill candidates. Only live
+    `liquidity_gauge_v6` gauges are considered, `None` disables a criterion.
+    """
+
+    max_relative_weight: Optional[float] = 1e-6
+    max_total_supply: Optional[int] = None
+    max_working_supply: Optional[int] = None
+    allow_active_rewards: bool = False
+
+    def matches(self, gauge: GaugeState) -> bool:
+        if not gauge.is_v6 or gauge.is_killed is not False:
+            return False
+        if self.max_relative_weight is not None and gauge.relative_weight > self.max_relative_weight:
+            return False
+        if self.max_total_supply is not None and (gauge.total_supply or 0) > self.max_total_supply:
+            return False
+        if (
+            self.max_working_supply is not None
+            and (gauge.working_supply or 0) > self.max_working_supply
+        ):
+            return False
+        return self.allow_active_rewards or gauge.active_rewards == 0
+
+
+def scan_gauges(gauge_controller, block_identifier: Optional[int] = None) -> List[GaugeState]:
+    """
+    Reads every gauge of the controller with batched Multicall3 reads, all
+    at the same block (the fork block unless `block_identifier` is given).
+    Reads a gauge does not support come back as `None`.
+    """
+    reads = dict(block_identifier=block_identifier, remote=True)
+    (n_gauges,) = multicall([gauge_controller.n_gauges], allow_failure=False, **reads)
+    gauges = multicall(
+        [(gauge_controller.gauges, i) for i in range(n_gauges)], allow_failure=False, **reads
+    )
+    if not gauges:
+        return []
+    (timestamp,) = multicall([abi.multicall3.at(MULTICALL3).getCurrentBlockTimestamp], **reads)
+
+    # gauges share the ABI, only the address changes
+    template = abi.liquidity_gauge_v6.at(gauges[0])
+    calls = []
+    for gauge in gauges:
+        calls += [
+            (gauge_controller.gauge_types, gauge),
+            (gauge_controller.gauge_relative_weight, gauge),
+            (gauge, template.version),
+            (gauge, template.is_killed),
+            (gauge, template.totalSupply),
+            (gauge, template.working_supply),
+            (gauge, template.reward_count),
+        ]
+    results = multicall(calls, **reads)
+    rows = [results[i : i + 7] for i in range(0, len(results), 7)]
+
+    # reward tokens, then their distribution state
+    reward_calls = [
+        (gauge, template.reward_tokens, k)
+        for gauge, row in zip(gauges, rows)
+        for k in range(row[6] or 0)
+    ]
+    reward_tokens = multicall(reward_calls, **reads)
+    reward_data = multicall(
+        [
+            (gauge, template.reward_data, token)
+            for (gauge, _, _), token in zip(reward_calls, reward_tokens)
+        ],
+        **reads,
+    )
+    active: Dict[str, int] = {}
+    for (gauge, _, _), data in zip(reward_calls, reward_data):
+        if data is not None and data[2] > timestamp:
+            active[gauge] = active.get(gauge, 0) + 1
+
+    return [
+        GaugeState(
+            address=gauge,
+            gauge_type=gauge_type,
+            version=version,
+            is_killed=is_killed,
+            relative_weight=(weight or 0) / 10**18,
+            total_supply=total_supply,
+            working_supply=working_supply,
+            active_rewards=active.get(gauge, 0),
+        )
+        for gauge, (gauge_type, weight, version, is_killed, total_supply, working_supply, _) in zip(
+            gauges, rows
+        )
+    ]
+
+
+def kill_candidates(
+    gauges: Sequence[GaugeState], criteria: KillCriteria = KillCriteria()
+) -> List[GaugeState]:
+    """Gauges matching `criteria`, the least used first."""
+    return sorted(
+        (gauge for gauge in gauges if criteria.matches(gauge)),
+        key=lambda gauge: (gauge.relative_weight, gauge.working_supply or 0, gauge.total_supply or 0),
+    )
+
+
+@dataclass(frozen=True)
+class EmissionWeights:
+    """
+    Weights the Gauge Controller splits CRV emissions by. A gauge gets
+    `type_weight * gauge_weight / sum(type_weight * gauge_weight)` of the
+    emissions, killed gauges do not mint their share.
+    """
+
+    gauges: Tuple[str, ...]
+    types: np.ndarray
+    gauge_weights: np.ndarray
+    type_weights: np.ndarray  # by type id
+    killed: np.ndarray
+    rate: int  # CRV per second
+
+    @property
+    def relative_weights(self) -> np.ndarray:
+        weights = self.type_weights[self.types] * self.gauge_weights
+        total = weights.sum()
+        return weights / total if total else weights
+
+    @property
+    def emissions(self) -> np.ndarray:
+        """CRV per week of every gauge."""
+        return np.where(self.killed, 0.0, self.relative_weights * self.rate * WEEK / 10**18)
+
+
+def read_emission_weights(gauge_controller, block_identifier: Optional[int] = None) -> EmissionWeights:
+    """Every gauge's type, weight and killed flag, and the type weights, in batched reads."""
+    reads = dict(block_identifier=block_identifier, remote=True)
+    n_gauges, n_types, token = multicall(
+        [gauge_controller.n_gauges, gauge_controller.n_gauge_types, gauge_controller.token],
+        allow_failure=False,
+        **reads,
+    )
+    gauges = multicall(
+        [(gauge_controller.gauges, i) for i in range(n_gauges)], allow_failure=False, **reads
+    )
+    calls = [abi.crv.at(token).rate]
+    calls += [(gauge_controller.get_type_weight, t) for t in range(n_types)]
+    if gauges:
+        template = abi.liquidity_gauge_v6.at(gauges[0])
+        for gauge in gauges:
+            calls += [
+                (gauge_controller.gauge_types, gauge),
+                (gauge_controller.get_gauge_weight, gauge),
+                (gauge, template.is_killed),
+            ]
+    rate, *results = multicall(calls, **reads)
+    type_weights, rows = results[:n_types], results[n_types:]
+    return EmissionWeights(
+        gauges=tuple(gauges),
+        types=np.array(rows[0::3], dtype=int),
+        gauge_weights=np.array([weight or 0 for weight in rows[1::3]], dtype=float),
+        type_weights=np.array([weight or 0 for weight in type_weights], dtype=float),
+        # gauges without `is_killed` (very old ones) count as live
+        killed=np.array([bool(killed) for killed in rows[2::3]]),
+        rate=rate,
+    )
+
+
+def _controller_functions() -> Dict[bytes, object]:
+    names = ("add_gauge", "add_type", "change_gauge_weight", "change_type_weight")
+    return {f.method_id: f for f in abi.gauge_controller.functions if f.name in names}
+
+
+_SET_KILLED = next(f for f in abi.liquidity_gauge_v6.functions if f.name == "set_killed").method_id
+
+
+def affects_emissions(actions: Sequence, gauge_controller: str = GAUGE_CONTROLLER) -> bool:
+    """Whether any action changes gauge or type weights, or kills or revives a gauge."""
+    controller = _controller_functions()
+    for address, calldata in actions:
+        selector = bytes(calldata[:4])
+        if selector == _SET_KILLED or (
+            str(address).lower() == gauge_controller.lower() and selector in controller
+        ):
+            return True
+    return False
+
+
+def apply_actions(
+    weights: EmissionWeights, actions: Sequence, gauge_controller: str = GAUGE_CONTROLLER
+) -> EmissionWeights:
+    """
+    The weights once `actions` are executed, from the calls to the
+    controller (`add_gauge`, `add_type`, `change_gauge_weight`,
+    `change_type_weight`) and to `set_killed` of its gauges.
+    """
+    controller = _controller_functions()
+    gauges = list(weights.gauges)
+    index = {gauge.lower(): i for i, gauge in enumerate(gauges)}
+    types, gauge_weights = list(weights.types), list(weights.gauge_weights)
+    type_weights, killed = list(weights.type_weights), list(weights.killed)
+
+    for address, calldata in actions:
+        selector, data = bytes(calldata[:4]), bytes(calldata[4:])
+        if selector == _SET_KILLED and str(address).lower() in index:
+            (is_killed,) = abi_decode("(bool)", data)
+            killed[index[str(address).lower()]] = is_killed
+            continue
+        if str(address).lower() != gauge_controller.lower() or selector not in controller:
+            continue
+        function = controller[selector]
+        args = abi_decode(f"({','.join(function.argument_types)})", data)
+        if function.name == "add_gauge":
+            gauge, gauge_type, weight = (*args, 0)[:3]
+            index[str(gauge).lower()] = len(gauges)
+            gauges.append(str(gauge))
+            types.append(gauge_type)
+            gauge_weights.append(weight)
+            killed.append(False)
+        elif function.name == "add_type":
+            type_weights.append((*args, 0)[1])
+        elif function.name == "change_gauge_weight":
+            gauge, weight = args
+            gauge_weights[index[str(gauge).lower()]] = weight
+        else:
+            gauge_type, weight = args
+            type_weights[gauge_type] = weight
+
+    return replace(
+        weights,
+        gauges=tuple(gauges),
+        types=np.array(types, dtype=int),
+        gauge_weights=np.array(gauge_weights, dtype=float),
+        type_weights=np.array(type_weights, dtype=float),
+        killed=np.array(killed, dtype=bool),
+    )
+
+
+@dataclass(frozen=True)
+class EmissionProjection:
+    """Relative weights and CRV per week of every gauge before and after a vote."""
+
+    gauges: Tuple[str, ...]
+    relative_before: np.ndarray
+    relative_after: np.ndarray
+    emissions_before: np.ndarray
+    emissions_after: np.ndarray
+
+    @property
+    def emission_changes(self) -> np.ndarray:
+        return self.emissions_after - self.emissions_before
+
+    def to_dict(self) -> dict:
+        return {
+            gauge: {
+                "relative_weight": [float(self.relative_before[i]), float(self.relative_after[i])],
+                "crv_per_week": [float(self.emissions_before[i]), float(self.emissions_after[i])],
+            }
+            for i, gauge in enumerate(self.gauges)
+        }
+
+    def table(self, limit: Optional[int] = 20) -> str:
+        order = np.argsort(-np.abs(self.emission_changes))[:limit]
+        lines = [f"{'gauge':>42} {'weight before':>14} {'after':>10} {'CRV/week before':>16} {'after':>12} {'change':>12}"]
+        for i in order:
+            lines.append(
+                f"{self.gauges[i]:>42} {self.relative_before[i]:>14.4%} {self.relative_after[i]:>10.4%} "
+                f"{self.emissions_before[i]:>16.2f} {self.emissions_after[i]:>12.2f} {self.emission_changes[i]:>+12.2f}"
+            )
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.table()
+
+
+def project_emissions(before: EmissionWeights, after: EmissionWeights) -> EmissionProjection:
+    """Aligns both states on the gauges of `after`, gauges added by the vote start at 0."""
+    n = len(before.gauges)
+    assert after.gauges[:n] == before.gauges, "Gauges can only be added"
+    pad = len(after.gauges) - n
+    return EmissionProjection(
+        gauges=after.gauges,
+        relative_before=np.pad(before.relative_weights, (0, pad)),
+        relative_after=after.relative_weights,
+        emissions_before=np.pad(before.emissions, (0, pad)),
+        emissions_after=after.emissions,
+    )
@@ -0,0 +1,59 @@
+"""
+Batched reads of a contract's on-chain history: event logs over block
+ranges and the timestamps of the blocks they were emitted in. Every range
+and every block goes out in the same JSON-RPC batch request.
+"""
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence
+
+from boa.rpc import EthereumRPC, to_hex, to_int
+
+from voting.multicall import _fork_rpc
+
+# Blocks per `eth_getLogs` request, most providers cap the range
+LOG_BLOCK_RANGE = 2000
+
+
+def rpc(url: Optional[str] = None) -> EthereumRPC:
+    """An RPC for `url`, or the one of the current fork."""
+    return EthereumRPC(url) if url else _fork_rpc()
+
+
+def fetch_logs(
+    address: str,
+    topics: Sequence[str],
+    from_block: int,
+    to_block: int,
+    rpc_url: Optional[str] = None,
+    block_range: int = LOG_BLOCK_RANGE,
+) -> List[dict]:
+    """
+    Logs of `address` whose first topic is any of `topics`, between two
+    blocks (inclusive), ordered by block and log index.
+    """
+    payloads = [
+        (
+            "eth_getLogs",
+            [
+                {
+                    "address": address,
+                    "topics": [list(topics)],
+                    "fromBlock": to_hex(start),
+                    "toBlock": to_hex(min(start + block_range - 1, to_block)),
+                }
+            ],
+        )
+        for start in range(from_block, to_block + 1, block_range)
+    ]
+    batches = rpc(rpc_url).fetch_multi(payloads)
+    logs = [log for batch in batches for log in batch if not log.get("removed")]
+    return sorted(logs, key=lambda log: (to_int(log["blockNumber"]), to_int(log["logIndex"])))
+
+
+def block_timestamps(blocks: Sequence[int], rpc_url: Optional[str] = None) -> Dict[int, int]:
+    """block number -> timestamp."""
+    blocks = sorted(set(blocks))
+    headers = rpc(rpc_url).fetch_multi(
+        [("eth_getBlockByNumber", [to_hex(block), False]) for block in blocks]
+    )
+    return {block: to_int(header["timestamp"]) for block, header in zip(blocks, headers)}
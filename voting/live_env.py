@@ -1,3 +1,5 @@
+from typing import Optional, Tuple
+
 import boa
 import logging
 
@@ -13,8 +15,19 @@ class LiveEnv:
     def set(self) -> bool:
         pass
 
+    def preflight_target(self) -> Tuple[Optional[str], Optional[str]]:
+        """RPC and account the vote will be submitted with, for `voting.preflight`."""
+        return None, None
+
 
 class BrowserEnv(LiveEnv):
+    def __init__(self, address: Optional[str] = None):
+        # the wallet is only known once connected, give its address to check it early
+        self.address = address
+
+    def preflight_target(self) -> Tuple[Optional[str], Optional[str]]:
+        return None, self.address
+
     @staticmethod
     def set(self=None) -> bool:
         try:
@@ -33,6 +46,9 @@ class CustomEnv(LiveEnv):
 
         self.ask_to_proceed = ask_to_proceed
 
+    def preflight_target(self) -> Tuple[Optional[str], Optional[str]]:
+        return self.rpc, self.account.address
+
     def set(self) -> bool:
         if self.ask_to_proceed:
             print("Press ENTER to continue..")
@@ -0,0 +1,118 @@
+"""
+Local stand-ins for the DAO contracts so that votes can be simulated on a
+plain local EVM, without forking mainnet or any L2.
+
+```py
+from voting import vote, OWNERSHIP
+from voting.mock import mock_dao
+
+with mock_dao() as dao:
+    pool = dao.deploy("MyPool.vy", OWNERSHIP.agent)
+    with vote(OWNERSHIP, "Set things."):
+        pool.set_things()
+```
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+
+import boa
+from boa.contracts.abi.abi_contract import ABIContract, ABIContractFactory
+from boa.environment import Env
+
+from voting.config import DAOParameters, OWNERSHIP, PARAMETER
+from voting.constants import ZERO_ADDRESS
+from voting.context import use_mock
+from voting.xgov import broadcasters, chains
+
+CONTRACTS = Path(__file__).parent / "contracts"
+
+VOTE_TIME = 604800
+# supportRequiredPct of the mainnet votings, quorum comes from DAOParameters
+SUPPORT_REQUIRED = {OWNERSHIP: 51 * 10**16, PARAMETER: 70 * 10**16}
+
+
+@lru_cache(maxsize=None)
+def _deployer(name: str):
+    # compiled once per process
+    return boa.load_partial(str(CONTRACTS / f"{name}.vy"))
+
+
+def _all_chains() -> Dict[int, chains.Chain]:
+    return {
+        chain.id: chain for chain in vars(chains).values() if isinstance(chain, chains.Chain)
+    }
+
+
+class MockDAO:
+    """
+    Deploys the mock Aragon votings and agents of `OWNERSHIP` and
+    `PARAMETER` and a mock broadcaster at every broadcaster address on the
+    current env. Every chain gets its own env with a mock relayer and mock
+    agents at the chain's relayer address, created when first used.
+    """
+
+    def __init__(self):
+        self.votings = {}
+        self.agents = {}
+        for dao in (OWNERSHIP, PARAMETER):
+            self.votings[dao] = self._deploy_dao(dao)
+            self.agents[dao] = _deployer("MockAragonAgent").deploy(
+                dao.voting, override_address=dao.agent
+            )
+
+        self.broadcasters = {}
+        for broadcaster in vars(broadcasters).values():
+            if isinstance(broadcaster, broadcasters.BaseBroadcaster):
+                self.broadcasters[broadcaster.address] = _deployer("MockBroadcaster").deploy(
+                    OWNERSHIP.agent, PARAMETER.agent, override_address=broadcaster.address
+                )
+
+        self._chain_envs: Dict[int, Env] = {}
+
+    def _deploy_dao(self, dao: DAOParameters):
+        return _deployer("MockVoting").deploy(
+            dao.token,
+            SUPPORT_REQUIRED[dao],
+            dao.quorum * 10**16,
+            VOTE_TIME,
+            override_address=dao.voting,
+        )
+
+    def chain_env(self, chain_id: int) -> Env:
+        if chain_id not in self._chain_envs:
+            chain = _all_chains()[chain_id]
+            assert chain.relayer and chain.relayer != ZERO_ADDRESS, f"Relayer not known for chain {chain_id}"
+            env = Env()
+            with boa.swap_env(env):
+                agents = [_deployer("MockAgent").deploy(chain.relayer) for _ in range(3)]
+                _deployer("MockRelayer").deploy(
+                    *(agent.address for agent in agents),
+                    env.eoa,
+                    override_address=chain.relayer,
+                )
+            self._chain_envs[chain_id] = env
+        return self._chain_envs[chain_id]
+
+    def deploy(self, path: str, *args, **kwargs) -> ABIContract:
+        """
+        Deploys a contract on the mock mainnet, e.g. one owned by an agent.
+        It is returned as an ABI contract so that `vote()` captures its calls.
+        """
+        contract = boa.load(path, *args, **kwargs)
+        return ABIContractFactory.from_abi_dict(contract.abi, Path(path).stem).at(contract.address)
+
+
+@contextmanager
+def mock_dao():
+    """
+    Single switch that points `OWNERSHIP`, `PARAMETER` and the chains of
+    `voting.xgov.chains` at the mocks. Everything is deployed inside an
+    anchor and gone once the block exits.
+    """
+    with boa.env.anchor():
+        dao = MockDAO()
+        with use_mock(dao):
+            yield dao
@@ -0,0 +1,26 @@
+# pragma version ~=0.4.0
+"""
+@title MockAgent
+@notice Local stand-in for the L2 agent: only the relayer may execute.
+"""
+
+struct Message:
+    target: address
+    data: Bytes[MAX_BYTES]
+
+MAX_BYTES: constant(uint256) = 1024
+MAX_MESSAGES: constant(uint256) = 8
+
+RELAYER: public(immutable(address))
+
+
+@deploy
+def __init__(_relayer: address):
+    RELAYER = _relayer
+
+
+@external
+def execute(_messages: DynArray[Message, MAX_MESSAGES]):
+    assert msg.sender == RELAYER
+    for message: Message in _messages:
+        raw_call(message.target, message.data)
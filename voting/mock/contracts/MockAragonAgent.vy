@@ -0,0 +1,31 @@
+# pragma version ~=0.4.0
+"""
+@title MockAragonAgent
+@notice Local stand-in for the Aragon Agent: only the voting app may execute.
+"""
+
+event Execute:
+    sender: indexed(address)
+    target: indexed(address)
+    ethValue: uint256
+    data: Bytes[24576]
+
+voting: public(address)
+
+
+@deploy
+def __init__(_voting: address):
+    self.voting = _voting
+
+
+@payable
+@external
+def __default__():
+    pass
+
+
+@external
+def execute(_target: address, _ethValue: uint256, _data: Bytes[24576]):
+    assert msg.sender == self.voting, "APP_AUTH_FAILED"
+    raw_call(_target, _data, value=_ethValue, max_outsize=0)
+    log Execute(sender=msg.sender, target=_target, ethValue=_ethValue, data=_data)
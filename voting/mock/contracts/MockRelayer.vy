@@ -0,0 +1,39 @@
+# pragma version ~=0.4.0
+"""
+@title MockRelayer
+@notice Local stand-in for the L2 relayer.
+"""
+
+struct Message:
+    target: address
+    data: Bytes[MAX_BYTES]
+
+interface IAgent:
+    def execute(_messages: DynArray[Message, MAX_MESSAGES]): nonpayable
+
+MAX_BYTES: constant(uint256) = 1024
+MAX_MESSAGES: constant(uint256) = 8
+
+OWNERSHIP_AGENT: public(immutable(address))
+PARAMETER_AGENT: public(immutable(address))
+EMERGENCY_AGENT: public(immutable(address))
+messenger: public(address)
+
+
+@deploy
+def __init__(_ownership_agent: address, _parameter_agent: address, _emergency_agent: address, _messenger: address):
+    OWNERSHIP_AGENT = _ownership_agent
+    PARAMETER_AGENT = _parameter_agent
+    EMERGENCY_AGENT = _emergency_agent
+    self.messenger = _messenger
+
+
+@external
+def relay(_agent: uint256, _messages: DynArray[Message, MAX_MESSAGES]):
+    assert msg.sender == self.messenger
+    agent: address = OWNERSHIP_AGENT
+    if _agent == 2:
+        agent = PARAMETER_AGENT
+    elif _agent == 4:
+        agent = EMERGENCY_AGENT
+    extcall IAgent(agent).execute(_messages)
@@ -0,0 +1,171 @@
+# pragma version ~=0.4.0
+"""
+@title MockVoting
+@notice Local stand-in for the Aragon Voting app: stores EVM scripts,
+        counts one vote per voter and runs the script through the agent.
+"""
+
+MAX_SCRIPT: constant(uint256) = 65536
+MAX_CALL: constant(uint256) = 24576
+MAX_ACTIONS: constant(uint256) = 128
+PCT_BASE: public(constant(uint64)) = 10**18
+
+struct Vote:
+    executed: bool
+    start_date: uint64
+    snapshot_block: uint64
+    yea: uint256
+    nay: uint256
+
+event StartVote:
+    voteId: indexed(uint256)
+    creator: indexed(address)
+    metadata: String[1024]
+    minBalance: uint256
+    minTime: uint256
+    totalSupply: uint256
+    creatorVotingPower: uint256
+
+event CastVote:
+    voteId: indexed(uint256)
+    voter: indexed(address)
+    supports: bool
+    stake: uint256
+
+event ExecuteVote:
+    voteId: indexed(uint256)
+
+voteTime: public(uint64)
+supportRequiredPct: public(uint64)
+minAcceptQuorumPct: public(uint64)
+token: public(address)
+votesLength: public(uint256)
+
+votes: HashMap[uint256, Vote]
+scripts: HashMap[uint256, Bytes[MAX_SCRIPT]]
+voted: HashMap[uint256, HashMap[address, bool]]
+
+
+@deploy
+def __init__(_token: address, _supportRequiredPct: uint64, _minAcceptQuorumPct: uint64, _voteTime: uint64):
+    self.token = _token
+    self.supportRequiredPct = _supportRequiredPct
+    self.minAcceptQuorumPct = _minAcceptQuorumPct
+    self.voteTime = _voteTime
+
+
+@view
+@external
+def canCreateNewVote(_sender: address) -> bool:
+    return True
+
+
+@external
+def newVote(
+    _executionScript: Bytes[MAX_SCRIPT],
+    _metadata: String[1024],
+    _castVote: bool = False,
+    _executesIfDecided: bool = False,
+) -> uint256:
+    vote_id: uint256 = self.votesLength
+    self.votesLength = vote_id + 1
+    self.votes[vote_id] = Vote(
+        executed=False,
+        start_date=convert(block.timestamp, uint64),
+        snapshot_block=convert(block.number - 1, uint64),
+        yea=0,
+        nay=0,
+    )
+    self.scripts[vote_id] = _executionScript
+    log StartVote(
+        voteId=vote_id, creator=msg.sender, metadata=_metadata, minBalance=0, minTime=0, totalSupply=0, creatorVotingPower=0
+    )
+    if _castVote:
+        self._vote(vote_id, True, msg.sender)
+    return vote_id
+
+
+@view
+@internal
+def _is_open(_voteId: uint256) -> bool:
+    v: Vote = self.votes[_voteId]
+    return _voteId < self.votesLength and not v.executed and block.timestamp < convert(v.start_date + self.voteTime, uint256)
+
+
+@view
+@external
+def canVote(_voteId: uint256, _voter: address) -> bool:
+    return self._is_open(_voteId) and not self.voted[_voteId][_voter]
+
+
+@internal
+def _vote(_voteId: uint256, _supports: bool, _voter: address):
+    assert self._is_open(_voteId) and not self.voted[_voteId][_voter], "VOTING_CAN_NOT_VOTE"
+    self.voted[_voteId][_voter] = True
+    if _supports:
+        self.votes[_voteId].yea += 1
+    else:
+        self.votes[_voteId].nay += 1
+    log CastVote(voteId=_voteId, voter=_voter, supports=_supports, stake=1)
+
+
+@external
+def vote(_voteData: uint256, _supports: bool, _executesIfDecided: bool):
+    self._vote(_voteData, _supports, msg.sender)
+
+
+@view
+@internal
+def _can_execute(_voteId: uint256) -> bool:
+    v: Vote = self.votes[_voteId]
+    if _voteId >= self.votesLength or v.executed:
+        return False
+    if block.timestamp < convert(v.start_date + self.voteTime, uint256):
+        return False
+    return v.yea > v.nay
+
+
+@view
+@external
+def canExecute(_voteId: uint256) -> bool:
+    return self._can_execute(_voteId)
+
+
+@external
+def executeVote(_voteId: uint256):
+    assert self._can_execute(_voteId), "VOTING_CAN_NOT_EXECUTE"
+    self.votes[_voteId].executed = True
+
+    # spec id 1: [20 bytes target][4 bytes length][calldata]...
+    script: Bytes[MAX_SCRIPT] = self.scripts[_voteId]
+    assert convert(slice(script, 0, 4), bytes4) == 0x00000001, "EVMCALLS_INVALID_SPEC"
+    offset: uint256 = 4
+    for i: uint256 in range(MAX_ACTIONS):
+        if offset >= len(script):
+            break
+        target: address = convert(convert(slice(script, offset, 20), bytes20), address)
+        length: uint256 = convert(convert(slice(script, offset + 20, 4), bytes4), uint256)
+        raw_call(target, slice(script, offset + 24, length), max_outsize=0)
+        offset += 24 + length
+    # actions past MAX_ACTIONS would be skipped silently
+    assert offset == len(script), "EVMCALLS_TOO_MANY_ACTIONS"
+
+    log ExecuteVote(voteId=_voteId)
+
+
+@view
+@external
+def getVote(_voteId: uint256) -> (bool, bool, uint64, uint64, uint64, uint64, uint256, uint256, uint256, Bytes[MAX_SCRIPT]):
+    v: Vote = self.votes[_voteId]
+    return (
+        self._is_open(_voteId),
+        v.executed,
+        v.start_date,
+        v.snapshot_block,
+        self.supportRequiredPct,
+        self.minAcceptQuorumPct,
+        v.yea,
+        v.nay,
+        v.yea + v.nay,
+        self.scripts[_voteId],
+    )
@@ -0,0 +1,309 @@
+"""
+Off-chain NumPy models of the stableswap-ng and twocrypto-ng invariants and
+`get_dy`, to explore parameter grids without going through the EVM.
+
+Pool state is read once from the fork. `get_dy` then broadcasts over any
+shape of amounts and parameters, so a whole grid is a single vectorized
+pass. Results are floats and match the pool to ~1e-9 relatively (less for
+amounts tiny compared to the balances), check them against the pool with
+`check_get_dy` before relying on them.
+
+```py
+state = StableswapState.read(pool)
+dy = state.get_dy(0, 1, amounts[None, :], A=np.array(As)[:, None])  # (len(As), len(amounts))
+check_get_dy(pool, state, 0, 1, amounts[::10])
+```
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Sequence
+
+import boa
+import numpy as np
+
+from voting.multicall import multicall
+
+PRECISION = 10**18
+FEE_DENOMINATOR = 10**10
+# stableswap-ng keeps A multiplied by A_PRECISION, twocrypto-ng by A_MULTIPLIER
+A_PRECISION = 100
+A_MULTIPLIER = 10000
+
+# Newton iterations are stopped once every element moved less than this (relative)
+TOLERANCE = 1e-15
+MAX_ITERATIONS = 255
+
+
+def _converged(new, old) -> bool:
+    return bool(np.all(np.abs(new - old) <= TOLERANCE * np.abs(new)))
+
+
+def stableswap_D(xp: np.ndarray, amp) -> np.ndarray:
+    """Invariant of balances `xp` (last axis are the coins) with `amp` = A * A_PRECISION."""
+    n = xp.shape[-1]
+    S = xp.sum(axis=-1)
+    Ann = np.asarray(amp, dtype=float) * n
+    D = np.broadcast_to(S, np.broadcast(S, Ann).shape).astype(float)
+    for _ in range(MAX_ITERATIONS):
+        D_P = D
+        for k in range(n):
+            D_P = D_P * D / xp[..., k]
+        D_P = D_P / n**n
+        D_prev = D
+        D = (Ann * S / A_PRECISION + D_P * n) * D / (
+            (Ann - A_PRECISION) * D / A_PRECISION + (n + 1) * D_P
+        )
+        if _converged(D, D_prev):
+            break
+    return D
+
+
+def stableswap_y(i: int, j: int, x, xp: np.ndarray, amp, D) -> np.ndarray:
+    """Balance of coin `j` once coin `i` is set to `x`, keeping `D`."""
+    n = xp.shape[-1]
+    Ann = np.asarray(amp, dtype=float) * n
+    c = np.asarray(D, dtype=float)
+    S_ = 0.0
+    for k in range(n):
+        if k == j:
+            continue
+        _x = x if k == i else xp[..., k]
+        S_ = S_ + _x
+        c = c * D / (_x * n)
+    c = c * D * A_PRECISION / (Ann * n)
+    b = S_ + D * A_PRECISION / Ann
+    y = np.broadcast_to(D, np.broadcast(c, b).shape).astype(float)
+    for _ in range(MAX_ITERATIONS):
+        y_prev = y
+        y = (y * y + c) / (2 * y + b - D)
+        if _converged(y, y_prev):
+            break
+    return y
+
+
+def _stableswap_dynamic_fee(xpi, xpj, fee, offpeg_fee_multiplier):
+    xps2 = (xpi + xpj) ** 2
+    dynamic = offpeg_fee_multiplier * fee / (
+        (offpeg_fee_multiplier - FEE_DENOMINATOR) * 4 * xpi * xpj / xps2 + FEE_DENOMINATOR
+    )
+    return np.where(offpeg_fee_multiplier <= FEE_DENOMINATOR, fee, dynamic)
+
+
+@dataclass(frozen=True)
+class StableswapState:
+    balances: np.ndarray  # (N,)
+    rates: np.ndarray  # stored_rates, (N,)
+    amp: int  # A_precise
+    fee: int
+    offpeg_fee_multiplier: int
+
+    @classmethod
+    def read(cls, pool) -> "StableswapState":
+        n = pool.N_COINS()
+        results = multicall(
+            [(pool.balances, k) for k in range(n)]
+            + [pool.stored_rates, pool.A_precise, pool.fee, pool.offpeg_fee_multiplier],
+            allow_failure=False,
+        )
+        balances, (rates, amp, fee, offpeg_fee_multiplier) = results[:n], results[n:]
+        return cls(
+            np.array(balances, dtype=float),
+            np.array(rates, dtype=float),
+            amp,
+            fee,
+            offpeg_fee_multiplier,
+        )
+
+    def get_dy(
+        self,
+        i: int,
+        j: int,
+        dx,
+        A=None,
+        fee=None,
+        offpeg_fee_multiplier=None,
+    ) -> np.ndarray:
+        """
+        Like the pool's `get_dy`. `dx` and the optional parameters (`A` as
+        passed to `ramp_A`, without A_PRECISION) broadcast against each other.
+        """
+        amp = self.amp if A is None else np.asarray(A, dtype=float) * A_PRECISION
+        fee = self.fee if fee is None else np.asarray(fee, dtype=float)
+        offpeg = (
+            self.offpeg_fee_multiplier
+            if offpeg_fee_multiplier is None
+            else np.asarray(offpeg_fee_multiplier, dtype=float)
+        )
+        dx = np.asarray(dx, dtype=float)
+
+        xp = self.rates * self.balances / PRECISION
+        D = stableswap_D(xp, amp)
+        x = xp[i] + dx * self.rates[i] / PRECISION
+        y = stableswap_y(i, j, x, xp, amp, D)
+        dy = xp[j] - y - 1
+        dynamic_fee = _stableswap_dynamic_fee((xp[i] + x) / 2, (xp[j] + y) / 2, fee, offpeg)
+        dy = dy - dynamic_fee * dy / FEE_DENOMINATOR
+        return dy * PRECISION / self.rates[j]
+
+
+def _cryptoswap_G(K0, a, g):
+    """K * N**N from the whitepaper and its derivative by K0, `a` is A * N**N."""
+    g1k0 = g + 1 - K0
+    G = a * K0 * g**2 / g1k0**2
+    dG = a * g**2 * (g + 1 + K0) / g1k0**3
+    return G, dG
+
+
+def twocrypto_D(A, gamma, x0, x1) -> np.ndarray:
+    """
+    Invariant of scaled balances `x0`, `x1` (`A` and `gamma` as returned by
+    the pool), solving K0 - 1 + K N**N (S / D - 1) = 0 with Newton.
+    """
+    a = np.asarray(A, dtype=float) / A_MULTIPLIER
+    g = np.asarray(gamma, dtype=float) / PRECISION
+    S, P = x0 + x1, x0 * x1
+    D = np.broadcast_to(2 * np.sqrt(P), np.broadcast(S, a, g).shape).astype(float)
+    for _ in range(MAX_ITERATIONS):
+        K0 = 4 * P / D**2
+        G, dG = _cryptoswap_G(K0, a, g)
+        f = K0 - 1 + G * (S / D - 1)
+        fprime = -2 * K0 / D * (1 + dG * (S / D - 1)) - G * S / D**2
+        D_prev = D
+        D = D - f / fprime
+        D = np.where(D > 0, D, D_prev / 2)
+        if _converged(D, D_prev):
+            break
+    return D
+
+
+def twocrypto_y(A, gamma, x, D) -> np.ndarray:
+    """Scaled balance of the other coin when one coin is set to `x`, keeping `D`."""
+    a = np.asarray(A, dtype=float) / A_MULTIPLIER
+    g = np.asarray(gamma, dtype=float) / PRECISION
+    # in units of D, starting from the constant product curve
+    u = x / D
+    v = np.broadcast_to(1 / (4 * u), np.broadcast(u, a, g).shape).astype(float)
+    for _ in range(MAX_ITERATIONS):
+        K0 = 4 * u * v
+        G, dG = _cryptoswap_G(K0, a, g)
+        f = K0 - 1 + G * (u + v - 1)
+        fprime = 4 * u * (1 + dG * (u + v - 1)) + G
+        v_prev = v
+        v = v - f / fprime
+        v = np.where(v > 0, v, v_prev / 2)
+        if _converged(v, v_prev):
+            break
+    return v * D
+
+
+@dataclass(frozen=True)
+class TwocryptoState:
+    balances: np.ndarray  # (2,)
+    precisions: np.ndarray  # (2,)
+    price_scale: int
+    A: int
+    gamma: int
+    D: int
+    mid_fee: int
+    out_fee: int
+    fee_gamma: int
+    ramping: bool
+
+    @classmethod
+    def read(cls, pool) -> "TwocryptoState":
+        results = multicall(
+            [
+                (pool.balances, 0),
+                (pool.balances, 1),
+                pool.precisions,
+                pool.price_scale,
+                pool.A,
+                pool.gamma,
+                pool.D,
+                pool.mid_fee,
+                pool.out_fee,
+                pool.fee_gamma,
+                pool.future_A_gamma_time,
+            ],
+            allow_failure=False,
+        )
+        b0, b1, precisions, price_scale, A, gamma, D, *fee_params, future_time = results
+        mid_fee, out_fee, fee_gamma = fee_params
+        return cls(
+            np.array([b0, b1], dtype=float),
+            np.array(precisions, dtype=float),
+            price_scale,
+            A,
+            gamma,
+            D,
+            mid_fee,
+            out_fee,
+            fee_gamma,
+            future_time > boa.env.evm.patch.timestamp,
+        )
+
+    def _xp(self, balances) -> list:
+        return [
+            balances[0] * self.precisions[0],
+            balances[1] * self.precisions[1] * self.price_scale / PRECISION,
+        ]
+
+    def _fee(self, x0, x1, mid_fee, out_fee, fee_gamma):
+        S = x0 + x1
+        K = 4 * (x0 / S) * (x1 / S)
+        f = fee_gamma / (fee_gamma / PRECISION + 1 - K) / PRECISION
+        return mid_fee * f + out_fee * (1 - f)
+
+    def get_dy(
+        self,
+        i: int,
+        j: int,
+        dx,
+        A=None,
+        gamma=None,
+        mid_fee=None,
+        out_fee=None,
+        fee_gamma=None,
+    ) -> np.ndarray:
+        """
+        Like the pool's `get_dy`. `dx` and the optional parameters (as
+        passed to `ramp_A_gamma` and `apply_new_parameters`) broadcast
+        against each other. D is recomputed for other A and gamma, as the
+        pool does while ramping.
+        """
+        A_ = self.A if A is None else np.asarray(A, dtype=float)
+        gamma_ = self.gamma if gamma is None else np.asarray(gamma, dtype=float)
+        mid_fee = self.mid_fee if mid_fee is None else np.asarray(mid_fee, dtype=float)
+        out_fee = self.out_fee if out_fee is None else np.asarray(out_fee, dtype=float)
+        fee_gamma = self.fee_gamma if fee_gamma is None else np.asarray(fee_gamma, dtype=float)
+        dx = np.asarray(dx, dtype=float)
+
+        if A is None and gamma is None and not self.ramping:
+            D = float(self.D)
+        else:
+            D = twocrypto_D(A_, gamma_, *self._xp(self.balances))
+
+        balances = [self.balances[0], self.balances[1]]
+        balances[i] = balances[i] + dx
+        xp = self._xp(balances)
+        y = twocrypto_y(A_, gamma_, xp[i], D)
+        dy = xp[j] - y - 1
+        xp[j] = y
+        if j > 0:
+            dy = dy * PRECISION / self.price_scale
+        dy = dy / self.precisions[j]
+        return dy - self._fee(xp[0], xp[1], mid_fee, out_fee, fee_gamma) * dy / FEE_DENOMINATOR
+
+
+def check_get_dy(pool, state, i: int, j: int, amounts: Sequence[int], rtol: float = 1e-6) -> float:
+    """
+    Compares `state.get_dy` with the pool's `get_dy` at `amounts` and
+    returns the largest relative difference. Raises if it exceeds `rtol`.
+    """
+    expected = np.array(
+        multicall([(pool.get_dy, i, j, int(dx)) for dx in amounts], allow_failure=False), dtype=float
+    )
+    modelled = state.get_dy(i, j, np.asarray(amounts, dtype=float))
+    error = float(np.max(np.abs(modelled / expected - 1)))
+    assert error <= rtol, f"Model is off by {error:.2e} from get_dy of {pool.address}"
+    return error
@@ -0,0 +1,199 @@
+from __future__ import annotations
+from typing import Any, List, Optional, Sequence
+
+import boa
+from boa.contracts.abi.abi_contract import ABIFunction, ABIOverload, _format_abi_type, _parse_complex
+from boa.rpc import to_bytes, to_hex
+from boa.util.abi import abi_decode
+
+from voting import abi
+from voting.constants import MULTICALL3
+from voting.context import use_clean_prepare_calldata, has_dao
+
+# Number of calls packed into a single `aggregate3`
+BATCH_SIZE = 500
+
+
+def _resolve(call) -> tuple[str, ABIFunction, tuple]:
+    """
+    Accepts either a bound function (`pool.fee`), a tuple of a bound
+    function and its arguments (`(gauge_controller.gauge_types, gauge)`), or
+    such a tuple prefixed with the address to call the function on
+    (`(other_pool, pool.fee)`). The latter avoids binding a contract for
+    every target when reading from many contracts sharing an ABI.
+    """
+    if not isinstance(call, tuple):
+        call = (call,)
+    if isinstance(call[0], str):
+        target, func, *args = call
+    else:
+        func, *args = call
+        target = func.contract.address
+    if isinstance(func, ABIOverload):
+        func = func._pick_overload(*args)
+    return str(target), func, tuple(args)
+
+
+def _decode(func: ABIFunction, data: bytes) -> Any:
+    # mirrors ABIFunction.__call__ so results look like regular calls
+    val = abi_decode(_format_abi_type(func.return_type), data)
+    outputs = func._abi["outputs"]
+    match val:
+        case ():
+            return None
+        case (single,):
+            return _parse_complex(outputs[0], single, name=func.name)
+        case multiple:
+            return tuple(
+                _parse_complex(output, item, name=func.name)
+                for output, item in zip(outputs, multiple)
+            )
+
+
+def _fork_rpc():
+    return boa.env.evm.vm.state._account_db._rpc
+
+
+def _fork_block_id() -> str:
+    return boa.env.evm.vm.state._account_db._block_id
+
+
+def _aggregate_remote(batches: List[list], block_identifier) -> List[list]:
+    """
+    Sends every batch to the forked node as `eth_call`s in a single JSON-RPC
+    batch request. Results are cached by boa on disk, so pinned blocks are
+    only fetched once.
+    """
+    aggregate3 = abi.multicall3.functions[0]
+    block = _fork_block_id() if block_identifier is None else to_hex(block_identifier)
+    payloads = [
+        (
+            "eth_call",
+            [{"to": MULTICALL3, "data": to_hex(aggregate3.prepare_calldata(batch))}, block],
+        )
+        for batch in batches
+    ]
+    results = _fork_rpc().fetch_multi(payloads)
+    return [_decode(aggregate3, to_bytes(result)) for result in results]
+
+
+def _aggregate_local(batches: List[list]) -> List[list]:
+    if not boa.env.get_code(MULTICALL3):
+        # No Multicall3 on this chain (e.g. a plain local EVM), so emulate it
+        results = []
+        for batch in batches:
+            batch_results = []
+            for target, allow_failure, calldata in batch:
+                computation = boa.env.execute_code(
+                    to_address=target, data=calldata, is_modifying=False
+                )
+                if computation.is_error and not allow_failure:
+                    raise computation.error
+                batch_results.append((not computation.is_error, computation.output))
+            results.append(batch_results)
+        return results
+
+    multicall = abi.multicall3.at(MULTICALL3)
+    return [multicall.aggregate3(batch) for batch in batches]
+
+
+def multicall(
+    calls: Sequence,
+    allow_failure: bool = True,
+    block_identifier: Optional[int] = None,
+    remote: Optional[bool] = None,
+    batch_size: int = BATCH_SIZE,
+) -> List[Any]:
+    """
+    Batches read-only calls through Multicall3 and returns the decoded results
+    in order. Calls that revert return `None` when `allow_failure` is set.
+
+    ```py
+    fee, offpeg = multicall([pool.fee, pool.offpeg_fee_multiplier])
+    types = multicall([(gauge_controller.gauge_types, g) for g in gauges])
+    fees = multicall([(address, pool.fee) for address in pool_addresses])
+    ```
+
+    On a fork, reads are sent straight to the node at the fork block (or
+    `block_identifier`) instead of being executed locally, which avoids one
+    `eth_getStorageAt` per touched slot. Inside a `vote()` the local state
+    is read instead, so that changes made by the vote are visible. Pass
+    `remote` to override either behaviour.
+    """
+    if remote is None:
+        remote = boa.env.evm.is_forked and not has_dao()
+    if block_identifier is not None and not remote:
+        raise ValueError("block_identifier is only supported for remote reads")
+
+    resolved = [_resolve(call) for call in calls]
+    if not resolved:
+        return []
+    with use_clean_prepare_calldata():
+        encoded = [
+            (target, allow_failure, func.prepare_calldata(*args))
+            for target, func, args in resolved
+        ]
+    batches = [encoded[i : i + batch_size] for i in range(0, len(encoded), batch_size)]
+
+    if remote:
+        raw_batches = _aggregate_remote(batches, block_identifier)
+    else:
+        raw_batches = _aggregate_local(batches)
+
+    raw_results = [item for batch in raw_batches for item in batch]
+    return _decode_results(resolved, raw_results, allow_failure)
+
+
+def _decode_results(resolved: list, raw_results: list, allow_failure: bool) -> List[Any]:
+    results = []
+    for (_, func, _), (success, data) in zip(resolved, raw_results):
+        if not success:
+            results.append(None)
+            continue
+        try:
+            results.append(_decode(func, data))
+        except Exception:
+            # no code at the target or a mismatching ABI
+            if not allow_failure:
+                raise
+            results.append(None)
+    return results
+
+
+def multicall_blocks(
+    calls: Sequence,
+    blocks: Sequence[int],
+    allow_failure: bool = True,
+    rpc=None,
+    blocks_per_request: int = 100,
+) -> List[List[Any]]:
+    """
+    The same read-only calls at every block of `blocks` (e.g. to sample a
+    pool's history), one `aggregate3` per block and many blocks per JSON-RPC
+    batch request. Needs an archive node for old blocks.
+
+    ```py
+    prices = multicall_blocks([(pool.last_price, 0), pool.get_virtual_price], blocks)
+    ```
+    """
+    resolved = [_resolve(call) for call in calls]
+    if not resolved:
+        return [[] for _ in blocks]
+    with use_clean_prepare_calldata():
+        encoded = [
+            (target, allow_failure, func.prepare_calldata(*args))
+            for target, func, args in resolved
+        ]
+        aggregate3 = abi.multicall3.functions[0]
+        data = to_hex(aggregate3.prepare_calldata(encoded))
+
+    rpc = rpc or _fork_rpc()
+    results = []
+    for i in range(0, len(blocks), blocks_per_request):
+        payloads = [
+            ("eth_call", [{"to": MULTICALL3, "data": data}, to_hex(block)])
+            for block in blocks[i : i + blocks_per_request]
+        ]
+        for raw in rpc.fetch_multi(payloads):
+            results.append(_decode_results(resolved, _decode(aggregate3, to_bytes(raw)), allow_failure))
+    return results
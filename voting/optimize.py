@@ -0,0 +1,197 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import boa
+
+from voting import abi, checkpoints
+from voting.config import DAOParameters
+from voting.context import use_clean_prepare_calldata
+from voting.storage import record_writes
+
+logger = logging.getLogger(__name__)
+
+# Rough cost of one byte of EVM script: calldata of newVote, storing the
+# script in the vote (SSTORE per word) and loading it again in executeVote.
+_CALLDATA_GAS = 16
+_STORE_WORD_GAS = 20_000
+_LOAD_WORD_GAS = 2_100
+
+
+@dataclass
+class ActionEffect:
+    index: int
+    gas_used: int
+    script_bytes: int
+    # (address, slot) -> (before, after) for every slot changed by the action
+    writes: Dict[Tuple[str, int], Tuple[int, int]]
+    # ether moved or contracts created, neither shows up in storage
+    other_effects: bool
+
+    @property
+    def has_effect(self) -> bool:
+        return bool(self.writes) or self.other_effects
+
+
+@dataclass
+class PruneReport:
+    effects: List[ActionEffect]
+    no_op: List[int] = field(default_factory=list)
+    overwritten: List[int] = field(default_factory=list)
+
+    @property
+    def redundant(self) -> List[int]:
+        return sorted(self.no_op + self.overwritten)
+
+    @property
+    def gas_saved(self) -> int:
+        ret = 0
+        for i in self.redundant:
+            effect = self.effects[i]
+            words = (effect.script_bytes + 31) // 32
+            ret += effect.gas_used + effect.script_bytes * _CALLDATA_GAS
+            ret += words * (_STORE_WORD_GAS + _LOAD_WORD_GAS)
+        return ret
+
+    @property
+    def script_bytes_saved(self) -> int:
+        return sum(self.effects[i].script_bytes for i in self.redundant)
+
+
+def _other_effects(computation) -> bool:
+    if computation.is_error:
+        return False
+    if computation.msg.is_create or computation.msg.value > 0:
+        return True
+    return any(_other_effects(child) for child in computation.children)
+
+
+def _replay(dao: DAOParameters, actions: Sequence) -> Tuple[List[ActionEffect], dict]:
+    """
+    Executes the actions one by one the way executeVote does (the voting app
+    calling `execute` on the agent) and records the storage each one changes.
+    Returns the effect of every action and the value every written slot had
+    before the first action. Must be called inside an anchor.
+
+    The longest prefix of actions replayed before from the same state is
+    restored from its checkpoints instead of executed (`voting.checkpoints`).
+    """
+    aragon_agent = abi.aragon_agent.at(dao.agent)
+    state = boa.env.evm.vm.state
+    keys = checkpoints.prefix_keys(dao, actions)
+    effects, restored = checkpoints.restore(checkpoints.cached_prefix(keys))
+    with record_writes() as total:
+        for i, (address, calldata) in enumerate(actions[len(effects) :], len(effects)):
+            agent_calldata = aragon_agent.execute.prepare_calldata(address, 0, calldata)
+            with record_writes() as recorder:
+                computation = boa.env.execute_code(
+                    to_address=dao.agent, sender=dao.voting, data=agent_calldata
+                )
+            if computation.is_error:
+                raise computation.error
+            effects.append(
+                ActionEffect(
+                    index=i,
+                    gas_used=computation.get_gas_used(),
+                    script_bytes=20 + 4 + len(agent_calldata),
+                    writes=recorder.diff(state),
+                    other_effects=_other_effects(computation),
+                )
+            )
+    checkpoints.store(keys, effects)
+    return effects, {**total.original, **restored}
+
+
+def _final_state(keys) -> dict:
+    state = boa.env.evm.vm.state
+    return {key: state.get_storage(*key) for key in keys}
+
+
+def _same_final_state(dao: DAOParameters, actions: Sequence, final: dict) -> bool:
+    with boa.env.anchor():
+        try:
+            _, touched = _replay(dao, actions)
+        except Exception:
+            return False
+        pruned_final = _final_state(final.keys() | touched.keys())
+    return all(
+        pruned_final[key] == final.get(key, touched.get(key)) for key in pruned_final
+    )
+
+
+def find_redundant_actions(dao: DAOParameters, actions: Sequence) -> Optional[PruneReport]:
+    """
+    Finds actions that change no storage, and actions whose every change is
+    overwritten by later actions, from the storage diff each action makes
+    when replayed on the current state. Removing the reported actions is
+    verified to leave the final storage unchanged.
+
+    Returns `None` if the actions cannot be replayed one by one.
+    """
+    with use_clean_prepare_calldata():
+        with boa.env.anchor():
+            try:
+                effects, touched = _replay(dao, actions)
+            except Exception as e:
+                logger.warning(f"Could not replay actions to look for redundant ones: {e}")
+                return None
+            final = _final_state(touched)
+
+        report = PruneReport(effects)
+        report.no_op = [effect.index for effect in effects if not effect.has_effect]
+
+        candidates = []
+        for effect in effects:
+            if not effect.writes or effect.other_effects:
+                continue
+            later = set()
+            for other in effects[effect.index + 1 :]:
+                later.update(other.writes)
+            if set(effect.writes) <= later:
+                candidates.append(effect.index)
+
+        def _without(removed):
+            return [a for i, a in enumerate(actions) if i not in removed]
+
+        removed = set(report.no_op)
+        if candidates and _same_final_state(dao, _without(removed | set(candidates)), final):
+            report.overwritten = candidates
+        else:
+            # a later action may depend on the value written by an earlier one
+            for i in candidates:
+                if _same_final_state(dao, _without(removed | {i}), final):
+                    removed.add(i)
+                    report.overwritten.append(i)
+
+    return report
+
+
+def prune_actions(dao: DAOParameters, actions: list, mode: Optional[str] = "warn") -> list:
+    """
+    Optimization pass run by `vote()` between capturing the actions and
+    assembling the EVM script. With `mode="warn"` redundant actions are only
+    reported, with `mode="remove"` they are dropped from the vote.
+    """
+    if not mode or not actions:
+        return actions
+    assert mode in ("warn", "remove"), f"Unknown prune mode {mode}"
+
+    report = find_redundant_actions(dao, actions)
+    if report is None or not report.redundant:
+        return actions
+
+    for i in report.no_op:
+        logger.warning(f"Action {i} ({actions[i][0]}) does not change any storage")
+    for i in report.overwritten:
+        logger.warning(f"Action {i} ({actions[i][0]}) is overwritten by later actions")
+    logger.warning(
+        f"{'Removing' if mode == 'remove' else 'Removing would save'} "
+        f"{len(report.redundant)} redundant action(s): "
+        f"{report.script_bytes_saved} script bytes, ~{report.gas_saved} gas"
+    )
+
+    if mode == "warn":
+        return actions
+    redundant = set(report.redundant)
+    return [action for i, action in enumerate(actions) if i not in redundant]
@@ -0,0 +1,145 @@
+"""
+Replays the EMA oracles of a stableswap-ng pool (`price_oracle` and
+`D_oracle`) over its history for many candidate `ma_exp_time` and
+`D_ma_time` values at once, to choose the values of a `set_ma_exp_time`
+vote.
+
+The pool updates both oracles on the first operation of a block from the
+spot values at the end of the previous active block:
+
+    alpha = exp(-(t - t_prev) / ma_time)
+    ema = last_prev * (1 - alpha) + ema_prev * alpha
+
+so the path only depends on the spot values and timestamps of the blocks
+the pool was used in. Those are read once, the recursion then runs for all
+candidates together.
+
+```py
+history = fetch_oracle_history(pool, from_block, to_block)
+prices, D = replay_oracles(history, ma_exp_times=[600, 866, 1200], D_ma_times=[62324, 86400])
+ma_exp_time, D_ma_time = prices.best(), D.best()
+```
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from boa.rpc import to_int
+
+from voting.events import _event_key
+from voting.history import block_timestamps, fetch_logs
+from voting.multicall import multicall_blocks
+
+# every operation that updates the oracles
+OPERATIONS = (
+    "TokenExchange",
+    "TokenExchangeUnderlying",
+    "AddLiquidity",
+    "RemoveLiquidity",
+    "RemoveLiquidityOne",
+    "RemoveLiquidityImbalance",
+)
+
+
+@dataclass(frozen=True)
+class OracleHistory:
+    """
+    End-of-block oracle state of a pool at every block it was used in.
+    Prices are indexed by (block, coin - 1), like `last_price(i)`.
+    """
+
+    blocks: np.ndarray
+    timestamps: np.ndarray
+    last_prices: np.ndarray
+    ema_prices: np.ndarray
+    D: np.ndarray
+    D_ema: np.ndarray
+
+
+def fetch_oracle_history(
+    pool, from_block: int, to_block: int, rpc_url: Optional[str] = None
+) -> OracleHistory:
+    """
+    Finds the blocks the pool was used in from its logs, then reads the
+    spot and EMA values at the end of each of them in batched `eth_call`s
+    (needs an archive node).
+    """
+    topics = [
+        "0x" + _event_key(event)[0].to_bytes(32, "big").hex()
+        for event in pool.abi
+        if event.get("type") == "event" and event["name"] in OPERATIONS
+    ]
+    logs = fetch_logs(pool.address, topics, from_block, to_block, rpc_url)
+    blocks = sorted({to_int(log["blockNumber"]) for log in logs})
+    timestamps = block_timestamps(blocks, rpc_url)
+
+    n = pool.N_COINS()
+    calls = (
+        [(pool.last_price, k) for k in range(n - 1)]
+        + [(pool.ema_price, k) for k in range(n - 1)]
+        + [pool.get_virtual_price, pool.totalSupply, pool.D_oracle]
+    )
+    results = np.array(multicall_blocks(calls, blocks, allow_failure=False), dtype=float)
+    return OracleHistory(
+        blocks=np.array(blocks),
+        timestamps=np.array([timestamps[block] for block in blocks], dtype=float),
+        last_prices=results[:, : n - 1],
+        ema_prices=results[:, n - 1 : 2 * (n - 1)],
+        # the pool keeps the last D but has no getter for it
+        D=results[:, -3] * results[:, -2] / 10**18,
+        D_ema=results[:, -1],
+    )
+
+
+@dataclass(frozen=True)
+class EmaReplay:
+    """
+    EMA paths indexed by (block, candidate, value). `lag` is the mean
+    relative distance of the EMA to the spot value, `noise` the mean
+    relative move of the EMA per update. Both are per candidate and lower
+    is better, longer ma times trade lag for less noise.
+    """
+
+    ma_times: np.ndarray
+    ema: np.ndarray
+    lag: np.ndarray
+    noise: np.ndarray
+
+    def best(self, noise_weight: float = 1.0) -> int:
+        """The ma time with the lowest lag + noise, each relative to its median over candidates."""
+        score = self.lag / np.median(self.lag) + noise_weight * self.noise / np.median(self.noise)
+        return int(self.ma_times[np.argmin(score)])
+
+
+def replay_ema(
+    timestamps: np.ndarray, values: np.ndarray, initial: np.ndarray, ma_times: Sequence[int]
+) -> EmaReplay:
+    """
+    Runs the pool's EMA over `values` (block, value) for every candidate
+    ma time, starting from `initial` (the on-chain EMA after the first
+    block).
+    """
+    ma_times = np.asarray(ma_times, dtype=float)
+    values = np.asarray(values, dtype=float).reshape(len(timestamps), -1)
+    # (block, candidate), the first block has no previous one
+    alpha = np.exp(-np.diff(timestamps)[:, None] / ma_times[None, :])
+
+    ema = np.empty((len(timestamps), len(ma_times), values.shape[1]))
+    ema[0] = np.asarray(initial, dtype=float).reshape(1, -1)
+    for t in range(1, len(timestamps)):
+        a = alpha[t - 1][:, None]
+        ema[t] = values[t - 1][None, :] * (1 - a) + ema[t - 1] * a
+
+    lag = np.mean(np.abs(ema / values[:, None, :] - 1), axis=(0, 2))
+    noise = np.mean(np.abs(np.diff(ema, axis=0) / ema[:-1]), axis=(0, 2))
+    return EmaReplay(ma_times.astype(int), ema, lag, noise)
+
+
+def replay_oracles(
+    history: OracleHistory, ma_exp_times: Sequence[int], D_ma_times: Sequence[int]
+) -> Tuple[EmaReplay, EmaReplay]:
+    """Price and D oracle replays, for `set_ma_exp_time(ma_exp_time, D_ma_time)` candidates."""
+    prices = replay_ema(history.timestamps, history.last_prices, history.ema_prices[0], ma_exp_times)
+    D = replay_ema(history.timestamps, history.D, history.D_ema[0], D_ma_times)
+    return prices, D
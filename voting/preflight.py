@@ -0,0 +1,123 @@
+"""
+Checks that a live vote can be submitted while it is still being
+simulated. Started when `vote()` is entered with a `live_env`, it reads in
+one JSON-RPC batch from the live network whether the account can create a
+vote, its veCRV and ether balance, its nonces and the gas price. When
+submission is bound to fail, the simulation stops at its next step with a
+`PreflightError` instead of after the IPFS pin.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+import logging
+import threading
+from typing import List, Optional
+
+from boa.rpc import EthereumRPC, to_int
+
+from voting import abi
+from voting.config import DAOParameters
+from voting.context import use_clean_prepare_calldata
+
+logger = logging.getLogger(__name__)
+
+MAINNET_CHAIN_ID = 1
+# Generous gas of newVote, the account must hold ether for it at the current gas price
+NEW_VOTE_GAS = 1_000_000
+
+
+class PreflightError(Exception):
+    pass
+
+
+@dataclass
+class PreflightResult:
+    address: str
+    chain_id: int
+    can_create_vote: bool
+    ve_balance: int
+    min_balance: int
+    balance: int
+    nonce: int
+    pending_nonce: int
+    gas_price: int
+    # submission fails for any of these
+    problems: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+
+def _calldata(factory, name: str, *args) -> str:
+    (function,) = [f for f in factory.functions if f.name == name and len(f.argument_types) == len(args)]
+    with use_clean_prepare_calldata():
+        return "0x" + function.prepare_calldata(*args).hex()
+
+
+class Preflight:
+    def __init__(self, dao: DAOParameters, rpc_url: str, address: str):
+        self.dao = dao
+        self.rpc_url = rpc_url
+        self.address = address
+        self.result: Optional[PreflightResult] = None
+        self.error: Optional[Exception] = None
+        # prepared now, `vote()` patches prepare_calldata once it is entered
+        self._payloads = [
+            ("eth_chainId", []),
+            ("eth_call", [{"to": dao.voting, "data": _calldata(abi.voting, "canCreateNewVote", address)}, "latest"]),
+            ("eth_call", [{"to": dao.voting, "data": _calldata(abi.voting, "minBalance")}, "latest"]),
+            ("eth_call", [{"to": dao.token, "data": _calldata(abi.voting_escrow, "balanceOf", address)}, "latest"]),
+            ("eth_getBalance", [address, "latest"]),
+            ("eth_getTransactionCount", [address, "latest"]),
+            ("eth_getTransactionCount", [address, "pending"]),
+            ("eth_gasPrice", []),
+        ]
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> "Preflight":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        try:
+            self.result = self._check()
+        except Exception as e:
+            self.error = e
+        if self.error is None and self.result.problems:
+            logger.error("Live vote preflight failed: " + "; ".join(self.result.problems))
+
+    def _check(self) -> PreflightResult:
+        raw = EthereumRPC(self.rpc_url).fetch_multi(self._payloads)
+        chain_id, can_create, min_balance, ve_balance, balance, nonce, pending, gas_price = map(to_int, raw)
+        result = PreflightResult(
+            self.address, chain_id, bool(can_create), ve_balance, min_balance, balance, nonce, pending, gas_price
+        )
+        if chain_id != MAINNET_CHAIN_ID:
+            result.problems.append(f"live network has chain id {chain_id}, not {MAINNET_CHAIN_ID}")
+        if ve_balance < min_balance:
+            result.problems.append(f"{self.address} has {ve_balance / 1e18:.2f} veCRV, {min_balance / 1e18:.2f} needed")
+        elif not result.can_create_vote:
+            result.problems.append(f"{self.address} created a vote less than the voting's minTime ago")
+        if balance < NEW_VOTE_GAS * gas_price:
+            result.problems.append(
+                f"{self.address} has {balance / 1e18:.4f} ETH, newVote may cost {NEW_VOTE_GAS * gas_price / 1e18:.4f}"
+            )
+        if pending > nonce:
+            result.warnings.append(f"{pending - nonce} pending transaction(s) from {self.address}, the vote queues behind them")
+        return result
+
+    def check(self) -> None:
+        """Raises if the preflight has finished and failed, never waits."""
+        if self._thread.is_alive():
+            return
+        self._raise()
+
+    def wait(self) -> PreflightResult:
+        self._thread.join()
+        self._raise()
+        for warning in self.result.warnings:
+            logger.warning(warning)
+        return self.result
+
+    def _raise(self) -> None:
+        if self.error is not None:
+            raise PreflightError(f"Live vote preflight could not run: {self.error}") from self.error
+        if self.result is not None and self.result.problems:
+            raise PreflightError("Live vote submission would fail: " + "; ".join(self.result.problems))
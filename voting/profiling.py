@@ -0,0 +1,224 @@
+"""
+Profiling mode for vote scripts. CPU time and memory are attributed to the
+phases of building a vote: capturing the calls, pruning, splitting, the
+preview, assembling the EVM script, simulating it in the Aragon voting and
+every broadcaster call of an `xvote()` block.
+
+The call stack is sampled from a background thread and written in the
+folded format of flamegraph.pl / speedscope / inferno, with the phases as
+root frames. tracemalloc snapshots around every phase give the lines that
+allocated the most in it.
+
+```py
+with vote(OWNERSHIP, "Set things.", profile="profiles"):
+    things.set()
+```
+
+or without changing the script:
+
+```sh
+python -m voting.profiling scripts/stableswap-ng/set_new_fee.py --out profiles
+flamegraph.pl profiles/vote-1.folded > vote-1.svg
+```
+"""
+from __future__ import annotations
+import argparse
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+import os
+from pathlib import Path
+import runpy
+import sys
+import threading
+import time
+import tracemalloc
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Set by `python -m voting.profiling`, turns on profiling in every `vote()`
+PROFILE_ENV = "CURVE_VOTING_PROFILE"
+SAMPLE_INTERVAL = 0.001
+TOP_ALLOCATORS = 15
+
+
+@dataclass
+class PhaseStats:
+    name: str
+    wall_s: float = 0.0
+    # net bytes still allocated when the phase ended, and the peak within it
+    allocated: int = 0
+    peak: int = 0
+    top: List[tracemalloc.StatisticDiff] = field(default_factory=list)
+
+
+class Profiler:
+    def __init__(self, path: Path, interval: float = SAMPLE_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.phases: List[PhaseStats] = []
+        self._active: List[PhaseStats] = []
+        # peak of the enclosing phases before a nested one reset it
+        self._peaks: List[int] = []
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._started_tracing = False
+        # time spent taking snapshots, left out of the phases and samples
+        self._overhead = 0.0
+        self._snapshotting = False
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            active = [phase.name for phase in self._active]
+            if frame is None or not active or self._snapshotting:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(active + stack[::-1])] += 1
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._sampler.start()
+
+    @contextmanager
+    def paused(self):
+        """Stops the sampler thread inside, e.g. around `fork()`."""
+        self._stop.set()
+        self._sampler.join()
+        try:
+            yield
+        finally:
+            self._stop = threading.Event()
+            self._sampler = threading.Thread(target=self._sample, daemon=True)
+            self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._sampler.join()
+        if self._started_tracing:
+            tracemalloc.stop()
+        self.write()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        start = time.perf_counter()
+        self._snapshotting = True
+        try:
+            return tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+            )
+        finally:
+            self._snapshotting = False
+            self._overhead += time.perf_counter() - start
+
+    @contextmanager
+    def phase(self, name: str):
+        stats = PhaseStats(name)
+        if self._active:
+            self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+        self._active.append(stats)
+        self._peaks.append(0)
+        before = self._snapshot()
+        tracemalloc.reset_peak()
+        start, overhead = time.perf_counter(), self._overhead
+        try:
+            yield
+        finally:
+            stats.wall_s = time.perf_counter() - start - (self._overhead - overhead)
+            stats.peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+            after = self._snapshot()
+            self._active.pop()
+            if self._active:
+                self._peaks[-1] = max(self._peaks[-1], stats.peak)
+
+            start = time.perf_counter()
+            diff = after.compare_to(before, "lineno")
+            stats.allocated = sum(stat.size_diff for stat in diff)
+            stats.top = [stat for stat in diff if stat.size_diff > 0][:TOP_ALLOCATORS]
+            self._overhead += time.perf_counter() - start
+            self.phases.append(stats)
+
+    def write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        folded = self.path.with_suffix(".folded")
+        folded.write_text("".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common()))
+
+        lines = [f"{'phase':<24} {'wall s':>9} {'net KiB':>10} {'peak KiB':>10}"]
+        lines += [
+            f"{p.name:<24} {p.wall_s:>9.3f} {p.allocated / 1024:>10.1f} {p.peak / 1024:>10.1f}"
+            for p in self.phases
+        ]
+        for p in self.phases:
+            lines.append(f"\n{p.name}: top allocators")
+            for stat in p.top:
+                frame = stat.traceback[0]
+                lines.append(f"  {stat.size_diff / 1024:>10.1f} KiB {stat.count_diff:>8} blocks  {frame.filename}:{frame.lineno}")
+        allocations = self.path.with_suffix(".allocations.txt")
+        allocations.write_text("\n".join(lines) + "\n")
+        logger.info(f"Profile written to {folded} and {allocations}")
+
+
+_profiler: Optional[Profiler] = None
+_runs = 0
+
+
+@contextmanager
+def profile(out_dir):
+    """Profiles the phases run inside, does nothing if already profiling."""
+    global _profiler, _runs
+    if _profiler is not None:
+        yield _profiler
+        return
+    _runs += 1
+    _profiler = Profiler(Path(out_dir) / f"vote-{_runs}")
+    _profiler.start()
+    try:
+        yield _profiler
+    finally:
+        _profiler.stop()
+        _profiler = None
+
+
+def profile_dir(out_dir=None) -> Optional[str]:
+    return out_dir or os.getenv(PROFILE_ENV)
+
+
+def phase(name: str):
+    """A phase of the current profile, a no-op when not profiling."""
+    return _profiler.phase(name) if _profiler is not None else nullcontext()
+
+
+def paused():
+    """No sampler thread runs inside, a no-op when not profiling."""
+    return _profiler.paused() if _profiler is not None else nullcontext()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Runs a vote script with profiling on in every `vote()`."
+    )
+    parser.add_argument("script")
+    parser.add_argument("--out", help="output directory (default: profiles/<script>-<timestamp>)")
+    args, script_args = parser.parse_known_args()
+
+    script = Path(args.script)
+    out = args.out or Path("profiles") / f"{script.stem}-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    os.environ[PROFILE_ENV] = str(out)
+    sys.argv = [str(script), *script_args]
+    sys.path.insert(0, str(script.parent))
+    runpy.run_path(str(script), run_name="__main__")
+    print(f"Profiles written to {out}")
+
+
+if __name__ == "__main__":
+    main()
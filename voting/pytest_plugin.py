@@ -0,0 +1,119 @@
+"""
+pytest plugin that forks mainnet once per session instead of once per test.
+
+The fork block is resolved once by the controlling process and handed to
+every pytest-xdist worker. State at a pinned block never changes, so boa's
+on-disk RPC cache (`~/.cache/titanoboa/fork`) acts as a read-only snapshot
+shared by all workers: whatever one worker fetched, the others read from
+disk. L2 forks opened by `xvote()` are pinned the same way, once per chain,
+and reverted after every use.
+
+```py
+def test_something(voting_anchor):
+    with vote(OWNERSHIP, "Set things."):
+        things.set()
+```
+"""
+from __future__ import annotations
+import hashlib
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import Union
+
+import boa
+import pytest
+from boa.rpc import EthereumRPC
+
+from voting.context import reuse_forks
+
+_BLOCK_DIR_KEY = "voting_fork_block_dir"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("curve-voting-lib")
+    group.addoption(
+        "--fork-url",
+        default=os.getenv("RPC_URL"),
+        help="Mainnet RPC used by the `voting_fork` fixture (default: $RPC_URL)",
+    )
+    group.addoption(
+        "--fork-block",
+        default="safe",
+        help="Block to fork at, resolved once for the whole session (default: safe)",
+    )
+
+
+def _is_worker(config) -> bool:
+    return hasattr(config, "workerinput")
+
+
+def pytest_configure(config):
+    if _is_worker(config):
+        config._voting_block_dir = Path(config.workerinput[_BLOCK_DIR_KEY])
+    else:
+        config._voting_block_dir = Path(tempfile.mkdtemp(prefix="voting-fork-"))
+
+
+def pytest_unconfigure(config):
+    if not _is_worker(config):
+        shutil.rmtree(config._voting_block_dir, ignore_errors=True)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    # pytest-xdist: every worker pins the same blocks as the controller
+    node.workerinput[_BLOCK_DIR_KEY] = str(node.config._voting_block_dir)
+
+
+def _resolve_block(url: str, block_identifier: Union[int, str]) -> int:
+    if isinstance(block_identifier, int) or str(block_identifier).isdigit():
+        return int(block_identifier)
+    block = EthereumRPC(url).fetch("eth_getBlockByNumber", [block_identifier, False])
+    return int(block["number"], 16)
+
+
+def pinned_block(config, url: str, block_identifier: Union[int, str] = "safe") -> int:
+    """
+    The block `url` is forked at during this session. The first process to
+    ask resolves it, the others read it from the session directory.
+    """
+    path = config._voting_block_dir / hashlib.sha256(url.encode()).hexdigest()
+    if not path.exists():
+        block = _resolve_block(url, block_identifier)
+        tmp = path.with_suffix(f".{os.getpid()}")
+        tmp.write_text(str(block))
+        try:
+            # atomic and fails if another worker got there first
+            os.link(tmp, path)
+        except FileExistsError:
+            pass
+        finally:
+            tmp.unlink()
+    return int(path.read_text())
+
+
+@pytest.fixture(scope="session")
+def voting_fork_url(pytestconfig) -> str:
+    url = pytestconfig.getoption("fork_url")
+    if not url:
+        pytest.skip("No RPC to fork from, set --fork-url or RPC_URL")
+    return url
+
+
+@pytest.fixture(scope="session")
+def voting_fork(pytestconfig, voting_fork_url):
+    """Mainnet forked once per session (per worker) at the pinned block."""
+    block = pinned_block(pytestconfig, voting_fork_url, pytestconfig.getoption("fork_block"))
+    env = boa.Env()
+    env.fork(url=voting_fork_url, block_identifier=block, deprecated=False)
+    with reuse_forks(lambda url: pinned_block(pytestconfig, url)):
+        yield env
+
+
+@pytest.fixture
+def voting_anchor(voting_fork):
+    """The session fork, with every change of the test reverted afterwards."""
+    with boa.swap_env(voting_fork), voting_fork.anchor():
+        yield voting_fork
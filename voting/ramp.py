@@ -0,0 +1,95 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Sequence
+
+import boa
+import numpy as np
+from boa.contracts.base_evm_contract import BoaError
+
+from voting.config import DAOParameters, OWNERSHIP
+from voting.context import use_clean_prepare_calldata
+from voting.multicall import multicall
+
+
+@dataclass(frozen=True)
+class RampTrajectory:
+    """
+    Pool state sampled along each candidate ramp. Arrays are indexed by
+    (candidate, sample) and `dy` additionally by swap amount. Candidates
+    whose `ramp_A_gamma` reverted are left as NaN and flagged in `valid`.
+    """
+
+    candidates: np.ndarray
+    valid: np.ndarray
+    times: np.ndarray
+    A: np.ndarray
+    gamma: np.ndarray
+    price_scale: np.ndarray
+    dy: np.ndarray
+
+
+def ramp_grid(
+    future_A: Sequence[int], future_gamma: Sequence[int], ramp_time: Sequence[int]
+) -> np.ndarray:
+    """Every (future_A, future_gamma, ramp_time) combination, shape (n, 3)."""
+    grid = np.meshgrid(future_A, future_gamma, ramp_time, indexing="ij")
+    return np.stack([axis.ravel() for axis in grid], axis=1).astype(object)
+
+
+def simulate_ramps(
+    pool,
+    candidates,
+    n_points: int = 10,
+    swap_amounts: Sequence[int] = (),
+    i: int = 0,
+    j: int = 1,
+    dao: DAOParameters = OWNERSHIP,
+) -> RampTrajectory:
+    """
+    Starts each candidate ramp from the current state and samples `A()`,
+    `gamma()`, `price_scale()` and `get_dy(i, j, amount)` at `n_points`
+    evenly spaced times from the start to the end of the ramp.
+
+    Every candidate runs inside its own anchor on the current fork, so no
+    state is fetched twice and nothing leaks between candidates.
+    """
+    candidates = np.asarray(candidates, dtype=object).reshape(-1, 3)
+    n_candidates = len(candidates)
+    n_amounts = len(swap_amounts)
+
+    valid = np.zeros(n_candidates, dtype=bool)
+    times = np.full((n_candidates, n_points), np.nan)
+    A = np.full((n_candidates, n_points), np.nan)
+    gamma = np.full((n_candidates, n_points), np.nan)
+    price_scale = np.full((n_candidates, n_points), np.nan)
+    dy = np.full((n_candidates, n_points, n_amounts), np.nan)
+
+    reads = [pool.A, pool.gamma, pool.price_scale] + [
+        (pool.get_dy, i, j, amount) for amount in swap_amounts
+    ]
+
+    with use_clean_prepare_calldata():
+        for c, (future_A, future_gamma, ramp_time) in enumerate(candidates):
+            with boa.env.anchor():
+                start = boa.env.evm.patch.timestamp
+                try:
+                    pool.ramp_A_gamma(
+                        int(future_A), int(future_gamma), start + int(ramp_time), sender=dao.agent
+                    )
+                except BoaError:
+                    continue
+                valid[c] = True
+
+                elapsed = 0
+                for k, t in enumerate(np.linspace(0, int(ramp_time), n_points).astype(int)):
+                    boa.env.time_travel(seconds=int(t) - elapsed)
+                    elapsed = int(t)
+
+                    results = multicall(reads, remote=False)
+                    times[c, k] = t
+                    A[c, k], gamma[c, k], price_scale[c, k] = (
+                        np.nan if r is None else r for r in results[:3]
+                    )
+                    dy[c, k] = [np.nan if r is None else r for r in results[3:]]
+
+    return RampTrajectory(candidates, valid, times, A, gamma, price_scale, dy)
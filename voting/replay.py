@@ -0,0 +1,198 @@
+"""
+Replays a twocrypto-ng pool's swap history under other parameters.
+
+The pool's `TokenExchange` logs are fetched in batched `eth_getLogs`
+requests (`voting.history`). Every parameter set is then replayed on a fork of the block
+before the first swap, each set in its own anchor, spread over worker
+processes. Each worker forks once and shares boa's on-disk RPC cache with
+the others, so the pool state is only fetched once.
+
+```py
+swaps = fetch_exchanges(pool.address, from_block, to_block)
+current, proposed = replay(pool.address, swaps, [{}, {"mid_fee": 26000000}])
+print(proposed.fees[0] - current.fees[0], proposed.rebalances - current.rebalances)
+```
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import multiprocessing
+import os
+from typing import Dict, List, Optional, Sequence
+
+import boa
+import numpy as np
+from boa.contracts.base_evm_contract import BoaError
+from boa.rpc import to_int
+from boa.util.abi import abi_decode
+
+from voting import abi
+from voting.config import DAOParameters, OWNERSHIP
+from voting.context import use_clean_prepare_calldata
+from voting.events import EventIndex
+from voting.history import block_timestamps, fetch_logs, rpc
+
+# keccak256("TokenExchange(address,uint256,uint256,uint256,uint256,uint256,uint256)")
+TOKEN_EXCHANGE_TOPIC = "0x143f1f8e861fbdeddd5b46e844b7d3ac7b86a122f36e8c463859ee6811b1f29c"
+
+# sold_id, tokens_sold, bought_id, tokens_bought, fee, packed_price_scale
+EXCHANGE_DATA = "(uint256,uint256,uint256,uint256,uint256,uint256)"
+
+# Arguments of `apply_new_parameters`, in order
+PARAMETERS = ("mid_fee", "out_fee", "fee_gamma", "allowed_extra_profit", "adjustment_step", "ma_time")
+
+TRADER = "0x00000000000000000000000000000000000ca11e"
+
+
+@dataclass(frozen=True)
+class Swap:
+    block: int
+    timestamp: int
+    log_index: int
+    i: int
+    j: int
+    dx: int
+    dy: int
+
+
+@dataclass(frozen=True)
+class ReplayResult:
+    """
+    Outcome of replaying the swaps under one parameter set. `fees` are in
+    units of each coin, `price_scale` is sampled after every swap and
+    `tracking_error` is its mean relative distance to the historical
+    execution prices. Swaps that reverted are counted in `failed`.
+    """
+
+    parameters: Dict[str, int]
+    fees: List[int]
+    xcp_profit: int
+    rebalances: int
+    tracking_error: float
+    failed: int
+    price_scale: np.ndarray
+
+
+def fetch_exchanges(
+    pool_address: str,
+    from_block: int,
+    to_block: int,
+    rpc_url: Optional[str] = None,
+) -> List[Swap]:
+    """`TokenExchange` history of a pool between two blocks (inclusive)."""
+    logs = fetch_logs(pool_address, [TOKEN_EXCHANGE_TOPIC], from_block, to_block, rpc_url)
+    timestamps = block_timestamps([to_int(log["blockNumber"]) for log in logs], rpc_url)
+
+    swaps = []
+    for log in logs:
+        i, dx, j, dy, _, _ = abi_decode(EXCHANGE_DATA, bytes.fromhex(log["data"][2:]))
+        block = to_int(log["blockNumber"])
+        swaps.append(Swap(block, timestamps[block], to_int(log["logIndex"]), i, j, dx, dy))
+    return swaps
+
+
+def _apply_parameters(pool, parameters: Dict[str, int], dao: DAOParameters) -> None:
+    unknown = set(parameters) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    if not parameters:
+        return
+    current = {name: getattr(pool, name)() for name in PARAMETERS}
+    # apply_new_parameters takes ma_time / ln(2), rounding may move it by one second
+    current["ma_time"] = -(-current["ma_time"] * 1000 // 694)
+    new = {**current, **parameters}
+    pool.apply_new_parameters(*(new[name] for name in PARAMETERS), sender=dao.agent)
+
+
+def replay_swaps(
+    pool, swaps: Sequence[Swap], parameters: Dict[str, int], dao: DAOParameters = OWNERSHIP
+) -> ReplayResult:
+    """
+    Replays `swaps` on the current state with `parameters` applied. Runs
+    inside an anchor, so the state is left as it was.
+    """
+    coins = [abi.erc20.at(pool.coins(i)) for i in range(2)]
+    fees = [0, 0]
+    price_scale = np.full(len(swaps), np.nan)
+    failed = 0
+
+    with use_clean_prepare_calldata(), boa.env.anchor():
+        _apply_parameters(pool, parameters, dao)
+        for coin in coins:
+            boa.deal(coin, TRADER, 2**200, adjust_supply=False)
+            coin.approve(pool.address, 2**256 - 1, sender=TRADER)
+        xcp_profit = pool.xcp_profit()
+
+        for k, swap in enumerate(swaps):
+            boa.env.evm.patch.timestamp = max(swap.timestamp, boa.env.evm.patch.timestamp)
+            boa.env.evm.patch.block_number = max(swap.block, boa.env.evm.patch.block_number)
+            try:
+                pool.exchange(swap.i, swap.j, swap.dx, 0, sender=TRADER)
+            except BoaError:
+                failed += 1
+                continue
+            events = EventIndex.from_computations([pool._computation])
+            fees[swap.j] += events.one("TokenExchange")["fee"]
+            price_scale[k] = pool.price_scale()
+
+        xcp_profit = pool.xcp_profit() - xcp_profit
+
+    # historical execution price of coin 1 in coin 0, like price_scale
+    executed = np.array(
+        [swap.dx / swap.dy if swap.i == 0 else swap.dy / swap.dx for swap in swaps], dtype=float
+    ) * 10**18
+    valid = ~np.isnan(price_scale)
+    rebalances, tracking_error = 0, float("nan")
+    if valid.any():
+        rebalances = int(np.count_nonzero(np.diff(price_scale[valid])))
+        tracking_error = float(np.mean(np.abs(price_scale[valid] / executed[valid] - 1)))
+    return ReplayResult(
+        dict(parameters), fees, xcp_profit, rebalances, tracking_error, failed, price_scale
+    )
+
+
+_worker_pool = None
+
+
+def _init_worker(rpc_url: str, block: int, pool_address: str) -> None:
+    global _worker_pool
+    boa.fork(rpc_url, block_identifier=block)
+    _worker_pool = abi.twocrypto_ng_mainnet_pool.at(pool_address)
+
+
+def _replay_worker(
+    swaps: Sequence[Swap], parameters: Dict[str, int], dao: DAOParameters
+) -> ReplayResult:
+    return replay_swaps(_worker_pool, swaps, parameters, dao)
+
+
+def replay(
+    pool_address: str,
+    swaps: Sequence[Swap],
+    parameter_sets: Sequence[Dict[str, int]],
+    rpc_url: Optional[str] = None,
+    dao: DAOParameters = OWNERSHIP,
+    max_workers: Optional[int] = None,
+) -> List[ReplayResult]:
+    """
+    Replays `swaps` once per parameter set (`{}` keeps the current
+    parameters) on a fork of the block before the first swap. Sets are
+    replayed in parallel worker processes, results come back in order.
+    """
+    if not swaps:
+        raise ValueError("No swaps to replay")
+    rpc_url = rpc_url or rpc()._rpc_url
+    block = swaps[0].block - 1
+    max_workers = max_workers or min(len(parameter_sets), os.cpu_count() or 1)
+    # forked (not spawned) workers do not re-run the calling script, each
+    # then opens its own fork of the chain
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_worker,
+        initargs=(rpc_url, block, pool_address),
+    ) as executor:
+        futures = [
+            executor.submit(_replay_worker, swaps, parameters, dao) for parameters in parameter_sets
+        ]
+        return [future.result() for future in futures]
@@ -0,0 +1,81 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+import json
+from typing import List, Optional, TYPE_CHECKING
+
+from voting.config import DAOParameters
+from voting.events import EventIndex
+from voting.storage import StateDiff
+
+if TYPE_CHECKING:
+    from voting.gauges import EmissionProjection
+    from voting.sensitivity import SensitivityReport
+
+
+@dataclass
+class XVoteReport:
+    chain_id: int
+    messages: list
+    # effect of relaying the messages to the chain's agent
+    diff: Optional[StateDiff] = None
+    events: Optional[EventIndex] = None
+
+
+@dataclass
+class VoteReport:
+    """
+    Filled in by `vote()` when the `with` block exits:
+
+    ```py
+    with vote(OWNERSHIP, "Set things.") as report:
+        things.set()
+
+    print(report.diff)
+    ```
+    """
+
+    dao: DAOParameters
+    description: str
+    actions: list = field(default_factory=list)
+    evm_script: Optional[bytes] = None
+    vote_id: Optional[int] = None
+    # effect of executeVote in the simulation
+    diff: Optional[StateDiff] = None
+    events: Optional[EventIndex] = None
+    # gas of executeVote in the simulation
+    gas_used: Optional[int] = None
+    xvotes: List[XVoteReport] = field(default_factory=list)
+    # one report per vote when the actions were split, `actions` then holds
+    # all of them and the other fields above stay empty, each part has its own
+    parts: List["VoteReport"] = field(default_factory=list)
+    # outcomes at other blocks, with `vote(..., sensitivity=...)`
+    sensitivity: Optional["SensitivityReport"] = None
+    # gauge weights and CRV emissions before and after, for votes that change them
+    emissions: Optional["EmissionProjection"] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "dao": self.dao.agent,
+            "description": self.description,
+            "actions": [[address, "0x" + bytes(calldata).hex()] for address, calldata in self.actions],
+            "evm_script": "0x" + bytes(self.evm_script).hex() if self.evm_script else None,
+            "vote_id": self.vote_id,
+            "diff": self.diff.to_dict() if self.diff else None,
+            "events": self.events.to_list() if self.events else None,
+            "gas_used": self.gas_used,
+            "xvotes": [
+                {
+                    "chain_id": xvote.chain_id,
+                    "messages": [[address, "0x" + bytes(calldata).hex()] for address, calldata in xvote.messages],
+                    "diff": xvote.diff.to_dict() if xvote.diff else None,
+                    "events": xvote.events.to_list() if xvote.events else None,
+                }
+                for xvote in self.xvotes
+            ],
+            "parts": [part.to_dict() for part in self.parts],
+            "emissions": self.emissions.to_dict() if self.emissions else None,
+        }
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,202 @@
+"""
+Simulates the captured actions of a vote at several blocks, to find votes
+that only work in the current market state. A vote executes about a week
+after it is simulated, asserts on pool state can fail by then.
+
+Every block is forked in its own worker process, where the vote is
+created, voted for and executed as in `vote()`, then `check` runs. The
+outcomes are compared across blocks: reverts and failed checks,
+and storage written with other values.
+
+```py
+with vote(OWNERSHIP, "Ramp A.", sensitivity=Sensitivity(("head", "-1d", "-7d"), check=check_ramp)) as report:
+    pool.ramp_A_gamma(...)
+
+print(report.sensitivity)
+```
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+import io
+import multiprocessing
+import re
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import boa
+
+from voting import profiling
+from voting.config import DAOParameters
+from voting.history import rpc
+from voting.storage import StateDiff
+
+# Mainnet slot time, missed slots make relative blocks slightly earlier
+SECONDS_PER_BLOCK = 12
+DEFAULT_BLOCKS = ("head", "-1d", "-7d")
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+BlockSpec = Union[int, str]
+
+
+@dataclass(frozen=True)
+class Sensitivity:
+    """
+    Blocks to simulate at: numbers, `head` (the block the vote is
+    simulated at), or times before it like `-12h`, `-1d`, `-2w`. `check`
+    runs after execution at every block, with the contracts of the script
+    bound to that block.
+    """
+
+    blocks: Sequence[BlockSpec] = DEFAULT_BLOCKS
+    check: Optional[Callable[[], None]] = None
+    max_workers: Optional[int] = None
+
+
+def resolve_block(spec: BlockSpec, head: int) -> int:
+    if isinstance(spec, int):
+        return spec if spec >= 0 else head + spec
+    if spec == "head":
+        return head
+    match = re.fullmatch(r"-(\d+)([smhdw])", spec)
+    if match is None:
+        raise ValueError(f"Unknown block {spec!r}, expected a number, 'head' or e.g. '-1d'")
+    seconds = int(match.group(1)) * _UNITS[match.group(2)]
+    return max(0, head - seconds // SECONDS_PER_BLOCK)
+
+
+@dataclass
+class BlockOutcome:
+    block: int
+    # the vote reverted, or `check` failed after it executed
+    error: Optional[str] = None
+    check_error: Optional[str] = None
+    gas_used: Optional[int] = None
+    diff: Optional[StateDiff] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.check_error is None
+
+    def writes(self) -> Dict[Tuple[str, str], int]:
+        if self.diff is None:
+            return {}
+        return {(c.address, c.name or hex(c.slot)): c.after for c in self.diff.storage}
+
+
+@dataclass
+class SensitivityReport:
+    outcomes: List[BlockOutcome] = field(default_factory=list)
+
+    @property
+    def failed(self) -> List[BlockOutcome]:
+        return [outcome for outcome in self.outcomes if not outcome.ok]
+
+    def differing_writes(self) -> Dict[Tuple[str, str], Dict[int, Optional[int]]]:
+        """(address, slot name) -> block -> value written, for writes that differ between blocks."""
+        executed = [outcome for outcome in self.outcomes if outcome.error is None]
+        writes = {outcome.block: outcome.writes() for outcome in executed}
+        keys = {key for values in writes.values() for key in values}
+        ret = {}
+        for key in sorted(keys):
+            values = {block: writes[block].get(key) for block in writes}
+            if len(set(values.values())) > 1:
+                ret[key] = values
+        return ret
+
+    @property
+    def stable(self) -> bool:
+        return not self.failed
+
+    def __str__(self) -> str:
+        lines = [f"{'block':>10} {'result':<8} gas"]
+        for outcome in self.outcomes:
+            result = "ok" if outcome.ok else "reverted" if outcome.error else "check"
+            lines.append(f"{outcome.block:>10} {result:<8} {outcome.gas_used or '-'}")
+            for error in (outcome.error, outcome.check_error):
+                if error:
+                    lines.append(f"{'':>10} {error}")
+        differing = self.differing_writes()
+        if differing:
+            lines.append("Writes that differ between blocks:")
+            for (address, name), values in differing.items():
+                lines.append(f" {address} {name}: " + ", ".join(f"{b}={v}" for b, v in values.items()))
+        return "\n".join(lines)
+
+
+# Set in each worker when it starts, inherited from the parent process
+_dao: Optional[DAOParameters] = None
+_actions: Sequence = ()
+_check: Optional[Callable[[], None]] = None
+_rpc_url: Optional[str] = None
+
+
+def _init_worker(dao, actions, check, rpc_url) -> None:
+    global _dao, _actions, _check, _rpc_url
+    from voting import profiling
+
+    # the profiler was paused for the fork, it belongs to the parent
+    profiling._profiler = None
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _dao, _actions, _check, _rpc_url = dao, actions, check, rpc_url
+
+
+def _simulate_block(block: int) -> BlockOutcome:
+    from voting.create_vote import _create_vote
+    from voting.report import VoteReport
+
+    # forks the current env in place, so contracts bound in the script follow
+    boa.env.fork(url=_rpc_url, block_identifier=block, deprecated=False)
+    outcome = BlockOutcome(block)
+    report = VoteReport(_dao, "")
+    try:
+        with redirect_stdout(io.StringIO()):
+            _create_vote(_dao, _actions, "", None, report)
+    except Exception as e:
+        outcome.error = f"{type(e).__name__}: {e}"
+        return outcome
+
+    outcome.gas_used = report.gas_used
+    # the voting's own storage (vote ids, executed flags) always differs
+    outcome.diff = StateDiff(
+        [c for c in report.diff.storage if c.address.lower() != _dao.voting.lower()],
+        report.diff.balances,
+    )
+    if _check is not None:
+        try:
+            _check()
+        except Exception as e:
+            outcome.check_error = f"{type(e).__name__}: {e}"
+    return outcome
+
+
+def simulate_at_blocks(
+    dao: DAOParameters,
+    actions: Sequence,
+    sensitivity: Sensitivity,
+    head: Optional[int] = None,
+    rpc_url: Optional[str] = None,
+) -> SensitivityReport:
+    """
+    Outcome of the vote at every block of `sensitivity`, relative to `head`
+    (default: the block of the current fork), in parallel worker processes.
+
+    Workers are forked, a thread holding a lock while the process forks
+    would deadlock them: background threads (like `voting.preflight`'s)
+    must be done before this is called, the profiler's sampler is paused.
+    """
+    head = boa.env.evm.patch.block_number if head is None else head
+    rpc_url = rpc_url or rpc()._rpc_url
+    blocks = list(dict.fromkeys(resolve_block(spec, head) for spec in sensitivity.blocks))
+    # forked (not spawned) workers inherit the script's contracts and `check`,
+    # which then needs no pickling
+    with profiling.paused(), ProcessPoolExecutor(
+        max_workers=sensitivity.max_workers or len(blocks),
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_worker,
+        initargs=(dao, list(actions), sensitivity.check, rpc_url),
+    ) as executor:
+        return SensitivityReport(list(executor.map(_simulate_block, blocks)))
@@ -0,0 +1,179 @@
+"""
+Declarative vote specs. A TOML file lists votes and their actions, each an
+ABI from `voting.abi`, an address, a method with its arguments and the
+values view functions must return once the vote executed:
+
+```toml
+[[vote]]
+dao = "ownership"
+description = "[stableswap] Set new fee of 0x4f49...3C85 to 4000000."
+
+[[vote.action]]
+abi = "stableswap_ng_mainnet_pool"
+address = "0x4f493B7dE8aAC7d55F71853688b1F7C8F0243C85"
+method = "set_new_fee"
+args = [4000000, 20]
+expect = { fee = 4000000, offpeg_fee_multiplier = 20 }
+```
+
+The current values of everything in `expect` are read in one multicall
+for all votes, then every vote is built and simulated on its own anchor of
+the same fork, with the expectations asserted in `vote_test()`:
+
+    uv run python -m voting.spec scripts/specs/fees.toml
+"""
+from __future__ import annotations
+import argparse
+from dataclasses import dataclass, field
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import boa
+
+from voting import abi
+from voting.config import DAOParameters, OWNERSHIP, PARAMETER
+from voting.create_vote import vote, vote_test
+from voting.multicall import multicall
+from voting.report import VoteReport
+
+DAOS = {"ownership": OWNERSHIP, "parameter": PARAMETER}
+
+
+@dataclass(frozen=True)
+class ActionSpec:
+    abi: str
+    address: str
+    method: str
+    args: tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    # view function -> value it returns after the vote
+    expect: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class VoteSpec:
+    dao: DAOParameters
+    description: str
+    actions: Tuple[ActionSpec, ...]
+
+
+def _factory(name: str, abis: Dict[str, Any]):
+    factory = abis.get(name, getattr(abi, name, None))
+    if factory is None:
+        raise ValueError(f"Unknown ABI {name!r}, expected a name from `voting.abi`")
+    return factory
+
+
+def _parse_action(entry: dict, abis: Dict[str, Any]) -> ActionSpec:
+    unknown = set(entry) - {"abi", "address", "method", "args", "kwargs", "expect"}
+    if unknown:
+        raise ValueError(f"Unknown action fields: {', '.join(sorted(unknown))}")
+    action = ActionSpec(
+        abi=entry["abi"],
+        address=entry["address"],
+        method=entry["method"],
+        args=tuple(entry.get("args", ())),
+        kwargs=dict(entry.get("kwargs", {})),
+        expect=dict(entry.get("expect", {})),
+    )
+    factory = _factory(action.abi, abis)
+    names = {function.name for function in factory.functions}
+    for name in [action.method, *action.expect]:
+        if name not in names:
+            raise ValueError(f"{action.abi} has no function {name!r}")
+    return action
+
+
+def parse_spec(spec: dict, abis: Optional[Dict[str, Any]] = None) -> List[VoteSpec]:
+    """
+    Votes of a parsed spec. `abis` adds ABI factories by name, next to
+    the ones of `voting.abi`.
+    """
+    abis = abis or {}
+    votes = []
+    for entry in spec.get("vote", []):
+        dao = entry.get("dao", "ownership")
+        if dao not in DAOS:
+            raise ValueError(f"Unknown DAO {dao!r}, expected one of {', '.join(DAOS)}")
+        actions = tuple(_parse_action(action, abis) for action in entry.get("action", []))
+        if not actions:
+            raise ValueError(f"Vote {entry.get('description')!r} has no actions")
+        votes.append(VoteSpec(DAOS[dao], entry["description"], actions))
+    return votes
+
+
+def load_spec(path: str, abis: Optional[Dict[str, Any]] = None) -> List[VoteSpec]:
+    try:
+        import tomllib
+    except ModuleNotFoundError:  # Python 3.10
+        import tomli as tomllib
+
+    with open(path, "rb") as f:
+        return parse_spec(tomllib.load(f), abis)
+
+
+def pre_read(
+    votes: Sequence[VoteSpec], abis: Optional[Dict[str, Any]] = None
+) -> Dict[Tuple[str, str], Any]:
+    """(address, view function) -> current value, for every expectation of every vote."""
+    abis = abis or {}
+    keys, calls = [], []
+    for spec in votes:
+        for action in spec.actions:
+            contract = _factory(action.abi, abis).at(action.address)
+            for name in action.expect:
+                if (action.address, name) not in keys:
+                    keys.append((action.address, name))
+                    calls.append(getattr(contract, name))
+    return dict(zip(keys, multicall(calls)))
+
+
+def build_votes(
+    votes: Sequence[VoteSpec],
+    abis: Optional[Dict[str, Any]] = None,
+) -> List[VoteReport]:
+    """
+    Builds and simulates every vote, each on its own anchor so that they
+    all start from the same state. Returns the report of each vote, votes
+    are not created live.
+    """
+    abis = abis or {}
+    current = pre_read(votes, abis)
+    reports = []
+    for spec in votes:
+        contracts = [_factory(action.abi, abis).at(action.address) for action in spec.actions]
+        for action in spec.actions:
+            for name, value in action.expect.items():
+                print(f"{action.address} {name}: {current[(action.address, name)]} -> {value}")
+
+        with boa.env.anchor():
+            with vote(spec.dao, spec.description) as report:
+                for action, contract in zip(spec.actions, contracts):
+                    getattr(contract, action.method)(*action.args, **action.kwargs)
+                with vote_test():
+                    for action, contract in zip(spec.actions, contracts):
+                        for name, value in action.expect.items():
+                            actual = getattr(contract, name)()
+                            assert actual == value, f"{action.address} {name} is {actual}, expected {value}"
+        reports.append(report)
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Builds the votes of a spec on one fork.")
+    parser.add_argument("spec")
+    parser.add_argument("--rpc", default=os.getenv("RPC_URL"), help="default: $RPC_URL")
+    parser.add_argument("--out", help="directory to save the report of every vote in")
+    args = parser.parse_args()
+
+    votes = load_spec(args.spec)
+    boa.fork(args.rpc)
+    reports = build_votes(votes)
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        for i, report in enumerate(reports, 1):
+            report.save(os.path.join(args.out, f"vote-{i}.json"))
+
+
+if __name__ == "__main__":
+    main()
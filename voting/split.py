@@ -0,0 +1,90 @@
+"""
+Splits the actions of a vote that would not fit in one block into several
+votes, executed one after the other.
+
+Every action is replayed the way `executeVote` runs it to measure its gas
+and its size in the EVM script. Parts are contiguous runs of actions, so
+each vote executes after the ones its actions may depend on, and filling
+each part as far as the limits allow gives the fewest votes.
+
+```py
+parts = split_actions(OWNERSHIP, actions, VoteLimits(max_gas=10_000_000))
+```
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+import logging
+from typing import List, Optional, Sequence
+
+import boa
+
+from voting.config import DAOParameters
+from voting.context import use_clean_prepare_calldata
+from voting.optimize import ActionEffect, _replay, _CALLDATA_GAS, _LOAD_WORD_GAS, _STORE_WORD_GAS
+
+logger = logging.getLogger(__name__)
+
+# A third of the mainnet block gas limit, for both newVote and executeVote
+MAX_VOTE_GAS = 15_000_000
+# executeVote and newVote outside of the script and its actions
+_BASE_GAS = 150_000
+# spec id of the script
+_SCRIPT_HEADER_BYTES = 4
+
+
+@dataclass(frozen=True)
+class VoteLimits:
+    max_gas: int = MAX_VOTE_GAS
+    max_script_bytes: Optional[int] = None
+
+    def script_bytes(self, effects: Sequence[ActionEffect]) -> int:
+        return _SCRIPT_HEADER_BYTES + sum(effect.script_bytes for effect in effects)
+
+    def new_vote_gas(self, effects: Sequence[ActionEffect]) -> int:
+        """newVote sends the script as calldata and stores it."""
+        size = self.script_bytes(effects)
+        return _BASE_GAS + size * _CALLDATA_GAS + (size + 31) // 32 * _STORE_WORD_GAS
+
+    def execute_gas(self, effects: Sequence[ActionEffect]) -> int:
+        """executeVote loads the script and runs every action."""
+        size = self.script_bytes(effects)
+        return _BASE_GAS + (size + 31) // 32 * _LOAD_WORD_GAS + sum(e.gas_used for e in effects)
+
+    def fits(self, effects: Sequence[ActionEffect]) -> bool:
+        if self.max_script_bytes is not None and self.script_bytes(effects) > self.max_script_bytes:
+            return False
+        return max(self.new_vote_gas(effects), self.execute_gas(effects)) <= self.max_gas
+
+
+def split_actions(
+    dao: DAOParameters, actions: Sequence, limits: VoteLimits = VoteLimits()
+) -> List[list]:
+    """
+    Ordered parts of `actions` that each fit in one vote. Actions are
+    measured on the current state, the way `executeVote` runs them.
+    Returns the actions as one part if they cannot be replayed.
+    """
+    with use_clean_prepare_calldata(), boa.env.anchor():
+        try:
+            effects, _ = _replay(dao, actions)
+        except Exception as e:
+            logger.warning(f"Could not replay actions to measure them: {e}")
+            return [list(actions)]
+
+    parts: List[List[ActionEffect]] = [[]]
+    for effect in effects:
+        if not limits.fits([effect]):
+            raise ValueError(
+                f"Action {effect.index} ({actions[effect.index][0]}) alone exceeds the vote limits: "
+                f"{effect.gas_used} gas, {effect.script_bytes} script bytes"
+            )
+        if not limits.fits(parts[-1] + [effect]):
+            parts.append([])
+        parts[-1].append(effect)
+
+    if len(parts) > 1:
+        logger.warning(
+            f"Actions exceed the limits of one vote ({limits.max_gas} gas), split into {len(parts)} votes: "
+            + ", ".join(f"{len(part)} actions / ~{limits.execute_gas(part)} gas" for part in parts)
+        )
+    return [[actions[effect.index] for effect in part] for part in parts]
@@ -0,0 +1,228 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from boa.util.abi import Address
+from boa.vm import py_evm
+from boa.vm.utils import to_int
+
+SSTORE = 0x55
+
+
+class WriteRecorder:
+    """
+    SSTORE hook that records the value every written slot had before its
+    first write. Current values are then read from the local journal, so
+    recording never triggers extra RPC reads.
+    """
+
+    mnemonic = "SSTORE"
+
+    def __init__(self, previous=None):
+        self.previous = previous
+        # (canonical address, slot) -> value before the first write
+        self.original: Dict[Tuple[bytes, int], int] = {}
+
+    def __call__(self, computation):
+        slot = to_int(computation._stack.values[-1])
+        key = (computation.msg.storage_address, slot)
+        if key not in self.original:
+            self.original[key] = computation.state.get_storage(*key)
+
+        if self.previous is not None:
+            self.previous(computation)
+        else:
+            type(computation).opcodes[SSTORE](computation)
+
+    def diff(self, state) -> Dict[Tuple[Address, int], Tuple[int, int]]:
+        """(address, slot) -> (before, after) for every slot whose value changed."""
+        ret = {}
+        for (address, slot), before in self.original.items():
+            after = state.get_storage(address, slot)
+            if after != before:
+                ret[(Address(address), slot)] = (before, after)
+        return ret
+
+
+@contextmanager
+def record_writes():
+    """
+    Records every storage write of the computations started inside the
+    `with` block. Recorders can be nested.
+
+    ```py
+    with record_writes() as recorder:
+        pool.set_new_fee(...)
+    changes = recorder.diff(boa.env.evm.vm.state)
+    ```
+    """
+    previous = py_evm._opcode_overrides.get(SSTORE)
+    recorder = WriteRecorder(previous)
+    py_evm.patch_opcode(SSTORE, recorder)
+    try:
+        yield recorder
+    finally:
+        if previous is None:
+            py_evm._opcode_overrides.pop(SSTORE, None)
+        else:
+            py_evm.patch_opcode(SSTORE, previous)
+
+
+# address -> {slot: name}, for contracts whose storage layout is known but
+# which are not compiled locally (e.g. from a verified source)
+_layouts: Dict[Address, Dict[int, str]] = {}
+
+# keccak256("Transfer(address,address,uint256)")
+TRANSFER_TOPIC = 0xDDF252AD1BE2C89B69C2B068FC378DAA952BA7F163C4A11628F55A4DF523B3EF
+
+
+def register_layout(address: str, layout: Dict[int, str]) -> None:
+    """Names storage slots of `address` in state diffs, e.g. `{0: "admin", 3: "fee"}`."""
+    _layouts[Address(address)] = dict(layout)
+
+
+def _layout(env, address: Address) -> Dict[int, str]:
+    if address in _layouts:
+        return _layouts[address]
+    contract = env.lookup_contract(address)
+    compiler_data = getattr(contract, "compiler_data", None)
+    if compiler_data is None:
+        return {}
+    ret = {}
+    for name, item in compiler_data.storage_layout["storage_layout"].items():
+        for i in range(item.get("n_slots", 1)):
+            ret[item["slot"] + i] = name if i == 0 else f"{name}+{i}"
+    return ret
+
+
+def _format_key(key: int) -> str:
+    if 0 < key.bit_length() <= 160 and key >= 2**64:
+        return str(Address(key.to_bytes(20, "big")))
+    return str(key)
+
+
+def _slot_name(env, layout: Dict[int, str], slot: int, depth: int = 0) -> Optional[str]:
+    """
+    Resolves a slot to a variable name using the layout and the keccak
+    preimages boa traced during execution (mapping keys and struct offsets).
+    """
+    if slot in layout:
+        return layout[slot]
+    if depth > 4:
+        return None
+    # members of structs stored in mappings sit a few slots after the hash
+    for offset in range(16):
+        image = (slot - offset).to_bytes(32, "big") if slot >= offset else None
+        preimage = env.sha3_trace.get(image)
+        if preimage is None:
+            continue
+        a, b = int.from_bytes(preimage[:32], "big"), int.from_bytes(preimage[32:], "big")
+        # vyper hashes (slot, key), solidity (key, slot)
+        for base, key in ((a, b), (b, a)):
+            base_name = _slot_name(env, layout, base, depth + 1)
+            if base_name is not None:
+                break
+        else:
+            base, key, base_name = a, b, f"<{a}>"
+        name = f"{base_name}[{_format_key(key)}]"
+        return name if offset == 0 else f"{name}+{offset}"
+    return None
+
+
+@dataclass(frozen=True)
+class SlotChange:
+    address: str
+    slot: int
+    name: Optional[str]
+    before: int
+    after: int
+
+
+@dataclass(frozen=True)
+class BalanceChange:
+    address: str
+    token: Optional[str]  # None for ether
+    delta: int
+
+
+@dataclass
+class StateDiff:
+    storage: List[SlotChange] = field(default_factory=list)
+    balances: List[BalanceChange] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "storage": [
+                {**asdict(change), "slot": hex(change.slot), "before": hex(change.before), "after": hex(change.after)}
+                for change in self.storage
+            ],
+            "balances": [asdict(change) for change in self.balances],
+        }
+
+    def __str__(self) -> str:
+        lines = []
+        for change in self.storage:
+            name = change.name or f"<{hex(change.slot)}>"
+            lines.append(f" {change.address} {name}: {change.before} -> {change.after}")
+        for change in self.balances:
+            token = change.token or "ETH"
+            lines.append(f" {change.address} {token} balance: {change.delta:+}")
+        return "\n".join(lines) if lines else " (no changes)"
+
+
+def _ether_deltas(computation, deltas: Dict[str, int]) -> None:
+    # reverted frames (and everything below them) do not move ether
+    if computation.is_error:
+        return
+    msg = computation.msg
+    if msg.value:
+        sender, receiver = Address(msg.sender), Address(msg.storage_address)
+        deltas[sender] = deltas.get(sender, 0) - msg.value
+        deltas[receiver] = deltas.get(receiver, 0) + msg.value
+    for child in computation.children:
+        _ether_deltas(child, deltas)
+
+
+def _token_deltas(computation, deltas: Dict[Tuple[str, str], int]) -> None:
+    # logs of reverted frames are already dropped by py-evm
+    for _, address, topics, data in computation.get_raw_log_entries():
+        # ERC721 transfers have the token id as a fourth topic
+        if len(topics) != 3 or topics[0] != TRANSFER_TOPIC or len(data) != 32:
+            continue
+        token = Address(address)
+        amount = int.from_bytes(data, "big")
+        sender = Address(topics[1].to_bytes(32, "big")[12:])
+        receiver = Address(topics[2].to_bytes(32, "big")[12:])
+        deltas[(sender, token)] = deltas.get((sender, token), 0) - amount
+        deltas[(receiver, token)] = deltas.get((receiver, token), 0) + amount
+
+
+def state_diff(env, recorder: WriteRecorder, computations: Sequence) -> StateDiff:
+    """
+    Builds the storage and balance diff of `computations` from what the
+    EVM already tracked while running them: the slots recorded by
+    `recorder`, the call tree (ether) and the Transfer logs (tokens).
+    """
+    diff = StateDiff()
+    layouts: Dict[Address, Dict[int, str]] = {}
+    for (address, slot), (before, after) in sorted(recorder.diff(env.evm.vm.state).items()):
+        if address not in layouts:
+            layouts[address] = _layout(env, address)
+        name = _slot_name(env, layouts[address], slot)
+        diff.storage.append(SlotChange(str(address), slot, name, before, after))
+
+    ether: Dict[str, int] = {}
+    tokens: Dict[Tuple[str, str], int] = {}
+    for computation in computations:
+        _ether_deltas(computation, ether)
+        _token_deltas(computation, tokens)
+    diff.balances += [
+        BalanceChange(str(address), None, delta) for address, delta in ether.items() if delta
+    ]
+    diff.balances += [
+        BalanceChange(str(address), str(token), delta)
+        for (address, token), delta in tokens.items()
+        if delta
+    ]
+    return diff
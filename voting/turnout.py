@@ -0,0 +1,127 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import boa
+import numpy as np
+
+from voting import abi
+from voting.config import CONVEX_VOTER_PROXY, DAOParameters
+from voting.multicall import multicall
+
+PCT_BASE = 10**18
+
+
+@dataclass(frozen=True)
+class Projection:
+    """Outcome of every scenario, one entry per row of the scenario matrix."""
+
+    yea: np.ndarray
+    nay: np.ndarray
+    support: np.ndarray
+    turnout: np.ndarray
+    passes: np.ndarray
+
+
+@dataclass(frozen=True)
+class TurnoutSnapshot:
+    """
+    veCRV balances of a set of holders at a vote's snapshot block, together
+    with the thresholds the vote has to meet.
+    """
+
+    dao: DAOParameters
+    snapshot_block: int
+    holders: tuple
+    balances: np.ndarray
+    voting_power: float
+    support_required: float
+    quorum: float
+
+    def index(self, holder: str) -> int:
+        lowered = [h.lower() for h in self.holders]
+        return lowered.index(holder.lower())
+
+    def project(self, yes, no=None) -> Projection:
+        """
+        `yes` and `no` are arrays of shape (scenarios, holders) holding the
+        share of each holder's balance voting for and against (the rest
+        abstains). A 1-d array is treated as a single scenario.
+        """
+        yes = np.atleast_2d(np.asarray(yes, dtype=float))
+        no = np.zeros_like(yes) if no is None else np.atleast_2d(np.asarray(no, dtype=float))
+        assert yes.shape[1] == len(self.holders), "One column per holder expected"
+        assert yes.shape == no.shape, "yes and no must have the same shape"
+
+        yea = yes @ self.balances
+        nay = no @ self.balances
+        cast = yea + nay
+        with np.errstate(divide="ignore", invalid="ignore"):
+            support = np.where(cast > 0, yea / cast, 0.0)
+        turnout = yea / self.voting_power
+
+        # Aragon requires both percentages to be strictly above the threshold
+        passes = (support > self.support_required) & (turnout > self.quorum)
+        return Projection(yea, nay, support, turnout, passes)
+
+    def can_pass_without(self, *excluded: str) -> bool:
+        """Whether the vote passes if every holder but `excluded` votes yes."""
+        yes = np.ones(len(self.holders))
+        for holder in excluded:
+            yes[self.index(holder)] = 0
+        return bool(self.project(yes).passes[0])
+
+
+def all_scenarios(n_holders: int) -> np.ndarray:
+    """Every yes/abstain combination of `n_holders`, shape (2**n_holders, n_holders)."""
+    assert n_holders <= 24, "Too many holders to enumerate every scenario"
+    rows = np.arange(2**n_holders, dtype=np.uint32)
+    return ((rows[:, None] >> np.arange(n_holders, dtype=np.uint32)) & 1).astype(float)
+
+
+def snapshot_turnout(
+    dao: DAOParameters,
+    holders: Sequence[str] = (CONVEX_VOTER_PROXY,),
+    vote_id: Optional[int] = None,
+) -> TurnoutSnapshot:
+    """
+    Reads the veCRV balance of every holder at the snapshot block of
+    `vote_id`, or at the block a vote created now would snapshot, in a
+    single batched read.
+
+    The quorum is taken from `dao.quorum`. Support is the one `vote_id` was
+    created with, or the voting contract's current one for a new vote.
+    """
+    voting = abi.voting.at(dao.voting)
+    reads = []
+    if vote_id is None:
+        # newVote snapshots the previous block
+        snapshot_block = boa.env.evm.patch.block_number - 1
+        reads.append(voting.supportRequiredPct)
+    else:
+        # the vote keeps the support required when it was created
+        vote = voting.getVote(vote_id)
+        snapshot_block, support_required = vote[3], vote[4]
+
+    voting_escrow = abi.voting_escrow.at(dao.token)
+    results = multicall(
+        [
+            *reads,
+            (voting_escrow.totalSupplyAt, snapshot_block),
+            *[(voting_escrow.balanceOfAt, holder, snapshot_block) for holder in holders],
+        ],
+        allow_failure=False,
+    )
+    if reads:
+        support_required, *results = results
+    voting_power, *balances = results
+
+    return TurnoutSnapshot(
+        dao=dao,
+        snapshot_block=snapshot_block,
+        holders=tuple(holders),
+        balances=np.array(balances, dtype=float),
+        voting_power=float(voting_power),
+        support_required=support_required / PCT_BASE,
+        quorum=dao.quorum / 100,
+    )
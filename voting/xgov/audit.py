@@ -0,0 +1,287 @@
+"""
+Checks the xgov configuration of `voting.xgov.chains` against on-chain
+state. Every chain with an RPC is queried concurrently, in a few JSON-RPC
+batches at one block:
+
+- the RPC serves the chain id of the registry,
+- the relayer is a contract, its `OWNERSHIP_AGENT`, `PARAMETER_AGENT` and
+  `EMERGENCY_AGENT` point back to it (`RELAYER()`) and its `messenger` is
+  a contract,
+- on mainnet, the broadcaster's `admins` are the ownership and parameter
+  agents and, for generic broadcasters, `destination_data` of the chain
+  has the registry's relayer.
+
+Results are cached per chain and block, an audit at an unchanged block
+sends nothing but `eth_blockNumber`.
+
+    uv run python -m voting.xgov.audit --rpc $RPC_URL
+"""
+from __future__ import annotations
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import json
+import os
+import sys
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from boa.rpc import EthereumRPC, to_int
+from boa.util.abi import abi_decode
+
+from voting import abi
+from voting.config import OWNERSHIP, PARAMETER
+from voting.constants import ZERO_ADDRESS
+from voting.context import use_clean_prepare_calldata
+import voting.xgov.chains as chains_module
+from voting.xgov.chains import Chain
+
+MAINNET_CHAIN_ID = 1
+AGENTS = ("OWNERSHIP_AGENT", "PARAMETER_AGENT", "EMERGENCY_AGENT")
+
+# (chain id, block, method, params) -> result
+_cache: Dict[Tuple[int, int, str, str], str] = {}
+
+FetchMulti = Callable[[List[tuple]], list]
+
+
+@dataclass(frozen=True)
+class Mismatch:
+    chain_id: int
+    field: str
+    expected: str
+    actual: str
+
+    def __str__(self) -> str:
+        return f"{self.chain_id} {self.field}: expected {self.expected}, got {self.actual}"
+
+
+@dataclass
+class ChainAudit:
+    chain_id: int
+    block: Optional[int] = None
+    # what was read, by field
+    values: Dict[str, str] = field(default_factory=dict)
+    mismatches: List[Mismatch] = field(default_factory=list)
+    # the chain could not be audited (no RPC, RPC errors)
+    error: Optional[str] = None
+
+    def expect(self, name: str, expected, actual) -> None:
+        if str(expected).lower() != str(actual).lower():
+            self.mismatches.append(Mismatch(self.chain_id, name, str(expected), str(actual)))
+
+
+@dataclass
+class AuditReport:
+    chains: List[ChainAudit] = field(default_factory=list)
+
+    @property
+    def mismatches(self) -> List[Mismatch]:
+        return [mismatch for chain in self.chains for mismatch in chain.mismatches]
+
+    @property
+    def skipped(self) -> List[ChainAudit]:
+        return [chain for chain in self.chains if chain.error is not None]
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+    def to_dict(self) -> dict:
+        return {
+            str(chain.chain_id): {
+                "block": chain.block,
+                "values": chain.values,
+                "mismatches": [str(mismatch) for mismatch in chain.mismatches],
+                "error": chain.error,
+            }
+            for chain in self.chains
+        }
+
+    def __str__(self) -> str:
+        lines = [f"{'chain':>12} {'block':>10} result"]
+        for chain in self.chains:
+            result = "skipped" if chain.error else "ok" if not chain.mismatches else "MISMATCH"
+            lines.append(f"{chain.chain_id:>12} {chain.block or '-':>10} {result}")
+            if chain.error:
+                lines.append(f"{'':>12} {chain.error}")
+            for mismatch in chain.mismatches:
+                lines.append(f"{'':>12} {mismatch.field}: expected {mismatch.expected}, got {mismatch.actual}")
+        return "\n".join(lines)
+
+
+def registry() -> List[Chain]:
+    """Every chain of `voting.xgov.chains`."""
+    return [chain for chain in vars(chains_module).values() if isinstance(chain, Chain)]
+
+
+def clear_cache() -> None:
+    _cache.clear()
+
+
+def _function(factory, name: str):
+    (function,) = [f for f in factory.functions if f.name == name]
+    return function
+
+
+def _eth_call(to: str, factory, name: str, *args) -> tuple:
+    function = _function(factory, name)
+    with use_clean_prepare_calldata():
+        data = "0x" + function.prepare_calldata(*args).hex()
+    return "eth_call", [{"to": to, "data": data}]
+
+
+def _decode(result: str, factory, name: str):
+    """Return value of a call, `None` if it returned nothing (no contract)."""
+    if not result or result == "0x":
+        return None
+    (value,) = abi_decode(_function(factory, name).return_type[0].join("()"), bytes.fromhex(result[2:]))
+    return value
+
+
+def _fetch(fetch_multi: FetchMulti, chain_id: int, block: int, payloads: Sequence[tuple]) -> list:
+    """Results of `payloads` at `block`, only those not cached yet are sent, in one batch."""
+    keys = [(chain_id, block, method, json.dumps(params)) for method, params in payloads]
+    missing = [(key, payload) for key, payload in dict(zip(keys, payloads)).items() if key not in _cache]
+    if missing:
+        results = fetch_multi([(method, [*params, hex(block)]) for _, (method, params) in missing])
+        for (key, _), result in zip(missing, results):
+            _cache[key] = result
+    return [_cache[key] for key in keys]
+
+
+def _head(fetch_multi: FetchMulti) -> Tuple[int, int]:
+    chain_id, block = fetch_multi([("eth_chainId", []), ("eth_blockNumber", [])])
+    return to_int(chain_id), to_int(block)
+
+
+def audit_chain(chain: Chain, fetch_multi: Optional[FetchMulti] = None) -> ChainAudit:
+    """Relayer, agents and messenger of one chain, read from its RPC pool by default."""
+    fetch_multi = fetch_multi or _chain_fetch(chain)
+    chain_id, block = _head(fetch_multi)
+    chain_audit = ChainAudit(chain.id, block)
+    chain_audit.expect("chain_id", chain.id, chain_id)
+    if chain_audit.mismatches:
+        return chain_audit
+
+    relayer = chain.relayer
+    code, *values = _fetch(
+        fetch_multi,
+        chain.id,
+        block,
+        [("eth_getCode", [relayer])] + [_eth_call(relayer, abi.relayer, name) for name in [*AGENTS, "messenger"]],
+    )
+    if code in ("0x", ""):
+        chain_audit.expect("relayer", "contract", "no code")
+        return chain_audit
+    *agents, messenger = [_decode(value, abi.relayer, name) for value, name in zip(values, [*AGENTS, "messenger"])]
+    chain_audit.values.update({name: str(agent) for name, agent in zip(AGENTS, agents)})
+    chain_audit.values["messenger"] = str(messenger)
+
+    live = [(name, agent) for name, agent in zip(AGENTS, agents) if agent not in (None, ZERO_ADDRESS)]
+    for name, agent in zip(AGENTS, agents):
+        if agent in (None, ZERO_ADDRESS):
+            chain_audit.expect(name, "agent", ZERO_ADDRESS)
+    payloads = [_eth_call(agent, abi.agent, "RELAYER") for _, agent in live]
+    if messenger not in (None, ZERO_ADDRESS):
+        payloads.append(("eth_getCode", [messenger]))
+    results = _fetch(fetch_multi, chain.id, block, payloads)
+    for (name, _), result in zip(live, results):
+        chain_audit.expect(f"{name}.RELAYER", relayer, _decode(result, abi.agent, "RELAYER"))
+    if messenger in (None, ZERO_ADDRESS):
+        chain_audit.expect("messenger", "contract", ZERO_ADDRESS)
+    elif results[-1] in ("0x", ""):
+        chain_audit.expect("messenger", "contract", "no code")
+    return chain_audit
+
+
+def audit_broadcasters(chains: Sequence[Chain], fetch_multi: FetchMulti) -> ChainAudit:
+    """Admins of every broadcaster, and `destination_data` of generic ones, on mainnet."""
+    chain_id, block = _head(fetch_multi)
+    chain_audit = ChainAudit(MAINNET_CHAIN_ID, block)
+    chain_audit.expect("chain_id", MAINNET_CHAIN_ID, chain_id)
+    if chain_audit.mismatches:
+        return chain_audit
+
+    broadcasters = list({chain.broadcaster.address.lower(): chain.broadcaster for chain in chains}.values())
+    generic = [chain for chain in chains if "destination_data" in _names(chain.broadcaster)]
+    payloads = [_eth_call(b.address, abi.broadcasters[b.abi_key], "admins") for b in broadcasters]
+    payloads += [
+        _eth_call(chain.broadcaster.address, abi.broadcasters[chain.broadcaster.abi_key], "destination_data", chain.id)
+        for chain in generic
+    ]
+    results = _fetch(fetch_multi, MAINNET_CHAIN_ID, block, payloads)
+
+    for broadcaster, result in zip(broadcasters, results):
+        admins = _decode(result, abi.broadcasters[broadcaster.abi_key], "admins")
+        name = f"{type(broadcaster).__name__}({broadcaster.address}).admins"
+        ownership, parameter = admins[:2] if admins else (None, None)
+        chain_audit.expect(f"{name}.ownership", OWNERSHIP.agent, ownership)
+        chain_audit.expect(f"{name}.parameter", PARAMETER.agent, parameter)
+
+    for chain, result in zip(generic, results[len(broadcasters):]):
+        factory = abi.broadcasters[chain.broadcaster.abi_key]
+        components = _function(factory, "destination_data")._abi["outputs"][0]["components"]
+        data = _decode(result, factory, "destination_data")
+        fields = dict(zip((c["name"] for c in components), data or ()))
+        chain_audit.values[f"destination_data({chain.id})"] = str(fields)
+        chain_audit.expect(f"destination_data({chain.id}).relayer", chain.relayer, fields.get("relayer"))
+    return chain_audit
+
+
+def _names(broadcaster) -> set:
+    return {function.name for function in abi.broadcasters[broadcaster.abi_key].functions}
+
+
+def _chain_fetch(chain: Chain) -> FetchMulti:
+    pool = chain.rpc_pool()
+    return lambda payloads: pool.call(lambda url: EthereumRPC(url).fetch_multi(payloads))
+
+
+def _run(chain_id: int, fn, *args) -> ChainAudit:
+    try:
+        return fn(*args)
+    except Exception as e:
+        return ChainAudit(chain_id, error=f"{type(e).__name__}: {e}")
+
+
+def audit(
+    chains: Optional[Sequence[Chain]] = None,
+    mainnet_rpc: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> AuditReport:
+    """
+    Audits `chains` (default: the whole registry), each in its own thread.
+    Chains without an RPC (see `voting.xgov.rpc`) or whose RPC fails are
+    reported as skipped, the mainnet side is skipped without `mainnet_rpc`.
+    """
+    chains = list(registry() if chains is None else chains)
+    with ThreadPoolExecutor(max_workers=max_workers or len(chains) + 1) as executor:
+        futures = [executor.submit(_run, chain.id, audit_chain, chain) for chain in chains]
+        if mainnet_rpc:
+            futures.append(
+                executor.submit(
+                    _run, MAINNET_CHAIN_ID, audit_broadcasters, chains, EthereumRPC(mainnet_rpc).fetch_multi
+                )
+            )
+        audits = [future.result() for future in futures]
+    if not mainnet_rpc:
+        audits.append(ChainAudit(MAINNET_CHAIN_ID, error="No mainnet RPC, broadcasters not audited"))
+    return AuditReport(audits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Checks the xgov registry against on-chain state.")
+    parser.add_argument("--rpc", default=os.getenv("RPC_URL"), help="mainnet RPC, default: $RPC_URL")
+    parser.add_argument("--out", help="file to save the report in, as JSON")
+    args = parser.parse_args()
+
+    report = audit(mainnet_rpc=args.rpc)
+    print(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    sys.exit(0 if report.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,8 @@ from voting.abi import (
 )
 from voting.config import DAOParameters, OWNERSHIP, PARAMETER
 from voting.constants import ZERO_ADDRESS
-from voting.context import use_clean_prepare_calldata
+from voting.context import has_mock, open_chain, use_clean_prepare_calldata
+from voting.xgov.rpc import chain_urls
 
 if TYPE_CHECKING:
     from voting.xgov.chains import Chain
@@ -58,16 +59,22 @@ class BaseBroadcaster:
         fork_params,
         messages: Sequence[tuple],
     ) -> List[int]:
-        with use_clean_prepare_calldata():
-            with boa.fork(**fork_params):
-                agent_contract = self.agent(chain, dao_agent)
-                relayer_contract = self.relayer(chain)
-                costs = []
-                for chunk in self._chunk_messages(messages):
-                    costs.append(
-                        self._relay_gas(agent_contract, relayer_contract, chunk)
-                    )
-                return costs
+        def _estimate(url: str) -> List[int]:
+            with use_clean_prepare_calldata():
+                with open_chain(chain.id, {**fork_params, "url": url}):
+                    agent_contract = self.agent(chain, dao_agent)
+                    relayer_contract = self.relayer(chain)
+                    costs = []
+                    for chunk in self._chunk_messages(messages):
+                        costs.append(
+                            self._relay_gas(agent_contract, relayer_contract, chunk)
+                        )
+                    return costs
+
+        # a url of the chain's pool (as picked by `xvote`) fails over to the others
+        if not has_mock() and fork_params["url"] in chain_urls(chain):
+            return chain.rpc_pool().call(_estimate)
+        return _estimate(fork_params["url"])
 
     def _relay_gas(
         self, agent_contract, relayer_contract, messages_chunk: Sequence[tuple]
@@ -1,11 +1,12 @@
 from dataclasses import dataclass
-from typing import Optional, Sequence, TYPE_CHECKING
+from typing import Optional, Sequence, Tuple, TYPE_CHECKING
 
 from voting.config import DAOParameters
 import voting.xgov.broadcasters as bd
 
 if TYPE_CHECKING:
     from voting.xgov import BroadcastParams
+    from voting.xgov.rpc import RPCPool
 
 
 RPC_NOT_SET = "RPC_NOT_SET"
@@ -17,6 +18,13 @@ class Chain:
     rpc: str
     broadcaster: bd.BaseBroadcaster
     relayer: str
+    # Fallback endpoints, ranked with `rpc` and `RPC_URLS_<id>` by `rpc_pool`
+    rpcs: Tuple[str, ...] = ()
+
+    def rpc_pool(self) -> "RPCPool":
+        from voting.xgov.rpc import rpc_pool
+
+        return rpc_pool(self)
 
     def agent_address(self, dao_agent: DAOParameters) -> str:
         return self.broadcaster.agent_address(self, dao_agent)
@@ -0,0 +1,165 @@
+"""
+Pools of RPC endpoints per chain. Endpoints are probed concurrently for
+latency and head block, requests go to the fastest endpoint that is not
+behind the others and fail over to the next one when the endpoint, not the
+request, fails (connection errors, timeouts, JSON-RPC errors).
+
+Endpoints of a chain come from the `RPC_URLS_<chain id>` environment
+variable (comma separated), then `Chain.rpcs` and `Chain.rpc`:
+
+```sh
+export RPC_URLS_252="https://rpc.frax.com,https://fraxtal.drpc.org"
+```
+
+```py
+pool = FRAXTAL.rpc_pool()
+pool.best()           # fastest healthy url
+pool.fetch("eth_chainId", [])
+print(pool.metrics())
+```
+"""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+import logging
+import os
+import time
+from typing import Callable, Dict, List, Optional, Sequence, TypeVar, TYPE_CHECKING
+
+import requests
+from boa.rpc import EthereumRPC, RPCError, to_int
+
+if TYPE_CHECKING:
+    from voting.xgov.chains import Chain
+
+logger = logging.getLogger(__name__)
+
+ENV_PREFIX = "RPC_URLS_"
+# Endpoints whose head is older than the newest head by more than this
+# (seconds, block times vary too much between chains to count blocks) are skipped
+MAX_HEAD_LAG = 60
+PROBE_TIMEOUT = 5
+# Probes are repeated when older than this
+PROBE_TTL = 300
+
+T = TypeVar("T")
+
+# Failures of the endpoint, anything else (e.g. a revert) fails on every endpoint
+TRANSPORT_ERRORS = (requests.RequestException, RPCError, ConnectionError, TimeoutError)
+
+
+@dataclass
+class Endpoint:
+    url: str
+    latency: Optional[float] = None  # seconds, of the last probe
+    head: Optional[int] = None
+    head_timestamp: Optional[int] = None
+    probed_at: Optional[float] = None
+    requests: int = 0
+    failures: int = 0
+    last_error: Optional[str] = None
+
+    def _record(self, error: Optional[Exception] = None) -> None:
+        self.requests += 1
+        if error is not None:
+            self.failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+
+
+class RPCPool:
+    def __init__(self, urls: Sequence[str], max_head_lag: float = MAX_HEAD_LAG):
+        if not urls:
+            raise ValueError("No RPC endpoints")
+        self.endpoints = [Endpoint(url) for url in dict.fromkeys(urls)]
+        self.max_head_lag = max_head_lag
+
+    def _probe(self, endpoint: Endpoint) -> None:
+        start = time.perf_counter()
+        try:
+            response = requests.post(
+                endpoint.url,
+                json={"jsonrpc": "2.0", "id": 1, "method": "eth_getBlockByNumber", "params": ["latest", False]},
+                timeout=PROBE_TIMEOUT,
+            )
+            response.raise_for_status()
+            block = response.json()["result"]
+            endpoint.head, endpoint.head_timestamp = to_int(block["number"]), to_int(block["timestamp"])
+        except Exception as e:
+            endpoint.latency, endpoint.head, endpoint.head_timestamp = None, None, None
+            endpoint._record(e)
+        else:
+            endpoint.latency = time.perf_counter() - start
+            endpoint._record()
+        endpoint.probed_at = time.time()
+
+    def probe(self) -> None:
+        """Measures latency and head block of every endpoint at once."""
+        with ThreadPoolExecutor(max_workers=len(self.endpoints)) as executor:
+            list(executor.map(self._probe, self.endpoints))
+
+    def ranked(self) -> List[Endpoint]:
+        """Endpoints that answered and are not behind, the fastest first."""
+        if any(e.probed_at is None or time.time() - e.probed_at > PROBE_TTL for e in self.endpoints):
+            self.probe()
+        alive = [e for e in self.endpoints if e.latency is not None]
+        if not alive:
+            return []
+        newest = max(e.head_timestamp for e in alive)
+        fresh = [e for e in alive if newest - e.head_timestamp <= self.max_head_lag]
+        return sorted(fresh, key=lambda e: e.latency)
+
+    def best(self) -> str:
+        ranked = self.ranked()
+        if not ranked:
+            raise ValueError(f"No healthy RPC endpoint among {[e.url for e in self.endpoints]}")
+        return ranked[0].url
+
+    def call(self, fn: Callable[[str], T]) -> T:
+        """
+        Runs `fn(url)` with the best endpoint, and with the next ones while
+        it raises `TRANSPORT_ERRORS`. Endpoints that fail are skipped until
+        probed again. Other errors, like reverts, are raised right away.
+        """
+        ranked = self.ranked()
+        if not ranked:
+            raise ValueError(f"No healthy RPC endpoint among {[e.url for e in self.endpoints]}")
+        error = None
+        for endpoint in ranked:
+            try:
+                ret = fn(endpoint.url)
+            except TRANSPORT_ERRORS as e:
+                logger.warning(f"RPC {endpoint.url} failed, trying the next one: {e}")
+                endpoint._record(e)
+                endpoint.latency = None
+                error = e
+                continue
+            endpoint._record()
+            return ret
+        raise error
+
+    def fetch(self, method: str, params: list):
+        return self.call(lambda url: EthereumRPC(url).fetch(method, params))
+
+    def metrics(self) -> List[dict]:
+        return [asdict(endpoint) for endpoint in self.endpoints]
+
+
+_pools: Dict[int, RPCPool] = {}
+
+
+def chain_urls(chain: Chain) -> List[str]:
+    urls = [url.strip() for url in os.getenv(f"{ENV_PREFIX}{chain.id}", "").split(",") if url.strip()]
+    urls += list(chain.rpcs)
+    if chain.rpc and chain.rpc != "RPC_NOT_SET":
+        urls.append(chain.rpc)
+    return list(dict.fromkeys(urls))
+
+
+def rpc_pool(chain: Chain) -> RPCPool:
+    """The endpoint pool of a chain, shared for the whole process so metrics add up."""
+    if chain.id not in _pools:
+        urls = chain_urls(chain)
+        if not urls:
+            raise ValueError(f"No RPC set for chain {chain.id}, set {ENV_PREFIX}{chain.id}")
+        _pools[chain.id] = RPCPool(urls)
+    return _pools[chain.id]